@@ -0,0 +1 @@
+"""Estimadores no paramétricos de riesgos competitivos usados por el tablero."""
@@ -0,0 +1,95 @@
+"""Línea de comandos del análisis (sin streamlit ni plotly).
+
+Ejemplos::
+
+    python -m analisis calcular --cohorte datos.parquet --salida resultados/
+    python -m analisis calcular --cohorte registro.parquet --filas 1000000 --salida resultados/
+    python -m analisis actualizar --estado estado.npz --agregar nuevos.parquet
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import pandas as pd
+
+from analisis import lote
+from analisis.agregados import agregar_archivo
+from analisis.cache import CacheDisco
+from analisis.cohorte import CAUSAS, HORIZONTES_ANIOS, generar_cohorte, leer_cohorte
+from analisis.incremental import EstadoCIF
+
+
+def _calcular(args):
+    inicio = time.perf_counter()
+    cache = CacheDisco(args.cache, args.cache_mb) if args.cache else None
+    if args.filas:
+        if not args.cohorte:
+            print("--filas requiere --cohorte", file=sys.stderr)
+            return 2
+        # La cohorte nunca se carga entera: solo sus agregados
+        agregados, huella_cohorte = agregar_archivo(args.cohorte, args.filas)
+        n = agregados.n
+        artefactos = lote.calcular_desde_tabla(agregados.tabla, huella_cohorte, B=args.B, semilla=args.semilla, cache=cache)
+    else:
+        cohorte = leer_cohorte(args.cohorte) if args.cohorte else generar_cohorte(semilla=args.semilla_cohorte)
+        n = len(cohorte)
+        artefactos = lote.calcular(cohorte, B=args.B, semilla=args.semilla, cache=cache)
+    destino = lote.guardar(artefactos, args.salida)
+    print(f"{n} pacientes -> {destino} ({time.perf_counter() - inicio:.1f} s)")
+    return 0
+
+
+def _registros(ruta):
+    cohorte = leer_cohorte(ruta, columnas=["Tiempo", "Causa", "DonanteVivo"])
+    return cohorte["Tiempo"].to_numpy(), cohorte["Causa"].to_numpy(), cohorte["DonanteVivo"].to_numpy()
+
+
+def _actualizar(args):
+    estado = EstadoCIF.cargar(args.estado) if os.path.exists(args.estado) else EstadoCIF(tuple(CAUSAS))
+    # Primero se retiran los registros corregidos y luego se agregan sus versiones nuevas
+    if args.retirar:
+        estado.retirar(*_registros(args.retirar))
+    if args.agregar:
+        estado.agregar(*_registros(args.agregar))
+    estado.guardar(args.estado)
+
+    cif = estado.evaluar(lote.HORIZONTES_DIAS)
+    tabla = pd.DataFrame(
+        100 * cif.reshape(-1, len(HORIZONTES_ANIOS)),
+        index=pd.MultiIndex.from_product([estado.grupos, list(CAUSAS.values())], names=["DonanteVivo", "Causa"]),
+        columns=[f"CIF % {anio} año(s)" for anio in HORIZONTES_ANIOS],
+    )
+    print(f"{estado.n} pacientes en {args.estado}")
+    print(tabla.round(1).to_string())
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m analisis", description=__doc__.splitlines()[0])
+    ordenes = parser.add_subparsers(dest="orden", required=True)
+
+    calcular = ordenes.add_parser("calcular", help="calcula y guarda CIF, bootstrap y prueba de Gray")
+    calcular.add_argument("--cohorte", help="cohorte en Parquet o Arrow IPC (por defecto, la sintética)")
+    calcular.add_argument("--filas", type=int, help="lee la cohorte por bloques de este número de filas (también CSV)")
+    calcular.add_argument("--salida", required=True, help="directorio de artefactos versionados")
+    calcular.add_argument("--B", type=int, default=lote.B_BOOTSTRAP, help="réplicas bootstrap")
+    calcular.add_argument("--semilla", type=int, default=lote.SEMILLA_BOOTSTRAP, help="semilla del bootstrap")
+    calcular.add_argument("--semilla-cohorte", type=int, default=42, help="semilla de la cohorte sintética")
+    calcular.add_argument("--cache", help="directorio de la caché en disco de bootstrap y Gray")
+    calcular.add_argument("--cache-mb", type=float, default=512, help="tamaño máximo de la caché")
+    calcular.set_defaults(funcion=_calcular)
+
+    actualizar = ordenes.add_parser("actualizar", help="actualiza el estado incremental de la CIF")
+    actualizar.add_argument("--estado", required=True, help="archivo .npz con el estado (se crea si no existe)")
+    actualizar.add_argument("--agregar", help="registros nuevos (Parquet o Arrow IPC)")
+    actualizar.add_argument("--retirar", help="registros a retirar, p. ej. la versión previa de los corregidos")
+    actualizar.set_defaults(funcion=_actualizar)
+
+    args = parser.parse_args(argv)
+    return args.funcion(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+"""Agregación por bloques de cohortes que no caben en memoria.
+
+El archivo se recorre por bloques de filas (grupos de filas de Parquet,
+rebanadas de Arrow IPC o lotes de CSV) y cada bloque se resume en sus
+agregados: la tabla de conteos por tiempo único que leen la CIF, Gray y el
+bootstrap, y los conteos por tipo de evento de las tablas y gráficos del
+EDA. Como los agregados de dos bloques se suman, el resultado es exacto y
+la memoria queda acotada por el tamaño del bloque, no por el de la cohorte.
+"""
+
+from dataclasses import dataclass
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from analisis.cif import TablaEventos
+from analisis.cohorte import HuellaPorBloques
+from analisis.descriptivo import conteos_eda
+
+FILAS_BLOQUE = 1_000_000
+
+
+@dataclass(frozen=True)
+class Agregados:
+    """Lo que el tablero necesita de una cohorte sin sus pacientes.
+
+    ``tabla`` es la :class:`TablaEventos` por tipo de donante y ``eventos``
+    los conteos de :func:`analisis.descriptivo.conteos_eda`.
+    """
+
+    tabla: TablaEventos
+    eventos: dict
+
+    @classmethod
+    def desde_cohorte(cls, cohorte, causas=(1, 2)):
+        tabla = TablaEventos.desde_cohorte(
+            cohorte["Tiempo"].to_numpy(), cohorte["Causa"].to_numpy(), cohorte["DonanteVivo"].to_numpy(), causas
+        )
+        return cls(tabla=tabla, eventos=conteos_eda(cohorte))
+
+    @property
+    def n(self):
+        return self.tabla.n
+
+    def combinar(self, otro):
+        """Agregados de la unión de dos partes disjuntas de la cohorte (asociativo)."""
+        eventos = {}
+        for variable, conteos in self.eventos.items():
+            # Suma sobre la unión de valores, en el orden en que aparecen
+            eventos[variable] = pd.concat([conteos, otro.eventos[variable]]).groupby(level=0, sort=False).sum()
+        return Agregados(tabla=self.tabla.combinar(otro.tabla), eventos=eventos)
+
+
+def bloques(ruta, filas=FILAS_BLOQUE, columnas=None):
+    """DataFrames de a lo sumo ``filas`` filas consecutivas de ``ruta``.
+
+    Parquet se lee por lotes de sus grupos de filas, Arrow IPC por rebanadas
+    del archivo mapeado en memoria y CSV con ``pandas.read_csv`` por lotes:
+    nunca hay más de un bloque decodificado a la vez.
+    """
+    sufijo = Path(ruta).suffix
+    if sufijo == ".parquet":
+        for lote in pq.ParquetFile(ruta, memory_map=True).iter_batches(batch_size=filas, columns=columnas):
+            yield pa.Table.from_batches([lote]).to_pandas()
+    elif sufijo == ".csv":
+        yield from pd.read_csv(ruta, usecols=columnas, chunksize=filas)
+    else:
+        with pa.memory_map(str(ruta)) as fuente:
+            lector = pa.ipc.open_file(fuente)
+            for i in range(lector.num_record_batches):
+                lote = lector.get_batch(i)
+                if columnas is not None:
+                    lote = lote.select(columnas)
+                for inicio in range(0, lote.num_rows, filas):
+                    yield pa.Table.from_batches([lote.slice(inicio, filas)]).to_pandas()
+
+
+def agregar_archivo(ruta, filas=FILAS_BLOQUE, causas=(1, 2)):
+    """Agregados y huella de la cohorte de ``ruta``, leída por bloques.
+
+    La huella es la de :func:`analisis.cohorte.huella` sobre la cohorte
+    completa (para Parquet y Arrow IPC, que conservan los tipos), así que
+    los artefactos de ``python -m analisis calcular`` sirven igual se lea
+    el archivo entero o por bloques. Devuelve ``(agregados, huella)``.
+    """
+    agregados = None
+    huella_cohorte = HuellaPorBloques()
+    for bloque in bloques(ruta, filas):
+        huella_cohorte.agregar(bloque)
+        parcial = Agregados.desde_cohorte(bloque, causas)
+        agregados = parcial if agregados is None else agregados.combinar(parcial)
+    if agregados is None:
+        raise ValueError(f"La cohorte de {ruta} está vacía")
+    return agregados, huella_cohorte.valor()
@@ -0,0 +1,535 @@
+"""Bootstrap no paramétrico de la CIF y de las diferencias entre grupos."""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+from analisis.cif import _cif_desde_conteos, _codificar, aalen_johansen, cif_sin_uno
+from analisis.cuantiles import CuantilesP2, Momentos
+
+
+@dataclass(frozen=True)
+class ReplicasBootstrap:
+    """CIF de cada réplica con forma (B, grupos, causas, horizontes)."""
+
+    grupos: tuple
+    causas: tuple
+    horizontes: np.ndarray
+    estimado: np.ndarray
+    replicas: np.ndarray
+
+    def intervalo(self, nivel=0.95, aceleracion=None):
+        """IC de la CIF con forma (2, grupos, causas, horizontes).
+
+        Por percentiles, o BCa si se da ``aceleracion`` (la de
+        :func:`aceleracion_jackknife`).
+        """
+        if aceleracion is not None:
+            return _cuantiles_bca(self.replicas, self.estimado, aceleracion[0], nivel)
+        alfa = (1 - nivel) / 2
+        return np.quantile(self.replicas, [alfa, 1 - alfa], axis=0)
+
+    def diferencia(self, nivel=0.95, aceleracion=None):
+        """Diferencia entre los dos primeros grupos: estimado e IC (percentiles o BCa)."""
+        delta = self.replicas[:, 0] - self.replicas[:, 1]
+        estimado = self.estimado[0] - self.estimado[1]
+        if aceleracion is not None:
+            return estimado, _cuantiles_bca(delta, estimado, aceleracion[1], nivel)
+        alfa = (1 - nivel) / 2
+        return estimado, np.quantile(delta, [alfa, 1 - alfa], axis=0)
+
+    def en(self, horizontes):
+        """Réplicas en otros horizontes, leídas por búsqueda binaria en ``horizontes``.
+
+        Es exacto cuando ``self.horizontes`` es la malla de tiempos únicos
+        observados: la CIF de cada réplica solo cambia en esos tiempos.
+        """
+        horizontes = np.asarray(horizontes, dtype=float)
+        idx = np.searchsorted(self.horizontes, horizontes, side="right") - 1
+
+        def elegir(valores):
+            return np.where(idx >= 0, valores[..., np.maximum(idx, 0)], 0.0)
+
+        return ReplicasBootstrap(
+            grupos=self.grupos,
+            causas=self.causas,
+            horizontes=horizontes,
+            estimado=elegir(self.estimado),
+            replicas=elegir(self.replicas),
+        )
+
+    def bandas(self, nivel=0.95):
+        """Bandas puntuales (percentiles) y simultáneas en cada horizonte, escalonadas.
+
+        Es la versión exacta de :func:`bandas_bootstrap`, a partir de todas
+        las réplicas en memoria.
+        """
+        inferior, superior = self.intervalo(nivel)
+        desviacion = self.replicas.std(axis=0, ddof=1)
+        simultanea = _banda_simultanea(self.estimado, desviacion, _maximos(self.replicas, self.estimado, desviacion), nivel)
+        return BandasCIF(
+            tiempos=self.horizontes,
+            grupos=self.grupos,
+            causas=self.causas,
+            estimado=self.estimado,
+            inferior=inferior,
+            superior=superior,
+            inferior_simultanea=simultanea[0],
+            superior_simultanea=simultanea[1],
+        )
+
+
+@dataclass(frozen=True)
+class BandasCIF:
+    """CIF y bandas bootstrap escalonadas sobre ``tiempos``, con forma (grupos, causas, tiempos).
+
+    ``inferior`` y ``superior`` son el IC de cada tiempo por separado;
+    ``inferior_simultanea`` y ``superior_simultanea`` cubren, con el mismo
+    nivel, la curva completa de cada grupo y causa a la vez.
+    """
+
+    tiempos: np.ndarray
+    grupos: tuple
+    causas: tuple
+    estimado: np.ndarray
+    inferior: np.ndarray
+    superior: np.ndarray
+    inferior_simultanea: np.ndarray
+    superior_simultanea: np.ndarray
+
+    def evaluar(self, horizontes, simultanea=False):
+        """``(estimado, inferior, superior)`` en cualquier horizonte, cada uno (G, K, H).
+
+        Cada consulta es una búsqueda binaria sobre ``tiempos``: no se vuelve
+        a ajustar nada. Con ``simultanea`` los extremos son los de la banda
+        simultánea.
+        """
+        idx = np.searchsorted(self.tiempos, np.asarray(horizontes, dtype=float), side="right") - 1
+        extremos = (self.inferior_simultanea, self.superior_simultanea) if simultanea else (self.inferior, self.superior)
+        return tuple(
+            np.where(idx >= 0, valores[..., np.maximum(idx, 0)], 0.0)
+            for valores in (self.estimado, *extremos)
+        )
+
+
+@dataclass(frozen=True)
+class ReplicasAdaptativas(ReplicasBootstrap):
+    """Réplicas de :func:`bootstrap_adaptativo` con el número usado por cantidad.
+
+    ``usadas`` tiene forma (grupos, causas, horizontes) y
+    ``usadas_diferencia`` (causas, horizontes): cada IC se calcula con las
+    primeras réplicas de su cantidad, las que había cuando se estabilizó.
+    """
+
+    usadas: np.ndarray
+    usadas_diferencia: np.ndarray
+
+    def intervalo(self, nivel=0.95, aceleracion=None):
+        a = None if aceleracion is None else aceleracion[0]
+        return _cuantiles_bca(self.replicas, self.estimado, a, nivel, self.usadas)
+
+    def diferencia(self, nivel=0.95, aceleracion=None):
+        delta = self.replicas[:, 0] - self.replicas[:, 1]
+        estimado = self.estimado[0] - self.estimado[1]
+        a = None if aceleracion is None else aceleracion[1]
+        return estimado, _cuantiles_bca(delta, estimado, a, nivel, self.usadas_diferencia)
+
+
+_NORMAL = NormalDist()
+
+
+def _cuantiles_bca(replicas, estimado, aceleracion, nivel, usadas=None):
+    """Extremos del IC por cantidad, con forma (2, *estimado.shape).
+
+    Sin ``aceleracion`` son los percentiles; con ella, los percentiles BCa
+    corregidos por el sesgo ``z0`` (proporción de réplicas bajo el
+    estimado, con los empates a la mitad) y por la aceleración. Cada
+    cantidad usa sus primeras ``usadas`` réplicas (todas por defecto).
+    """
+    estimado = np.asarray(estimado)
+    alfa = (1 - nivel) / 2
+    salida = np.empty((2,) + estimado.shape)
+    for celda in np.ndindex(estimado.shape):
+        valores = replicas[(slice(None if usadas is None else usadas[celda]),) + celda]
+        probabilidades = [alfa, 1 - alfa]
+        if aceleracion is not None:
+            B = len(valores)
+            debajo = (np.sum(valores < estimado[celda]) + 0.5 * np.sum(valores == estimado[celda])) / B
+            z0 = _NORMAL.inv_cdf(min(max(debajo, 0.5 / B), 1 - 0.5 / B))
+            a = aceleracion[celda]
+            probabilidades = []
+            for p in (alfa, 1 - alfa):
+                z = z0 + _NORMAL.inv_cdf(p)
+                probabilidades.append(_NORMAL.cdf(z0 + z / (1 - a * z)))
+        salida[(slice(None),) + celda] = np.quantile(valores, probabilidades)
+    return salida
+
+
+def aceleracion_jackknife(tabla, horizontes):
+    """Constantes de aceleración del BCa para la CIF y la diferencia entre grupos.
+
+    Las muestras *leave-one-out* salen de :func:`analisis.cif.cif_sin_uno`
+    sobre la :class:`analisis.cif.TablaEventos` (una pasada por grupo más
+    una actualización por celda, sin reajustar n veces). Como el remuestreo está estratificado por grupo, las
+    influencias se centran dentro de cada grupo:
+    ``a = Σ U³ / (6 (Σ U²)^{3/2})`` con ``U = (n_g - 1)(media_g - θ_(i))``.
+    Devuelve ``(a_cif, a_diferencia)`` con formas (grupos, causas,
+    horizontes) y (causas, horizontes).
+    """
+    sin_uno = cif_sin_uno(tabla, horizontes)
+    cubos, cuadrados = [], []
+    for pesos, valores in sin_uno.values():
+        n = pesos.sum()
+        media = np.tensordot(pesos, valores, axes=1) / n
+        U = (n - 1) * (media - valores)
+        cubos.append(np.tensordot(pesos, U**3, axes=1))
+        cuadrados.append(np.tensordot(pesos, U**2, axes=1))
+    cubos, cuadrados = np.stack(cubos), np.stack(cuadrados)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        a_cif = np.where(cuadrados > 0, cubos / (6 * cuadrados**1.5), 0.0)
+        # En la diferencia θ_0 - θ_1, el grupo 1 entra con signo opuesto
+        cubos_dif = cubos[0] - cubos[1]
+        cuadrados_dif = cuadrados[0] + cuadrados[1]
+        a_dif = np.where(cuadrados_dif > 0, cubos_dif / (6 * cuadrados_dif**1.5), 0.0)
+    return a_cif, a_dif
+
+
+# Cohorte compartida por cada proceso del pool (se envía una sola vez)
+_COHORTE = None
+
+
+def _iniciar_proceso(tiempo, causa, grupo):
+    global _COHORTE
+    _COHORTE = (tiempo, causa, grupo)
+
+
+def _evaluar_replicas(semillas, horizontes, causas, tiempo=None, causa=None, grupo=None):
+    """CIF en los horizontes para un bloque de réplicas.
+
+    Cada réplica usa su propio hijo de ``SeedSequence``, de modo que el
+    resultado no depende de cómo se repartan las réplicas entre procesos.
+    El remuestreo es estratificado: se conserva el tamaño de cada grupo.
+    """
+    if tiempo is None:
+        tiempo, causa, grupo = _COHORTE
+    etiquetas, codigo = _codificar(grupo)
+    indices = [np.flatnonzero(codigo == g) for g in range(len(etiquetas))]
+    salida = np.empty((len(semillas), len(etiquetas), len(causas), len(horizontes)))
+    for b, semilla in enumerate(semillas):
+        rng = np.random.default_rng(semilla)
+        muestra = np.concatenate([ind[rng.integers(0, len(ind), size=len(ind))] for ind in indices])
+        curvas = aalen_johansen(tiempo[muestra], causa[muestra], grupo[muestra], causas)
+        for g, etiqueta in enumerate(etiquetas):
+            salida[b, g] = curvas[etiqueta.item()].evaluar(horizontes)
+    return salida
+
+
+def bootstrap_cif(tiempo, causa, grupo, horizontes, B=1000, semilla=42, n_procesos=None, causas=(1, 2)):
+    """Réplicas bootstrap de la CIF repartidas en un pool de procesos.
+
+    Remuestrea pacientes (es la referencia de :func:`bootstrap_multinomial`,
+    que solo necesita la tabla de conteos). Con la misma ``semilla`` el resultado es idéntico bit a bit para
+    cualquier ``n_procesos``; con ``n_procesos=1`` no se crea el pool.
+    """
+    tiempo, causa, grupo = np.asarray(tiempo), np.asarray(causa), np.asarray(grupo)
+    horizontes = np.asarray(horizontes, dtype=float)
+    causas = tuple(causas)
+    semillas = np.random.SeedSequence(semilla).spawn(B)
+    n_procesos = n_procesos or os.cpu_count() or 1
+
+    if n_procesos == 1:
+        replicas = _evaluar_replicas(semillas, horizontes, causas, tiempo, causa, grupo)
+    else:
+        # Bloques pequeños para equilibrar la carga entre procesos
+        tam = max(1, -(-B // (4 * n_procesos)))
+        bloques = [semillas[i:i + tam] for i in range(0, B, tam)]
+        with ProcessPoolExecutor(
+            max_workers=n_procesos,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_iniciar_proceso,
+            initargs=(tiempo, causa, grupo),
+        ) as pool:
+            partes = pool.map(_evaluar_replicas, bloques, [horizontes] * len(bloques), [causas] * len(bloques))
+            replicas = np.concatenate(list(partes))
+
+    curvas = aalen_johansen(tiempo, causa, grupo, causas)
+    estimado = np.stack([curva.evaluar(horizontes) for curva in curvas.values()])
+    return ReplicasBootstrap(
+        grupos=tuple(curvas),
+        causas=causas,
+        horizontes=horizontes,
+        estimado=estimado,
+        replicas=replicas,
+    )
+
+
+class _RemuestreoMultinomial:
+    """Tabla de conteos truncada lista para sortear réplicas por lotes.
+
+    Remuestrear pacientes equivale a sortear cuántas veces aparece cada
+    celda (tiempo, causa) de la tabla de conteos, así que cada réplica es una
+    fila de conteos multinomiales y todas las CIF de un bloque salen de los
+    mismos productos y sumas acumuladas. Los tiempos posteriores al último
+    horizonte se agrupan en una sola celda (solo aportan al conjunto en
+    riesgo).
+    """
+
+    def __init__(self, tabla, horizontes):
+        self.horizontes = np.asarray(horizontes, dtype=float)
+        self.causas = tabla.causas
+        n_causas = len(self.causas)
+        etiquetas, tiempos, conteos = tabla.grupos, tabla.tiempos, tabla.conteos
+        self.grupos = tuple(e.item() for e in etiquetas)
+
+        # Tabla truncada en el último horizonte más una celda final de salidas
+        corte = np.searchsorted(tiempos, self.horizontes.max(), side="right")
+        self.tabla = np.zeros((len(etiquetas), corte + 1, n_causas + 1), dtype=np.int64)
+        self.tabla[:, :corte] = conteos[:, :corte]
+        self.tabla[:, corte, n_causas] = conteos[:, corte:].sum(axis=(1, 2))
+        self.idx = np.searchsorted(tiempos[:corte], self.horizontes, side="right") - 1
+
+        # Celdas no vacías de cada grupo y sus probabilidades
+        self.celdas = [np.flatnonzero(self.tabla[g].ravel()) for g in range(len(etiquetas))]
+        self.tamanos = self.tabla.sum(axis=(1, 2))
+        self.probabilidades = [self.tabla[g].ravel()[c] / self.tamanos[g] for g, c in enumerate(self.celdas)]
+
+    def _evaluar(self, tabla):
+        n_causas = len(self.causas)
+        _, _, cif = _cif_desde_conteos(np.moveaxis(tabla[..., :n_causas], -1, -2), tabla[..., n_causas])
+        return np.where(self.idx >= 0, cif[..., np.maximum(self.idx, 0)], 0.0)
+
+    def estimado(self):
+        return self._evaluar(self.tabla)
+
+    def tam_bloque(self, memoria_mb):
+        # Unas seis copias de la tabla densa por réplica y grupo
+        return max(1, int(memoria_mb * 2**20 // (6 * 8 * self.tabla[0].size)))
+
+    def bloques(self, semillas, tam_bloque):
+        """CIF de las réplicas de cada bloque de ``tam_bloque`` semillas consecutivas."""
+        for inicio in range(0, len(semillas), tam_bloque):
+            generadores = [np.random.default_rng(s) for s in semillas[inicio:inicio + tam_bloque]]
+            b = len(generadores)
+            salida = np.empty((b, len(self.grupos), len(self.causas), len(self.horizontes)))
+            for g in range(len(self.grupos)):
+                pesos = np.zeros((b, self.tabla[g].size))
+                pesos[:, self.celdas[g]] = [rng.multinomial(self.tamanos[g], self.probabilidades[g]) for rng in generadores]
+                salida[:, g] = self._evaluar(pesos.reshape(b, *self.tabla.shape[1:]))
+            yield salida
+
+    def replicas(self, semillas, tam_bloque):
+        """CIF de una réplica por semilla, con forma (len(semillas), grupos, causas, horizontes)."""
+        forma = (0, len(self.grupos), len(self.causas), len(self.horizontes))
+        return np.concatenate([np.empty(forma), *self.bloques(semillas, tam_bloque)])
+
+
+def bootstrap_multinomial(tabla, horizontes, B=1000, semilla=42, tam_bloque=None, memoria_mb=256):
+    """Bootstrap por pesos multinomiales evaluado como operación matricial.
+
+    Ver :class:`_RemuestreoMultinomial`; ``tabla`` es la
+    :class:`analisis.cif.TablaEventos` de la cohorte. Los bloques se dimensionan para no
+    superar ``memoria_mb``; como cada réplica tiene su hijo de
+    ``SeedSequence``, el tamaño de bloque no cambia el resultado.
+    """
+    remuestreo = _RemuestreoMultinomial(tabla, horizontes)
+    semillas = np.random.SeedSequence(semilla).spawn(B)
+    return ReplicasBootstrap(
+        grupos=remuestreo.grupos,
+        causas=remuestreo.causas,
+        horizontes=remuestreo.horizontes,
+        estimado=remuestreo.estimado(),
+        replicas=remuestreo.replicas(semillas, tam_bloque or remuestreo.tam_bloque(memoria_mb)),
+    )
+
+
+def _maximos(replicas, estimado, desviacion):
+    """Desvío estandarizado máximo de cada réplica sobre los tiempos, forma (B, grupos, causas).
+
+    Los tiempos sin variabilidad (antes del primer evento) no cuentan.
+    """
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = np.where(desviacion > 0, np.abs(replicas - estimado) / desviacion, 0.0)
+    return z.max(axis=-1)
+
+
+def _banda_simultanea(estimado, desviacion, maximos, nivel):
+    """Banda ``estimado ± c·desviación`` con ``c`` el cuantil ``nivel`` de los máximos.
+
+    La banda cubre la curva completa de cada grupo y causa con
+    probabilidad ``nivel`` y su ancho es proporcional a la variabilidad en
+    cada tiempo. Devuelve forma (2, grupos, causas, tiempos), en [0, 1].
+    """
+    c = np.quantile(maximos, nivel, axis=0)[..., None]
+    return np.clip(np.stack([estimado - c * desviacion, estimado + c * desviacion]), 0.0, 1.0)
+
+
+def bandas_bootstrap(tabla, horizontes, B=1000, semilla=42, nivel=0.95, memoria_mb=32):
+    """Réplicas en ``horizontes`` y bandas sobre todos los tiempos únicos, en memoria acotada.
+
+    Guardar las B réplicas de la curva completa ocupa B × grupos × causas ×
+    tiempos valores. Aquí cada bloque de réplicas se descarta tras
+    actualizar, por tiempo, los cuantiles de la banda puntual (algoritmo P²,
+    :class:`analisis.cuantiles.CuantilesP2`) y la media y varianza. La banda
+    simultánea necesita la desviación de cada tiempo antes de estandarizar:
+    una segunda pasada vuelve a sortear las mismas réplicas (cada una tiene
+    su hijo de ``SeedSequence``) y solo conserva el desvío máximo de cada
+    una. Solo se guardan completas las réplicas en ``horizontes``, para las
+    tablas. Devuelve ``(ReplicasBootstrap, BandasCIF)``.
+    """
+    remuestreo = _RemuestreoMultinomial(tabla, tabla.tiempos)
+    tam_bloque = remuestreo.tam_bloque(memoria_mb)
+    semillas = np.random.SeedSequence(semilla).spawn(B)
+    estimado = remuestreo.estimado()
+    horizontes = np.asarray(horizontes, dtype=float)
+    idx = np.searchsorted(remuestreo.horizontes, horizontes, side="right") - 1
+
+    def en_horizontes(valores):
+        return np.where(idx >= 0, valores[..., np.maximum(idx, 0)], 0.0)
+
+    alfa = (1 - nivel) / 2
+    cuantiles = CuantilesP2([alfa, 1 - alfa], estimado.shape)
+    momentos = Momentos(estimado.shape)
+    replicas = []
+    for bloque in remuestreo.bloques(semillas, tam_bloque):
+        cuantiles.actualizar_lote(bloque)
+        momentos.actualizar_lote(bloque)
+        replicas.append(en_horizontes(bloque))
+
+    desviacion = momentos.desviacion()
+    maximos = np.concatenate([
+        _maximos(bloque, estimado, desviacion) for bloque in remuestreo.bloques(semillas, tam_bloque)
+    ])
+    inferior, superior = cuantiles.valor()
+    simultanea = _banda_simultanea(estimado, desviacion, maximos, nivel)
+    bandas = BandasCIF(
+        tiempos=remuestreo.horizontes,
+        grupos=remuestreo.grupos,
+        causas=remuestreo.causas,
+        estimado=estimado,
+        inferior=inferior,
+        superior=superior,
+        inferior_simultanea=simultanea[0],
+        superior_simultanea=simultanea[1],
+    )
+    replicas = ReplicasBootstrap(
+        grupos=remuestreo.grupos,
+        causas=remuestreo.causas,
+        horizontes=horizontes,
+        estimado=en_horizontes(estimado),
+        replicas=np.concatenate(replicas),
+    )
+    return replicas, bandas
+
+
+def error_cuantiles(replicas, probabilidades):
+    """Error estándar Monte Carlo de los cuantiles de ``replicas`` (eje 0).
+
+    El cuantil p de B réplicas cae, con probabilidad cercana al 68%, entre
+    los estadísticos de orden B·p ± sqrt(B·p·(1-p)); la mitad de esa
+    distancia estima su error estándar sin suponer ninguna distribución.
+    """
+    B = len(replicas)
+    ordenadas = np.sort(replicas, axis=0)
+    errores = []
+    for p in probabilidades:
+        d = np.sqrt(B * p * (1 - p))
+        bajo = int(np.clip(np.floor(B * p - d), 0, B - 1))
+        alto = int(np.clip(np.ceil(B * p + d), 0, B - 1))
+        errores.append((ordenadas[alto] - ordenadas[bajo]) / 2)
+    return np.stack(errores)
+
+
+def bootstrap_adaptativo(tabla, horizontes, tolerancia=0.0025, nivel=0.95, semilla=42,
+                         tam_lote=250, B_max=20_000, memoria_mb=256):
+    """Bootstrap secuencial que se detiene cuando los extremos del IC se estabilizan.
+
+    Las réplicas se generan por lotes de ``tam_lote``. Tras cada lote se
+    estima el error Monte Carlo de los cuantiles ``(1-nivel)/2`` y
+    ``(1+nivel)/2`` de cada CIF (grupo, causa, horizonte) y de cada
+    diferencia entre grupos; una cantidad queda fija, con las réplicas
+    generadas hasta ese momento, en cuanto ambos errores son menores que
+    ``tolerancia`` (en la escala de la CIF: 0.0025 son 0.25 puntos %). Se
+    deja de remuestrear cuando todas están fijas o se llega a ``B_max``.
+    Con la misma ``semilla`` las réplicas son las de
+    :func:`bootstrap_multinomial`, pero no las de :func:`bandas_bootstrap`
+    (el B fijo del tablero), que sortea sobre todos los tiempos únicos: los
+    IC de ambos modos difieren en el error Monte Carlo.
+    """
+    remuestreo = _RemuestreoMultinomial(tabla, horizontes)
+    tam_bloque = remuestreo.tam_bloque(memoria_mb)
+    alfa = (1 - nivel) / 2
+    generador = np.random.SeedSequence(semilla)
+    forma = (len(remuestreo.grupos), len(remuestreo.causas), len(remuestreo.horizontes))
+    usadas = np.zeros(forma, dtype=np.int64)
+    usadas_diferencia = np.zeros(forma[1:], dtype=np.int64)
+
+    replicas = np.empty((0, *forma))
+    while len(replicas) < B_max and ((usadas == 0).any() or (usadas_diferencia == 0).any()):
+        # spawn continúa la secuencia de hijos: la réplica b es siempre la misma
+        nuevas = remuestreo.replicas(generador.spawn(min(tam_lote, B_max - len(replicas))), tam_bloque)
+        replicas = np.concatenate([replicas, nuevas])
+        B = len(replicas)
+        estables = error_cuantiles(replicas, [alfa, 1 - alfa]).max(axis=0) <= tolerancia
+        usadas[(usadas == 0) & estables] = B
+        estables = error_cuantiles(replicas[:, 0] - replicas[:, 1], [alfa, 1 - alfa]).max(axis=0) <= tolerancia
+        usadas_diferencia[(usadas_diferencia == 0) & estables] = B
+
+    # Las que no se estabilizaron usan todas las réplicas
+    usadas[usadas == 0] = B
+    usadas_diferencia[usadas_diferencia == 0] = B
+    return ReplicasAdaptativas(
+        grupos=remuestreo.grupos,
+        causas=remuestreo.causas,
+        horizontes=remuestreo.horizontes,
+        estimado=remuestreo.estimado(),
+        replicas=replicas,
+        usadas=usadas,
+        usadas_diferencia=usadas_diferencia,
+    )
+
+
+def _formato(valor, intervalo):
+    return f"{100 * valor:.1f} ({100 * intervalo[0]:.1f}-{100 * intervalo[1]:.1f})"
+
+
+def tabla_bootstrap(resultado, causa, anios, nivel=0.95, aceleracion=None):
+    """Tabla de CIF por grupo y diferencia DD-LD con IC en puntos porcentuales.
+
+    Con ``aceleracion`` (ver :func:`aceleracion_jackknife`) los IC son BCa.
+    """
+    k = resultado.causas.index(causa)
+    ic = resultado.intervalo(nivel, aceleracion)
+    delta, ic_delta = resultado.diferencia(nivel, aceleracion)
+    conclusiones = []
+    for h in range(len(anios)):
+        if ic_delta[0, k, h] > 0:
+            conclusiones.append("Delta>0 (DD > LD, significativo)")
+        elif ic_delta[1, k, h] < 0:
+            conclusiones.append("Delta<0 (DD < LD, significativo)")
+        else:
+            conclusiones.append("Incluye 0 (no concluyente)")
+    tabla = pd.DataFrame({
+        "Horizonte (años)": list(anios),
+        "CIF % Donante fallecido (IC 95%)": [
+            _formato(resultado.estimado[0, k, h], ic[:, 0, k, h]) for h in range(len(anios))
+        ],
+        "CIF % Donante vivo (IC 95%)": [
+            _formato(resultado.estimado[1, k, h], ic[:, 1, k, h]) for h in range(len(anios))
+        ],
+        "Delta CIF DD-LD, puntos % (IC 95%)": [
+            _formato(delta[k, h], ic_delta[:, k, h]) for h in range(len(anios))
+        ],
+        "Conclusión": conclusiones,
+    })
+    if isinstance(resultado, ReplicasAdaptativas):
+        # Réplicas con las que se estabilizó cada celda de la tabla
+        tabla["Réplicas (DD / LD / Delta)"] = [
+            f"{resultado.usadas[0, k, h]} / {resultado.usadas[1, k, h]} / {resultado.usadas_diferencia[k, h]}"
+            for h in range(len(anios))
+        ]
+    return tabla
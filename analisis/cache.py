@@ -0,0 +1,184 @@
+"""Caché en disco de resultados, direccionada por contenido y con desalojo LRU.
+
+La clave es un hash de los arreglos de entrada (contenido, tipo y forma) y
+de los parámetros, así que dos procesos o dos reinicios del tablero con la
+misma cohorte comparten los resultados. Cada entrada es un ``.npz``.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from analisis.bootstrap import BandasCIF, ReplicasAdaptativas, ReplicasBootstrap
+from analisis.gray import ResultadoGray, ResultadoPermutacion
+
+# Cambiarla invalida todas las entradas (p. ej. si cambia un estimador)
+VERSION = 3
+
+
+class CacheDisco:
+    """Directorio de ``.npz`` comprimidos acotado a ``limite_mb`` megabytes.
+
+    Las escrituras son atómicas (archivo temporal y ``os.replace``) y cada
+    lectura renueva la fecha de modificación, que es el orden de desalojo.
+    """
+
+    def __init__(self, directorio, limite_mb=512):
+        self.directorio = Path(directorio)
+        self.limite = int(limite_mb * 2**20)
+        self.directorio.mkdir(parents=True, exist_ok=True)
+
+    def clave(self, nombre, arreglos, parametros):
+        """Hash de ``nombre``, los arreglos de entrada y los parámetros."""
+        h = hashlib.sha256(f"{VERSION}:{nombre}".encode())
+        for arreglo in arreglos:
+            arreglo = np.ascontiguousarray(arreglo)
+            h.update(f"{arreglo.dtype.str}{arreglo.shape}".encode())
+            h.update(arreglo.data)
+        h.update(json.dumps(parametros, sort_keys=True, default=_json).encode())
+        return h.hexdigest()
+
+    def _ruta(self, clave):
+        return self.directorio / f"{clave}.npz"
+
+    def leer(self, clave):
+        """Arreglos guardados con ``clave`` o ``None`` si no están."""
+        ruta = self._ruta(clave)
+        try:
+            with np.load(ruta, allow_pickle=False) as datos:
+                arreglos = {nombre: datos[nombre] for nombre in datos.files}
+            os.utime(ruta)
+        except (FileNotFoundError, ValueError, OSError):
+            return None
+        return arreglos
+
+    def escribir(self, clave, arreglos):
+        ruta = self._ruta(clave)
+        # Nombre temporal único por escritura: no choca entre procesos ni entre hilos
+        temporal = tempfile.NamedTemporaryFile(dir=self.directorio, prefix=f"{ruta.name}.", suffix=".tmp", delete=False)
+        with temporal as archivo:
+            try:
+                np.savez_compressed(archivo, **arreglos)
+            except BaseException:
+                archivo.close()
+                os.unlink(archivo.name)
+                raise
+        os.replace(archivo.name, ruta)
+        self._desalojar()
+
+    def _desalojar(self):
+        """Borra las entradas usadas hace más tiempo hasta respetar el límite."""
+        entradas = []
+        for ruta in self.directorio.glob("*.npz"):
+            try:
+                estado = ruta.stat()
+            except FileNotFoundError:
+                continue  # otro proceso la borró
+            entradas.append((estado.st_mtime, estado.st_size, ruta))
+        total = sum(tamano for _, tamano, _ in entradas)
+        for _, tamano, ruta in sorted(entradas):
+            if total <= self.limite:
+                break
+            ruta.unlink(missing_ok=True)
+            total -= tamano
+
+    def memoizar(self, nombre, funcion, arreglos, parametros, codificar, decodificar):
+        """``funcion(*arreglos, **parametros)`` leída de la caché si ya se calculó.
+
+        ``codificar`` convierte el resultado en un diccionario de arreglos y
+        ``decodificar`` hace lo inverso.
+        """
+        clave = self.clave(nombre, arreglos, parametros)
+        guardado = self.leer(clave)
+        if guardado is not None:
+            return decodificar(guardado)
+        resultado = funcion(*arreglos, **parametros)
+        self.escribir(clave, codificar(resultado))
+        return resultado
+
+
+def _json(valor):
+    return np.asarray(valor).tolist()
+
+
+def codificar_bootstrap(resultado):
+    datos = {
+        "grupos": np.asarray(resultado.grupos),
+        "causas": np.asarray(resultado.causas),
+        "horizontes": resultado.horizontes,
+        "estimado": resultado.estimado,
+        "replicas": resultado.replicas,
+    }
+    if isinstance(resultado, ReplicasAdaptativas):
+        datos["usadas"] = resultado.usadas
+        datos["usadas_diferencia"] = resultado.usadas_diferencia
+    return datos
+
+
+def decodificar_bootstrap(datos):
+    campos = dict(
+        grupos=tuple(g.item() for g in datos["grupos"]),
+        causas=tuple(int(k) for k in datos["causas"]),
+        horizontes=datos["horizontes"],
+        estimado=datos["estimado"],
+        replicas=datos["replicas"],
+    )
+    if "usadas" in datos:
+        return ReplicasAdaptativas(**campos, usadas=datos["usadas"], usadas_diferencia=datos["usadas_diferencia"])
+    return ReplicasBootstrap(**campos)
+
+
+def codificar_bandas(resultado):
+    replicas, bandas = resultado
+    datos = {f"bootstrap_{nombre}": valor for nombre, valor in codificar_bootstrap(replicas).items()}
+    for nombre in ("tiempos", "estimado", "inferior", "superior", "inferior_simultanea", "superior_simultanea"):
+        datos[f"bandas_{nombre}"] = getattr(bandas, nombre)
+    return datos
+
+
+def decodificar_bandas(datos):
+    replicas = decodificar_bootstrap({
+        nombre.removeprefix("bootstrap_"): valor for nombre, valor in datos.items() if nombre.startswith("bootstrap_")
+    })
+    bandas = BandasCIF(
+        grupos=replicas.grupos,
+        causas=replicas.causas,
+        **{nombre.removeprefix("bandas_"): valor for nombre, valor in datos.items() if nombre.startswith("bandas_")},
+    )
+    return replicas, bandas
+
+
+def codificar_gray(resultados):
+    datos = {"causas": np.array(list(resultados))}
+    for codigo, resultado in resultados.items():
+        datos[f"tau_{codigo}"] = resultado.tau
+        datos[f"estadistico_{codigo}"] = resultado.estadistico
+        datos[f"p_valor_{codigo}"] = resultado.p_valor
+        datos[f"gl_{codigo}"] = np.array(resultado.gl)
+        if isinstance(resultado, ResultadoPermutacion):
+            datos[f"error_{codigo}"] = resultado.error
+            datos[f"permutaciones_{codigo}"] = np.array(resultado.permutaciones)
+    return datos
+
+
+def decodificar_gray(datos):
+    resultados = {}
+    for codigo in datos["causas"]:
+        campos = dict(
+            causa=int(codigo),
+            tau=datos[f"tau_{codigo}"],
+            estadistico=datos[f"estadistico_{codigo}"],
+            gl=int(datos[f"gl_{codigo}"]),
+            p_valor=datos[f"p_valor_{codigo}"],
+        )
+        if f"error_{codigo}" in datos:
+            resultados[int(codigo)] = ResultadoPermutacion(
+                **campos, error=datos[f"error_{codigo}"], permutaciones=int(datos[f"permutaciones_{codigo}"])
+            )
+        else:
+            resultados[int(codigo)] = ResultadoGray(**campos)
+    return resultados
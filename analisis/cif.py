@@ -0,0 +1,252 @@
+"""Estimador de Aalen-Johansen de la función de incidencia acumulada (CIF)."""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class CurvaCIF:
+    """Función escalonada de incidencia acumulada de un grupo.
+
+    Los arreglos están alineados con ``tiempos`` (tiempos únicos ordenados);
+    ``eventos`` y ``cif`` tienen una fila por causa, en el orden de ``causas``.
+    """
+
+    tiempos: np.ndarray
+    causas: tuple
+    n_riesgo: np.ndarray
+    eventos: np.ndarray
+    supervivencia: np.ndarray
+    cif: np.ndarray
+
+    def evaluar(self, horizontes, causa=None):
+        """CIF en los horizontes pedidos (búsqueda binaria sobre ``tiempos``)."""
+        horizontes = np.asarray(horizontes, dtype=float)
+        idx = np.searchsorted(self.tiempos, horizontes, side="right") - 1
+        valores = np.where(idx >= 0, self.cif[:, np.maximum(idx, 0)], 0.0)
+        if causa is None:
+            return valores
+        return valores[self.causas.index(causa)]
+
+
+def _cif_desde_conteos(eventos, censuras):
+    """Aalen-Johansen a partir de conteos por tiempo único.
+
+    ``eventos`` tiene forma (..., K, T) y ``censuras`` (..., T); las
+    dimensiones iniciales se recorren en bloque, lo que permite evaluar
+    varias réplicas a la vez. Devuelve ``(n_riesgo, supervivencia, cif)``.
+    """
+    d = eventos.sum(axis=-2)
+    salidas = d + censuras
+    # En riesgo en t: todos los que salen en t o después
+    n_riesgo = np.flip(np.cumsum(np.flip(salidas, axis=-1), axis=-1), axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        riesgo = np.where(n_riesgo > 0, d / n_riesgo, 0.0)
+        riesgo_causa = np.where(n_riesgo[..., None, :] > 0, eventos / n_riesgo[..., None, :], 0.0)
+    supervivencia = np.cumprod(1.0 - riesgo, axis=-1)
+    s_previa = np.concatenate(
+        [np.ones(supervivencia.shape[:-1] + (1,)), supervivencia[..., :-1]], axis=-1
+    )
+    cif = np.cumsum(s_previa[..., None, :] * riesgo_causa, axis=-1)
+    return n_riesgo, supervivencia, cif
+
+
+def _codificar(valores):
+    """Valores únicos ordenados y el código de cada elemento.
+
+    Para enteros (o booleanos) de rango acotado se usa un conteo directo en
+    lugar de ordenar, lo que hace la codificación lineal en n.
+    """
+    valores = np.asarray(valores)
+    if valores.dtype.kind in "biu" and len(valores):
+        enteros = valores.astype(np.int64, copy=False)
+        minimo = int(enteros.min())
+        rango = int(enteros.max()) - minimo + 1
+        if rango <= max(len(valores), 1 << 16):
+            desplazado = enteros - minimo
+            presentes = np.bincount(desplazado, minlength=rango) > 0
+            mapa = np.cumsum(presentes) - 1
+            unicos = (np.flatnonzero(presentes) + minimo).astype(valores.dtype)
+            return unicos, mapa[desplazado]
+    return np.unique(valores, return_inverse=True)
+
+
+def _columna_causa(causa, causas):
+    """Columna de conteo de cada paciente: una por causa y la última para censura."""
+    columna = np.full(len(causa), len(causas), dtype=np.intp)
+    for j, k in enumerate(causas):
+        columna[causa == k] = j
+    return columna
+
+
+def _contar(codigo_grupo, n_grupos, codigo_tiempo, n_tiempos, columna, n_columnas):
+    """Conteos (grupos, tiempos, columnas) a partir de los códigos de cada paciente."""
+    celda = (codigo_grupo * n_tiempos + codigo_tiempo) * n_columnas + columna
+    return np.bincount(celda, minlength=n_grupos * n_tiempos * n_columnas).reshape(n_grupos, n_tiempos, n_columnas)
+
+
+def _tabla_conteos(tiempo, causa, grupo, causas):
+    """Tabla densa de conteos con forma (grupos, tiempos, causas + censura).
+
+    Devuelve también las etiquetas de grupo y los tiempos únicos ordenados.
+    """
+    etiquetas, codigo_grupo = _codificar(grupo)
+    tiempos, codigo_tiempo = _codificar(tiempo)
+    conteos = _contar(
+        codigo_grupo, len(etiquetas), codigo_tiempo, len(tiempos), _columna_causa(causa, causas), len(causas) + 1
+    )
+    return etiquetas, tiempos, conteos
+
+
+@dataclass(frozen=True)
+class TablaEventos:
+    """Estadísticos suficientes de una cohorte para la CIF, Gray y el bootstrap.
+
+    ``conteos`` tiene forma (grupos, tiempos, causas + censura): los eventos
+    de cada causa y las censuras de cada grupo en cada tiempo único. Los
+    estimadores solo leen esta tabla, así que su memoria y su costo
+    dependen del número de días de seguimiento distintos y no del de
+    pacientes.
+    """
+
+    grupos: np.ndarray
+    tiempos: np.ndarray
+    causas: tuple
+    conteos: np.ndarray
+
+    @classmethod
+    def desde_cohorte(cls, tiempo, causa, grupo=None, causas=(1, 2)):
+        """Tabla de una cohorte en una sola agrupación (un grupo si ``grupo`` es ``None``).
+
+        ``causa`` vale 0 para censura y un código positivo para cada evento;
+        con ``causas=None`` se usan los códigos presentes.
+        """
+        tiempo = np.asarray(tiempo)
+        causa = np.asarray(causa)
+        if grupo is None:
+            grupo = np.zeros(len(tiempo), dtype=np.int8)
+        if causas is None:
+            causas = tuple(int(k) for k in np.unique(causa[causa > 0]))
+        causas = tuple(causas)
+        etiquetas, tiempos, conteos = _tabla_conteos(tiempo, causa, np.asarray(grupo), causas)
+        return cls(grupos=etiquetas, tiempos=tiempos, causas=causas, conteos=conteos)
+
+    @property
+    def n(self):
+        """Número de pacientes de la tabla."""
+        return int(self.conteos.sum())
+
+    def combinar(self, otra):
+        """Tabla de la unión de dos cohortes disjuntas (p. ej. dos bloques de un archivo).
+
+        Los conteos se suman celda a celda sobre la unión de grupos y
+        tiempos, así que la operación es asociativa y conmutativa: combinar
+        los bloques en cualquier orden da la tabla de la cohorte completa.
+        """
+        if otra.causas != self.causas:
+            raise ValueError("Las tablas tienen causas distintas")
+        grupos = np.union1d(self.grupos, otra.grupos)
+        tiempos = np.union1d(self.tiempos, otra.tiempos)
+        conteos = np.zeros((len(grupos), len(tiempos), self.conteos.shape[-1]), dtype=np.int64)
+        for tabla in (self, otra):
+            celdas = np.ix_(np.searchsorted(grupos, tabla.grupos), np.searchsorted(tiempos, tabla.tiempos))
+            conteos[celdas] += tabla.conteos
+        return TablaEventos(grupos=grupos, tiempos=tiempos, causas=self.causas, conteos=conteos)
+
+    def curvas(self):
+        """CIF de Aalen-Johansen, ``{grupo: CurvaCIF}``."""
+        return _curvas_desde_tabla(self.grupos, self.tiempos, self.conteos, self.causas)
+
+    def evaluar(self, horizontes):
+        """CIF en los horizontes con forma (grupos, causas, horizontes)."""
+        _, _, cif = _cif_desde_conteos(np.moveaxis(self.conteos[..., :-1], -1, -2), self.conteos[..., -1])
+        idx = np.searchsorted(self.tiempos, np.asarray(horizontes, dtype=float), side="right") - 1
+        return np.where(idx >= 0, cif[..., np.maximum(idx, 0)], 0.0)
+
+
+def aalen_johansen(tiempo, causa, grupo=None, causas=None):
+    """CIF de Aalen-Johansen para todas las causas y grupos.
+
+    ``causa`` vale 0 para censura y un código positivo para cada evento.
+    Los tiempos y grupos se codifican una sola vez (un ordenamiento, o un
+    conteo directo si son enteros) en una :class:`TablaEventos` y las CIF
+    salen de una pasada de sumas acumuladas sobre ella, por lo que el costo
+    es O(n log n) en el peor caso.
+    Devuelve un diccionario ``{grupo: CurvaCIF}``.
+    """
+    return TablaEventos.desde_cohorte(tiempo, causa, grupo, causas).curvas()
+
+
+def _curvas_desde_tabla(etiquetas, tiempos, conteos, causas):
+    """Una ``CurvaCIF`` por grupo a partir de la tabla de conteos densa."""
+    curvas = {}
+    for i, etiqueta in enumerate(etiquetas):
+        presentes = conteos[i].sum(axis=1) > 0
+        tabla = conteos[i, presentes]
+        eventos = tabla[:, :-1].T
+        n_riesgo, supervivencia, cif = _cif_desde_conteos(eventos, tabla[:, -1])
+        curvas[etiqueta.item()] = CurvaCIF(
+            tiempos=tiempos[presentes],
+            causas=causas,
+            n_riesgo=n_riesgo,
+            eventos=eventos,
+            supervivencia=supervivencia,
+            cif=cif,
+        )
+    return curvas
+
+
+def cif_sin_uno(tabla, horizontes):
+    """CIF de cada muestra *leave-one-out* sin volver a ajustar.
+
+    Quitar un paciente que sale en el tiempo único ``s`` solo resta uno al
+    conjunto en riesgo antes de ``s`` y a la celda (``s``, causa): antes de
+    ``s`` la CIF es la de la tabla con ``n_riesgo - 1`` (una sola pasada de
+    productos y sumas acumuladas para todo el grupo) y después de ``s`` es la
+    CIF original reescalada por la supervivencia en ``s``. Los pacientes de
+    una misma celda de ``tabla`` (:class:`TablaEventos`) dan la misma
+    muestra, así que se evalúa una vez por celda. Devuelve ``{grupo: (pesos, cif)}``: el número de pacientes de cada
+    celda y la CIF sin uno de ellos, con forma (celdas, causas, horizontes).
+    """
+    n_causas = len(tabla.causas)
+    horizontes = np.asarray(horizontes, dtype=float)
+    etiquetas, tiempos, conteos = tabla.grupos, tabla.tiempos, tabla.conteos
+    resultado = {}
+    for g, etiqueta in enumerate(etiquetas):
+        presentes = conteos[g].sum(axis=1) > 0
+        tabla = conteos[g, presentes]
+        eventos = tabla[:, :-1].T
+        d = eventos.sum(axis=0)
+        n_riesgo, supervivencia, cif = _cif_desde_conteos(eventos, tabla[:, -1])
+        idx = np.searchsorted(tiempos[presentes], horizontes, side="right") - 1
+
+        # Tabla con un paciente menos en riesgo en cada tiempo
+        with np.errstate(divide="ignore", invalid="ignore"):
+            menos = n_riesgo - 1
+            riesgo = np.where(menos > 0, d / menos, 0.0)
+            riesgo_causa = np.where(menos > 0, eventos / menos, 0.0)
+        s_menos = np.cumprod(1.0 - riesgo)
+        s_menos_previa = np.concatenate([[1.0], s_menos[:-1]])
+        cif_menos = np.cumsum(s_menos_previa * riesgo_causa, axis=-1)
+        cif_menos_previa = np.concatenate([np.zeros((n_causas, 1)), cif_menos[:, :-1]], axis=1)
+
+        # Una muestra por celda (tiempo, causa o censura) con pacientes
+        s, columna = np.nonzero(tabla)
+        pesos = tabla[s, columna]
+        quitado = (columna[:, None] == np.arange(n_causas)).T  # (causas, celdas)
+        menos_s = menos[s]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            salto = np.where(menos_s > 0, s_menos_previa[s] * (eventos[:, s] - quitado) / menos_s, 0.0)
+            s_nueva = s_menos_previa[s] * np.where(menos_s > 0, 1.0 - (d[s] - quitado.sum(axis=0)) / menos_s, 1.0)
+            escala = np.where(supervivencia[s] > 0, s_nueva / supervivencia[s], 0.0)
+        h = np.maximum(idx, 0)
+        # (celdas, causas, horizontes)
+        despues = (cif_menos_previa[:, s] + salto).T[..., None] + escala[:, None, None] * (
+            cif[:, h][None] - cif[:, s].T[..., None]
+        )
+        antes = np.where(idx >= 0, cif_menos[:, h], 0.0)[None]
+        valores = np.where(idx[None, None] >= s[:, None, None], despues, antes)
+        resultado[etiqueta.item()] = (pesos, valores)
+    return resultado
+
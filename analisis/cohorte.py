@@ -0,0 +1,194 @@
+"""Cohorte de receptores de trasplante renal a nivel de paciente.
+
+El artículo base no publica los datos individuales, así que la cohorte se
+genera de forma sintética (y reproducible) respetando los conteos y las CIF
+reportadas en Pinto-Ramírez et al. (2022). Se guarda y se lee en formato
+columnar (Parquet o Arrow IPC) con tipos compactos.
+"""
+
+import hashlib
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.feather as feather
+import pyarrow.parquet as pq
+
+DIAS_POR_ANIO = 365.25
+HORIZONTES_ANIOS = (1, 3, 5)
+
+# Códigos de causa: 0 = censura, 1 = muerte, 2 = pérdida del injerto
+CAUSAS = {1: "Muerte", 2: "Pérdida del injerto"}
+# Códigos de grupo: 0 = donante fallecido (DD), 1 = donante vivo (LD)
+GRUPOS = ("DD", "LD")
+
+N_COHORTE = 1454
+
+# Conteos por tipo de donante: (censurado, muerte, pérdida del injerto)
+_CONTEOS = {0: (754, 121, 127), 1: (394, 16, 42)}
+# Fracción de los eventos de cada causa que ocurre en [0,1), [1,3) y [3,5] años,
+# proporcional a los incrementos de la CIF publicada
+_TRAMOS_ANIOS = (0.0, 1.0, 3.0, 5.0)
+_REPARTO = {
+    (0, 1): (5.8, 7.1, 4.3),
+    (0, 2): (9.0, 3.5, 3.9),
+    (1, 1): (1.4, 2.9, 1.2),
+    (1, 2): (5.1, 4.1, 5.9),
+}
+# Censura uniforme en años y fracción sin censurar a mitad de cada tramo
+_CENSURA_ANIOS = (0.5, 6.0)
+_MITADES = (np.array(_TRAMOS_ANIOS[:-1]) + np.array(_TRAMOS_ANIOS[1:])) / 2
+_SIN_CENSURA = 1 - np.clip((_MITADES - _CENSURA_ANIOS[0]) / (_CENSURA_ANIOS[1] - _CENSURA_ANIOS[0]), 0, 1)
+
+# Pacientes con cada característica según la causa (censurado, muerte, pérdida),
+# tomados de la tabla de distribución y de los porcentajes por evento del artículo
+_BINARIAS = {
+    "Femenino": (670, 90, 108),
+    "BKV": (20, 1, 15),
+    "CMV": (44, 18, 14),
+    "RechazoAgudo": (340, 45, 88),
+    "StentCoronario": (9, 3, 1),
+}
+# Indicadores de todo el seguimiento: se solapan con la causa del primer evento
+# (parte de las pérdidas del injerto termina después en muerte y viceversa)
+_INDICADORES = {
+    "Muerte": (0, 137, 113),
+    "PerdidaInjerto": (0, 22, 169),
+}
+# Edad: mediana por causa y desviación típica (años)
+_EDAD = ((43, 52, 44), 12.0)
+# Log-normales por causa: (medianas, sigma del logaritmo)
+_CREATININA = ((1.28, 1.68, 3.49), (0.35, 0.32, 0.44))  # mg/dL a 12 meses
+_DIALISIS = ((9.0, 13.0, 11.0), (0.51, 0.60, 0.73))  # meses
+# Isquemia fría (horas) por tipo de donante: (mediana, sigma del logaritmo)
+_CIT = {0: (16.0, 0.45), 1: (1.5, 0.5)}
+
+
+def _repartir(total, pesos):
+    """Reparte un entero según pesos (método del mayor residuo)."""
+    pesos = np.asarray(pesos, dtype=float)
+    cuota = total * pesos / pesos.sum()
+    base = np.floor(cuota).astype(np.int64)
+    faltan = int(total - base.sum())
+    base[np.argsort(base - cuota)[:faltan]] += 1
+    return base
+
+
+def _asignar(rng, n, conteo, total):
+    """Indicador con ``conteo / total`` de verdaderos, en posiciones al azar."""
+    return rng.permutation(n) < round(n * conteo / total)
+
+
+def generar_cohorte(n=N_COHORTE, semilla=42):
+    """Cohorte sintética con tiempo (días), causa, tipo de donante y covariables.
+
+    Para ``n`` distinto del tamaño original los conteos se escalan de forma
+    proporcional, lo que permite simular extractos de registro más grandes.
+    Las covariables se generan dentro de cada causa, de modo que con el
+    tamaño original reproducen exactamente los conteos publicados.
+    """
+    rng = np.random.default_rng(semilla)
+    n_grupo = _repartir(n, [sum(_CONTEOS[g]) for g in (0, 1)])
+
+    tiempos, causas, grupos = [], [], []
+    for g in (0, 1):
+        n_causa = _repartir(n_grupo[g], _CONTEOS[g])
+        # Censura administrativa escalonada a lo largo del seguimiento
+        censura = rng.uniform(*_CENSURA_ANIOS, size=n_causa[0])
+        tiempos.append(censura)
+        causas.append(np.zeros(n_causa[0], dtype=np.int8))
+        for k in (1, 2):
+            # Los incrementos se ponderan por la fracción aún no censurada
+            n_tramo = _repartir(n_causa[k], np.asarray(_REPARTO[(g, k)]) * _SIN_CENSURA)
+            for i, m in enumerate(n_tramo):
+                tiempos.append(rng.uniform(_TRAMOS_ANIOS[i], _TRAMOS_ANIOS[i + 1], size=m))
+                causas.append(np.full(m, k, dtype=np.int8))
+        grupos.append(np.full(n_grupo[g], g, dtype=np.int8))
+
+    tiempo = np.concatenate(tiempos)
+    orden = rng.permutation(len(tiempo))
+    causa = np.concatenate(causas)[orden]
+    grupo = np.concatenate(grupos)[orden]
+
+    binarias = {nombre: np.zeros(n, dtype=bool) for nombre in (*_BINARIAS, *_INDICADORES)}
+    edad = np.empty(n)
+    creatinina = np.empty(n)
+    dialisis = np.empty(n)
+    for k in (0, 1, 2):
+        idx = np.flatnonzero(causa == k)
+        for nombre, conteos in (_BINARIAS | _INDICADORES).items():
+            binarias[nombre][idx] = _asignar(rng, len(idx), conteos[k], _CONTEOS[0][k] + _CONTEOS[1][k])
+        edad[idx] = rng.normal(_EDAD[0][k], _EDAD[1], size=len(idx))
+        creatinina[idx] = _CREATININA[0][k] * np.exp(rng.normal(0, _CREATININA[1][k], size=len(idx)))
+        dialisis[idx] = _DIALISIS[0][k] * np.exp(rng.normal(0, _DIALISIS[1][k], size=len(idx)))
+    cit = np.empty(n)
+    for g, (mediana, sigma) in _CIT.items():
+        idx = np.flatnonzero(grupo == g)
+        cit[idx] = mediana * np.exp(rng.normal(0, sigma, size=len(idx)))
+
+    femenino = binarias.pop("Femenino")
+    return pd.DataFrame({
+        "Tiempo": np.ceil(tiempo[orden] * DIAS_POR_ANIO).astype(np.int16),
+        "Causa": causa,
+        "DonanteVivo": grupo.astype(bool),
+        "Sexo": pd.Categorical.from_codes(femenino.astype(np.int8), categories=["Masculino", "Femenino"]),
+        "Edad": np.clip(np.round(edad), 18, 80).astype(np.int8),
+        **binarias,
+        "Creatinina12m": np.clip(creatinina, 0.4, 12.0).astype(np.float32),
+        "TiempoDialisis": np.clip(dialisis, 0.0, 200.0).astype(np.float32),
+        "CIT": cit.astype(np.float32),
+    })
+
+
+def guardar_cohorte(cohorte, ruta):
+    """Guarda la cohorte en Parquet (``.parquet``) o Arrow IPC (otra extensión)."""
+    tabla = pa.Table.from_pandas(cohorte, preserve_index=False)
+    if Path(ruta).suffix == ".parquet":
+        pq.write_table(tabla, ruta)
+    else:
+        # Un solo bloque por columna: al leer no hay que concatenar (ni copiar)
+        feather.write_feather(tabla, ruta, compression="uncompressed", chunksize=max(len(tabla), 1))
+
+
+def leer_cohorte(ruta, columnas=None):
+    """Lee una cohorte guardada con :func:`guardar_cohorte`.
+
+    El archivo se abre mapeado en memoria. En Arrow IPC sin compresión las
+    columnas numéricas se usan sin copiarse (el sistema operativo carga las
+    páginas a medida que se leen); Parquet siempre se decodifica. Los tipos
+    categóricos y booleanos se conservan al pasar a pandas.
+    """
+    if Path(ruta).suffix == ".parquet":
+        tabla = pq.read_table(ruta, columns=columnas, memory_map=True)
+    else:
+        tabla = feather.read_table(ruta, columns=columnas, memory_map=True)
+    return tabla.to_pandas(split_blocks=True)
+
+
+class HuellaPorBloques:
+    """:func:`huella` calculada bloque a bloque.
+
+    Con los bloques de filas consecutivos de una cohorte (y los mismos
+    tipos) el resultado es el de la cohorte completa: el hash de cada fila
+    no depende de las demás.
+    """
+
+    def __init__(self):
+        self._hash = None
+
+    def agregar(self, bloque):
+        if self._hash is None:
+            columnas = ",".join(f"{c}:{t}" for c, t in bloque.dtypes.items()).encode()
+            self._hash = hashlib.sha256(columnas)
+        self._hash.update(pd.util.hash_pandas_object(bloque, index=False).to_numpy().tobytes())
+
+    def valor(self):
+        return self._hash.hexdigest()
+
+
+def huella(cohorte):
+    """Hash del contenido de la cohorte, útil como clave de caché."""
+    huella_cohorte = HuellaPorBloques()
+    huella_cohorte.agregar(cohorte)
+    return huella_cohorte.valor()
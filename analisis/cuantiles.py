@@ -0,0 +1,100 @@
+"""Cuantiles y momentos en memoria acotada, actualizados observación a observación."""
+
+import numpy as np
+
+
+class CuantilesP2:
+    """Algoritmo P² (Jain y Chlamtac, 1985) vectorizado sobre muchas celdas.
+
+    Cada cuantil de cada celda se sigue con cinco marcadores (alturas y
+    posiciones) que se ajustan con una interpolación parabólica tras cada
+    observación: la memoria es 10 valores por cuantil y celda, sea cual sea
+    el número de observaciones. Con menos de cinco observaciones el valor es
+    el cuantil exacto de las guardadas.
+    """
+
+    def __init__(self, probabilidades, forma):
+        p = np.asarray(probabilidades, dtype=float)
+        self.probabilidades = p
+        self.forma = (len(p), *forma)
+        self.n = 0
+        # Marcadores aplanados (5, cuantiles × celdas); cada cuantil es un tramo contiguo
+        celdas = int(np.prod(forma, dtype=np.int64))
+        self.alturas = np.empty((5, len(p) * celdas))
+        self.posiciones = np.empty((5, len(p) * celdas))
+        # Posiciones deseadas de los marcadores y su incremento por observación
+        self.incremento = np.repeat(np.stack([np.zeros_like(p), p / 2, p, (1 + p) / 2, np.ones_like(p)]), celdas, axis=1)
+        self.deseadas = np.repeat(np.stack([np.ones_like(p), 1 + 2 * p, 1 + 4 * p, 3 + 2 * p, 5 * np.ones_like(p)]), celdas, axis=1)
+
+    def actualizar(self, valores):
+        """Agrega una observación por celda (``valores`` con la forma de las celdas)."""
+        x = np.tile(np.ravel(valores), len(self.probabilidades))
+        if self.n < 5:
+            self.alturas[self.n] = x
+            self.n += 1
+            if self.n == 5:
+                self.alturas.sort(axis=0)
+                self.posiciones[:] = np.arange(1, 6)[:, None]
+            return
+        q, n = self.alturas, self.posiciones
+        np.minimum(q[0], x, out=q[0])
+        np.maximum(q[4], x, out=q[4])
+        # Los marcadores por encima de la observación avanzan una posición
+        n[1:4] += x < q[1:4]
+        n[4] += 1
+        self.n += 1
+        self.deseadas += self.incremento
+
+        for i in (1, 2, 3):
+            d = self.deseadas[i] - n[i]
+            celdas = np.flatnonzero(((d >= 1) & (n[i + 1] - n[i] > 1)) | ((d <= -1) & (n[i - 1] - n[i] < -1)))
+            if not len(celdas):
+                continue
+            # Solo se recalculan los marcadores que se mueven
+            d = np.sign(d[celdas])
+            qa, qi, qs = q[i - 1, celdas], q[i, celdas], q[i + 1, celdas]
+            na, ni, ns = n[i - 1, celdas], n[i, celdas], n[i + 1, celdas]
+            parabolica = qi + d / (ns - na) * ((ni - na + d) * (qs - qi) / (ns - ni) + (ns - ni - d) * (qi - qa) / (ni - na))
+            sube = d > 0
+            lineal = qi + d * (np.where(sube, qs, qa) - qi) / (np.where(sube, ns, na) - ni)
+            q[i, celdas] = np.where((qa < parabolica) & (parabolica < qs), parabolica, lineal)
+            n[i, celdas] = ni + d
+
+    def actualizar_lote(self, valores):
+        """Agrega las observaciones de ``valores`` (eje 0) en orden."""
+        for fila in valores:
+            self.actualizar(fila)
+
+    def valor(self):
+        """Cuantiles estimados con forma (probabilidades, *celdas)."""
+        if self.n >= 5:
+            return self.alturas[2].reshape(self.forma).copy()
+        if self.n == 0:
+            raise ValueError("No hay observaciones")
+        guardadas = self.alturas[:self.n].reshape(self.n, *self.forma)
+        return np.stack([np.quantile(guardadas[:, j], p, axis=0) for j, p in enumerate(self.probabilidades)])
+
+
+class Momentos:
+    """Media y varianza por celda, combinando lotes con las fórmulas de Chan."""
+
+    def __init__(self, forma):
+        self.n = 0
+        self.media = np.zeros(forma)
+        self.m2 = np.zeros(forma)
+
+    def actualizar_lote(self, valores):
+        """Agrega las observaciones de ``valores`` (eje 0)."""
+        b = len(valores)
+        if b == 0:
+            return
+        media = valores.mean(axis=0)
+        m2 = ((valores - media) ** 2).sum(axis=0)
+        total = self.n + b
+        delta = media - self.media
+        self.media = self.media + delta * b / total
+        self.m2 = self.m2 + m2 + delta**2 * self.n * b / total
+        self.n = total
+
+    def desviacion(self, ddof=1):
+        return np.sqrt(self.m2 / max(self.n - ddof, 1))
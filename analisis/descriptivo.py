@@ -0,0 +1,161 @@
+"""Tablas descriptivas de la cohorte obtenidas por agregación (group-by)."""
+
+import numpy as np
+import pandas as pd
+
+from analisis.cif import _codificar
+from analisis.cohorte import CAUSAS
+
+# Tipo de evento según la causa del primer evento
+EVENTOS = {0: "Censurado", **CAUSAS}
+
+# Variables de la tabla de distribución y etiquetas de sus categorías
+_VARIABLES = {
+    "Sexo": None,
+    "PerdidaInjerto": ("No", "Sí"),
+    "Muerte": ("No", "Sí"),
+    "DonanteVivo": ("Fallecido", "Vivo"),
+    "BKV": ("No", "Sí"),
+    "CMV": ("No", "Sí"),
+    "RechazoAgudo": ("No", "Sí"),
+    "StentCoronario": ("No", "Sí"),
+}
+
+# Variables cuyos conteos por tipo de evento alimentan las tablas y gráficos del EDA
+VARIABLES_EDA = (*_VARIABLES, "Edad")
+
+# Columnas de desenlace: no son covariables para comparar grupos
+_DESENLACES = ("Tiempo", "Causa", "Muerte", "PerdidaInjerto")
+
+
+def tipo_evento(cohorte):
+    """Tipo de evento de cada paciente como columna categórica."""
+    return pd.Categorical.from_codes(cohorte["Causa"].to_numpy(), categories=list(EVENTOS.values()))
+
+
+def conteos_por_evento(cohorte, por):
+    """Pacientes por tipo de evento (columnas) para cada valor de ``por`` (filas).
+
+    Un ``bincount`` sobre el código del valor y la causa. Las categóricas
+    conservan todas sus categorías; las demás, los valores observados. Las
+    filas quedan indexadas por valores simples (no categóricos), de modo que
+    los conteos de dos partes de la cohorte se pueden sumar.
+    """
+    valores = cohorte[por]
+    if isinstance(valores.dtype, pd.CategoricalDtype):
+        etiquetas, codigo = np.asarray(valores.cat.categories), valores.cat.codes.to_numpy()
+    else:
+        etiquetas, codigo = _codificar(valores.to_numpy())
+    celda = codigo.astype(np.int64) * len(EVENTOS) + cohorte["Causa"].to_numpy()
+    conteos = np.bincount(celda, minlength=len(etiquetas) * len(EVENTOS)).reshape(-1, len(EVENTOS))
+    return pd.DataFrame(conteos, index=pd.Index(etiquetas, name=por), columns=list(EVENTOS.values()))
+
+
+def conteos_eda(cohorte):
+    """``{variable: conteos_por_evento}`` de cada variable de ``VARIABLES_EDA``.
+
+    Son los únicos datos que necesitan las tablas y gráficos de conteos del
+    EDA, y los de dos partes de la cohorte se suman.
+    """
+    return {variable: conteos_por_evento(cohorte, variable) for variable in VARIABLES_EDA}
+
+
+def tabla_distribucion(conteos):
+    """Conteo y porcentaje de cada categoría de las variables binarias (desde :func:`conteos_eda`)."""
+    partes = []
+    for variable, etiquetas in _VARIABLES.items():
+        conteo = conteos[variable].sum(axis=1)
+        n = conteo.sum()
+        if etiquetas is not None:
+            conteo = conteo.reindex([False, True], fill_value=0).set_axis(list(etiquetas))
+        partes.append(pd.DataFrame({
+            "Variable": variable,
+            "Categoría": conteo.index.astype(str),
+            "Conteo": conteo.to_numpy(),
+            "Porcentaje (%)": (100 * conteo / n).round(2).to_numpy(),
+        }))
+    return pd.concat(partes, ignore_index=True)
+
+
+def proporcion_por_evento(conteos):
+    """Proporción de ``True`` de una variable booleana dentro de cada tipo de evento."""
+    conteos = conteos.reindex([False, True], fill_value=0)
+    return conteos.loc[True] / conteos.sum()
+
+
+def mediana_por_evento(conteos):
+    """Mediana de una variable discreta dentro de cada tipo de evento, desde sus conteos.
+
+    Como en pandas, con un número par de pacientes es el promedio de los
+    dos valores centrales.
+    """
+    conteos = conteos.sort_index()
+    valores = conteos.index.to_numpy(dtype=float)
+    medianas = []
+    for evento in conteos.columns:
+        acumulado = np.cumsum(conteos[evento].to_numpy())
+        n = acumulado[-1] if len(acumulado) else 0
+        if n == 0:
+            medianas.append(np.nan)
+            continue
+        centrales = np.searchsorted(acumulado, [(n - 1) // 2, n // 2], side="right")
+        medianas.append(valores[centrales].mean())
+    return pd.Series(medianas, index=conteos.columns)
+
+
+def resumen_caja(cohorte, columna, max_atipicos=100):
+    """Estadísticos de un diagrama de caja por tipo de evento.
+
+    Devuelve ``(resumen, atipicos)``: cuartiles, bigotes (1.5 RIC, acotados a
+    los datos) y media por tipo de evento, más una muestra de a lo sumo
+    ``max_atipicos`` valores atípicos por tipo tomada a intervalos regulares
+    del orden (siempre incluye el mínimo y el máximo). Así el tamaño de la
+    figura no depende del número de pacientes.
+    """
+    evento = pd.Series(tipo_evento(cohorte), index=cohorte.index, name="Tipo de Evento")
+    valores = cohorte[columna]
+    grupos = valores.groupby(evento, observed=False)
+    resumen = grupos.quantile([0.25, 0.5, 0.75]).unstack()
+    resumen.columns = ["q1", "mediana", "q3"]
+    resumen["media"] = grupos.mean()
+    ric = resumen["q3"] - resumen["q1"]
+
+    # Bigotes: valores extremos dentro de las vallas de 1.5 RIC
+    inferior = (resumen["q1"] - 1.5 * ric).reindex(evento).to_numpy()
+    superior = (resumen["q3"] + 1.5 * ric).reindex(evento).to_numpy()
+    dentro = pd.Series((valores.to_numpy() >= inferior) & (valores.to_numpy() <= superior), index=cohorte.index)
+    resumen["bigote_inf"] = valores[dentro].groupby(evento[dentro], observed=False).min()
+    resumen["bigote_sup"] = valores[dentro].groupby(evento[dentro], observed=False).max()
+    resumen["n"] = grupos.size()
+    resumen["n_atipicos"] = (~dentro).groupby(evento, observed=False).sum()
+
+    # Muestra de atípicos: posiciones equiespaciadas dentro de cada tipo
+    atipicos = pd.DataFrame({"Tipo de Evento": evento[~dentro], columna: valores[~dentro]})
+    atipicos = atipicos.sort_values(["Tipo de Evento", columna])
+    posicion = atipicos.groupby("Tipo de Evento", observed=False).cumcount().to_numpy()
+    total = atipicos["Tipo de Evento"].map(resumen["n_atipicos"]).to_numpy(dtype=int)
+    # Posición i conservada si coincide con round(j (m - 1) / (c - 1)) para algún j
+    escala = (max_atipicos - 1) / np.maximum(total - 1, 1)
+    conservar = (total <= max_atipicos) | (np.round(np.round(posicion * escala) / escala) == posicion)
+    return resumen, atipicos[conservar].reset_index(drop=True)
+
+
+def estratos(cohorte, cuantiles=4):
+    """Covariables de la cohorte como códigos de grupo para la prueba de Gray.
+
+    Las booleanas y categóricas se usan tal cual; las numéricas se cortan en
+    ``cuantiles`` grupos de igual tamaño. Devuelve ``{nombre: códigos}`` con
+    -1 en los valores faltantes.
+    """
+    salida = {}
+    for columna in cohorte.columns.drop(list(_DESENLACES), errors="ignore"):
+        valores = cohorte[columna]
+        if isinstance(valores.dtype, pd.CategoricalDtype):
+            salida[columna] = valores.cat.codes.to_numpy()
+        elif valores.dtype == bool:
+            salida[columna] = valores.to_numpy().view(np.int8)
+        elif pd.api.types.is_numeric_dtype(valores):
+            grupos = pd.qcut(valores, cuantiles, labels=False, duplicates="drop")
+            salida[f"{columna} (cuantiles)"] = grupos.fillna(-1).to_numpy(dtype=np.int8)
+    return salida
+
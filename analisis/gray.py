@@ -0,0 +1,325 @@
+"""Prueba de Gray para comparar CIF entre grupos."""
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from analisis.cif import _cif_desde_conteos, _codificar, _columna_causa, _contar
+from analisis.distribuciones import chi2_sf
+
+
+@dataclass(frozen=True)
+class ResultadoGray:
+    """Estadístico de Gray truncado en cada horizonte ``tau``."""
+
+    causa: int
+    tau: np.ndarray
+    estadistico: np.ndarray
+    gl: int
+    p_valor: np.ndarray
+
+
+@dataclass(frozen=True)
+class ResultadoPermutacion(ResultadoGray):
+    """Prueba de Gray con p-valores Monte Carlo por permutación de etiquetas.
+
+    ``p_valor`` es (1 + #{estadístico permutado >= observado}) / (P + 1) y
+    ``error`` su error estándar Monte Carlo.
+    """
+
+    error: np.ndarray
+    permutaciones: int
+
+
+def _gray_incrementos(conteos, k, ajuste=None):
+    """Aportes de cada tiempo al score y varianza acumulada de la prueba de Gray.
+
+    ``conteos`` tiene forma (..., grupos, tiempos, causas + censura) y ``k``
+    es el índice de la causa de interés. El conjunto en riesgo de Gray para
+    el grupo g es R_g(t) = Y_g(t) (1 - F_g(t-)) / S_g(t-) y el score compara
+    los eventos observados con los esperados según R_g.
+
+    La varianza es el estimador de Gray (1988). Bajo H0 el score truncado
+    en τ es, a primer orden, Σ_l Σ_{u <= τ} a_kl1(u) dM_l1(u) + a_kl2(u)
+    dM_l2(u), con M_l1 y M_l2 las martingalas de la causa de interés y de
+    las competidoras del grupo l. Además del término directo δ_kl - p_k(u),
+    los coeficientes recogen cómo un evento en u mueve F_l y S_l, y con
+    ellos los conjuntos en riesgo de los tiempos posteriores:
+
+        a_kl1(u) = δ_kl - p_k(u) - (1 - F_l(u) - S_l(u-)) / Y_l(u) · H_kl(u, τ)
+        a_kl2(u) = -(1 - F_l(u)) / Y_l(u) · H_kl(u, τ)
+        H_kl(u, τ) = Σ_{u < t <= τ} dΓ(t) (δ_kl - p_k(t)) Y_l(t) / S_l(t-)
+
+    con p_k = R_k / R y dΓ = d / R el riesgo de subdistribución común. Como
+    H_kl(u, τ) = C_kl(τ) - C_kl(u), con C_kl la suma acumulada, la varianza
+    Σ a_kl a_k'l dN_l en cada τ se arma con sumas acumuladas sobre u.
+    ``ajuste`` es la salida de ``_cif_desde_conteos`` sobre ``conteos``, para
+    reutilizar los conjuntos en riesgo entre causas.
+    Devuelve ``(u, v)`` con formas (..., G, T) y (..., G, G, T); ``v[..., t]``
+    es la varianza del score acumulado hasta el tiempo t.
+    """
+    eventos = np.moveaxis(conteos[..., :-1], -1, -2)
+    if ajuste is None:
+        ajuste = _cif_desde_conteos(eventos, conteos[..., -1])
+    n_riesgo, supervivencia, cif = ajuste
+    primera = np.ones(supervivencia.shape[:-1] + (1,))
+    s_previa = np.concatenate([primera, supervivencia[..., :-1]], axis=-1)
+    f = cif[..., k, :]
+    f_previa = np.concatenate([0 * primera, f[..., :-1]], axis=-1)
+    d = eventos[..., k, :]
+    d_otras = eventos.sum(axis=-2) - d
+    with np.errstate(divide="ignore", invalid="ignore"):
+        riesgo = np.where(s_previa > 0, n_riesgo * (1 - f_previa) / s_previa, 0.0)
+        d_total = d.sum(axis=-2, keepdims=True)
+        r_total = riesgo.sum(axis=-2, keepdims=True)
+        fraccion = np.where(r_total > 0, riesgo / r_total, 0.0)
+        gamma = np.where(r_total > 0, d_total / r_total, 0.0)
+        peso = np.where(s_previa > 0, n_riesgo / s_previa, 0.0)
+        beta1 = np.where(n_riesgo > 0, (1 - f - s_previa) / n_riesgo, 0.0)
+        beta2 = np.where(n_riesgo > 0, (1 - f) / n_riesgo, 0.0)
+    u = d - fraccion * d_total
+
+    # Índices (..., k, l, T): k del score, l del grupo de la martingala
+    directo = np.eye(conteos.shape[-3])[..., None] - fraccion[..., :, None, :]
+    C = np.cumsum(gamma[..., None, :, :] * directo * peso[..., None, :, :], axis=-1)
+    # a_klj(u) = A_klj(u) - β_lj(u) C_kl(τ), con A la parte que solo depende de u
+    A1 = directo + beta1[..., None, :, :] * C
+    A2 = beta2[..., None, :, :] * C
+    b1, b2 = beta1[..., None, :, :], beta2[..., None, :, :]
+    d1, d2 = d[..., None, :, :], d_otras[..., None, :, :]
+    cruzado = np.cumsum(A1 * b1 * d1 + A2 * b2 * d2, axis=-1)
+    v = np.cumsum(
+        np.einsum("...klt,...jlt,...lt->...kjt", A1, A1, d) + np.einsum("...klt,...jlt,...lt->...kjt", A2, A2, d_otras),
+        axis=-1,
+    )
+    v -= np.einsum("...jlt,...klt->...kjt", C, cruzado)
+    v -= np.einsum("...klt,...jlt->...kjt", C, cruzado)
+    cuadrado = np.cumsum(beta1**2 * d + beta2**2 * d_otras, axis=-1)
+    v += np.einsum("...klt,...jlt,...lt->...kjt", C, C, cuadrado)
+    return u, v
+
+
+def _estadistico(u, v, idx):
+    """Forma cuadrática z' V^-1 z del score acumulado y su varianza en cada índice de ``idx``."""
+    z = np.cumsum(u, axis=-1)[..., :-1, :]
+    var = v[..., :-1, :-1, :]
+    z = np.moveaxis(z[..., np.maximum(idx, 0)], -1, -2)
+    var = np.moveaxis(var[..., np.maximum(idx, 0)], -1, -3)
+    estadistico = np.einsum("...i,...ij,...j->...", z, np.linalg.pinv(var), z)
+    return np.where(idx >= 0, estadistico, 0.0)
+
+
+def prueba_gray(tabla, tau):
+    """Prueba de Gray para cada causa en todos los horizontes ``tau``.
+
+    ``tabla`` es la :class:`analisis.cif.TablaEventos` de la cohorte. Los
+    tiempos agrupados se recorren una sola vez: los aportes de cada tiempo
+    se acumulan y el estadístico truncado en cada horizonte se lee de las
+    sumas acumuladas, así que pedir una malla mensual cuesta lo mismo que
+    pedir tres horizontes. Devuelve ``{causa: ResultadoGray}``.
+    """
+    tau = np.asarray(tau, dtype=float)
+    idx = np.searchsorted(tabla.tiempos, tau, side="right") - 1
+    gl = len(tabla.grupos) - 1
+    ajuste = _cif_desde_conteos(np.moveaxis(tabla.conteos[..., :-1], -1, -2), tabla.conteos[..., -1])
+
+    resultados = {}
+    for k, codigo in enumerate(tabla.causas):
+        estadistico = _estadistico(*_gray_incrementos(tabla.conteos, k, ajuste), idx)
+        resultados[codigo] = ResultadoGray(
+            causa=codigo,
+            tau=tau,
+            estadistico=estadistico,
+            gl=gl,
+            p_valor=chi2_sf(estadistico, gl),
+        )
+    return resultados
+
+
+def barrido_gray(tiempo, causa, covariables, tau, causas=(1, 2)):
+    """Prueba de Gray de K grupos para cada covariable y cada causa a la vez.
+
+    ``covariables`` es ``{nombre: códigos}`` con un código entero por
+    paciente (-1 para faltantes, que se excluyen de esa covariable). Los
+    tiempos y las causas se codifican una sola vez para todas: cada
+    covariable solo añade un conteo sobre ese índice común. Las tablas de
+    las covariables con el mismo número de grupos se apilan y sus conjuntos
+    en riesgo se calculan juntos, una vez para todas las causas.
+    Devuelve ``{nombre: {causa: ResultadoGray}}``.
+    """
+    causas = tuple(causas)
+    tau = np.asarray(tau, dtype=float)
+    tiempos, codigo_tiempo = _codificar(np.asarray(tiempo))
+    columna = _columna_causa(np.asarray(causa), causas)
+    idx = np.searchsorted(tiempos, tau, side="right") - 1
+
+    # Tablas de conteos agrupadas por número de grupos
+    por_grupos = {}
+    for nombre, codigos in covariables.items():
+        codigos = np.asarray(codigos)
+        validos = codigos >= 0
+        if validos.all():
+            etiquetas, codigo_grupo = _codificar(codigos)
+            tabla = _contar(codigo_grupo, len(etiquetas), codigo_tiempo, len(tiempos), columna, len(causas) + 1)
+        else:
+            etiquetas, codigo_grupo = _codificar(codigos[validos])
+            tabla = _contar(
+                codigo_grupo, len(etiquetas), codigo_tiempo[validos], len(tiempos), columna[validos], len(causas) + 1
+            )
+        por_grupos.setdefault(len(etiquetas), []).append((nombre, tabla))
+
+    resultados = {nombre: {} for nombre in covariables}
+    for n_grupos, tablas in por_grupos.items():
+        if n_grupos < 2:
+            continue  # una sola categoría: no hay nada que comparar
+        conteos = np.stack([tabla for _, tabla in tablas])
+        ajuste = _cif_desde_conteos(np.moveaxis(conteos[..., :-1], -1, -2), conteos[..., -1])
+        for k, codigo in enumerate(causas):
+            estadisticos = _estadistico(*_gray_incrementos(conteos, k, ajuste), idx)
+            for (nombre, _), estadistico in zip(tablas, estadisticos):
+                resultados[nombre][codigo] = ResultadoGray(
+                    causa=codigo,
+                    tau=tau,
+                    estadistico=estadistico,
+                    gl=n_grupos - 1,
+                    p_valor=chi2_sf(estadistico, n_grupos - 1),
+                )
+    return resultados
+
+
+# Celdas compartidas por cada proceso del pool (se envían una sola vez)
+_CELDAS = None
+
+
+def _iniciar_proceso(*celdas):
+    global _CELDAS
+    _CELDAS = celdas
+
+
+def _estadisticos_permutados(semillas, idx, celdas=None):
+    """Estadísticos de Gray de un lote de permutaciones, con forma (P, causas, horizontes).
+
+    Permutar las etiquetas reparte los pacientes de cada celda (tiempo,
+    causa) entre los grupos sin cambiar el tamaño de ningún grupo: cuántos
+    caen en cada celda sigue una hipergeométrica multivariante, que se
+    sortea grupo a grupo sobre los totales de la tabla sin tocar pacientes.
+    Las tablas de todas las permutaciones del lote se evalúan juntas.
+    """
+    totales, no_vacias, tamanos, forma = celdas or _CELDAS
+    P, n_grupos = len(semillas), len(tamanos)
+    conteos = np.zeros((P, n_grupos, forma[0] * forma[1]), dtype=np.int64)
+    for p, semilla in enumerate(semillas):
+        rng = np.random.default_rng(semilla)
+        restantes = totales
+        for g in range(n_grupos - 1):
+            conteos[p, g, no_vacias] = rng.multivariate_hypergeometric(restantes, tamanos[g])
+            restantes = restantes - conteos[p, g, no_vacias]
+        conteos[p, -1, no_vacias] = restantes
+    conteos = conteos.reshape(P, n_grupos, *forma)
+    ajuste = _cif_desde_conteos(np.moveaxis(conteos[..., :-1], -1, -2), conteos[..., -1])
+    return np.stack([_estadistico(*_gray_incrementos(conteos, k, ajuste), idx) for k in range(forma[1] - 1)], axis=1)
+
+
+def prueba_gray_permutacion(tabla, tau, P=2000, semilla=42, n_procesos=None, memoria_mb=256):
+    """Prueba de Gray con p-valores por permutación de las etiquetas de grupo.
+
+    No depende de la aproximación chi-cuadrado, que falla con estratos o
+    conteos de eventos pequeños. Cada permutación se sortea directamente
+    como tabla de conteos a partir de los totales por celda de ``tabla``
+    (:class:`analisis.cif.TablaEventos`), así que su costo depende del
+    número de tiempos únicos y no del de pacientes. Las permutaciones se
+    evalúan por lotes (dimensionados para no superar ``memoria_mb``)
+    repartidos en un pool de procesos. Cada permutación tiene su hijo de
+    ``SeedSequence``, así que el resultado no depende del tamaño de lote ni
+    de ``n_procesos``; con ``n_procesos=1`` no se crea el pool.
+    Devuelve ``{causa: ResultadoPermutacion}``.
+    """
+    tau = np.asarray(tau, dtype=float)
+    observado = prueba_gray(tabla, tau)
+
+    totales = tabla.conteos.sum(axis=0).ravel()
+    no_vacias = np.flatnonzero(totales)
+    celdas = (totales[no_vacias], no_vacias, tabla.conteos.sum(axis=(1, 2)), tabla.conteos.shape[1:])
+    idx = np.searchsorted(tabla.tiempos, tau, side="right") - 1
+
+    # Lote: las tablas de conteos y los términos de la varianza de cada permutación
+    n_grupos, n_tiempos, n_columnas = tabla.conteos.shape
+    por_permutacion = 8 * n_grupos**2 * n_tiempos * (n_columnas + 8)
+    tam_lote = max(1, min(P, int(memoria_mb * 2**20 // por_permutacion)))
+    semillas = np.random.SeedSequence(semilla).spawn(P)
+    lotes = [semillas[i:i + tam_lote] for i in range(0, P, tam_lote)]
+    n_procesos = min(n_procesos or os.cpu_count() or 1, len(lotes))
+
+    if n_procesos == 1:
+        partes = [_estadisticos_permutados(lote, idx, celdas) for lote in lotes]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=n_procesos,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_iniciar_proceso,
+            initargs=celdas,
+        ) as pool:
+            partes = list(pool.map(_estadisticos_permutados, lotes, [idx] * len(lotes)))
+    permutados = np.concatenate(partes)
+
+    resultados = {}
+    for k, codigo in enumerate(tabla.causas):
+        # Tolerancia relativa para que los empates numéricos cuenten como iguales
+        estadistico = observado[codigo].estadistico
+        extremos = (permutados[:, k] >= estadistico * (1 - 1e-9)).sum(axis=0)
+        p_valor = (1 + extremos) / (P + 1)
+        resultados[codigo] = ResultadoPermutacion(
+            causa=codigo,
+            tau=tau,
+            estadistico=estadistico,
+            gl=observado[codigo].gl,
+            p_valor=p_valor,
+            error=np.sqrt(p_valor * (1 - p_valor) / P),
+            permutaciones=P,
+        )
+    return resultados
+
+
+def _formato_p(p):
+    return "<0.001" if p < 0.001 else f"{p:.3f}"
+
+
+def tabla_gray(resultados, anios, nombres, alfa=0.05):
+    """Tabla de la prueba de Gray con una fila por horizonte.
+
+    Usa las primeras ``len(anios)`` posiciones de ``tau``, de modo que una
+    misma pasada puede incluir después otros horizontes (p. ej. la malla
+    mensual). ``nombres`` asocia cada código de causa con su etiqueta. Con
+    p-valores por permutación se añade su error estándar Monte Carlo.
+    """
+    h = len(anios)
+    tabla = {"Año (t)": list(anios)}
+    for codigo, nombre in nombres.items():
+        resultado = resultados[codigo]
+        p_valor = resultado.p_valor[:h]
+        tabla[f"chi² {nombre}"] = np.round(resultado.estadistico[:h], 2)
+        tabla[f"p-valor {nombre}"] = [_formato_p(p) for p in p_valor]
+        if isinstance(resultado, ResultadoPermutacion):
+            tabla[f"EE Monte Carlo {nombre}"] = np.round(resultado.error[:h], 4)
+        tabla[f"Decisión ({nombre})"] = ["Rechaza H0" if p < alfa else "No rechaza H0" for p in p_valor]
+    return pd.DataFrame(tabla)
+
+
+def tabla_barrido(resultados, anios, nombres):
+    """Una fila por covariable y causa con chi² y p-valor en cada horizonte.
+
+    Los p-valores quedan numéricos para poder ordenar la tabla por ellos.
+    """
+    filas = []
+    for variable, por_causa in resultados.items():
+        for codigo, resultado in por_causa.items():
+            fila = {"Variable": variable, "Causa": nombres[codigo], "gl": resultado.gl}
+            for h, anio in enumerate(anios):
+                fila[f"chi² {anio} año(s)"] = resultado.estadistico[h]
+                fila[f"p-valor {anio} año(s)"] = resultado.p_valor[h]
+            filas.append(fila)
+    return pd.DataFrame(filas)
@@ -0,0 +1,102 @@
+"""Estado incremental de la CIF para un registro que crece cada día.
+
+El estado es la tabla de conteos por grupo, tiempo único y causa (más
+censura), que es todo lo que necesita Aalen-Johansen. Agregar, retirar o
+corregir registros solo toca las celdas del lote de cambios, y recalcular
+las CIF recorre los tiempos únicos, no los pacientes: el costo depende del
+tamaño del lote y del número de tiempos distintos, no del de la cohorte.
+"""
+
+import numpy as np
+
+from analisis.cif import TablaEventos, _tabla_conteos
+
+
+class EstadoCIF:
+    """Conteos acumulados (grupos, tiempos, causas + censura) de una cohorte."""
+
+    def __init__(self, causas=(1, 2)):
+        self.causas = tuple(causas)
+        self.grupos = np.empty(0)
+        self.tiempos = np.empty(0)
+        self.conteos = np.zeros((0, 0, len(self.causas) + 1), dtype=np.int64)
+
+    @classmethod
+    def desde_cohorte(cls, tiempo, causa, grupo, causas=(1, 2)):
+        estado = cls(causas)
+        estado.agregar(tiempo, causa, grupo)
+        return estado
+
+    @property
+    def n(self):
+        """Número de pacientes registrados."""
+        return int(self.conteos.sum())
+
+    def _ampliar(self, grupos, tiempos):
+        """Añade filas y columnas vacías para grupos y tiempos nuevos."""
+        nuevos_grupos = _union(self.grupos, grupos)
+        nuevos_tiempos = _union(self.tiempos, tiempos)
+        if len(nuevos_grupos) == len(self.grupos) and len(nuevos_tiempos) == len(self.tiempos):
+            return
+        conteos = np.zeros((len(nuevos_grupos), len(nuevos_tiempos), self.conteos.shape[-1]), dtype=np.int64)
+        filas = np.searchsorted(nuevos_grupos, self.grupos)
+        columnas = np.searchsorted(nuevos_tiempos, self.tiempos)
+        conteos[np.ix_(filas, columnas)] = self.conteos
+        self.grupos, self.tiempos, self.conteos = nuevos_grupos, nuevos_tiempos, conteos
+
+    def _aplicar(self, tiempo, causa, grupo, signo):
+        etiquetas, tiempos, delta = _tabla_conteos(np.asarray(tiempo), np.asarray(causa), np.asarray(grupo), self.causas)
+        if signo > 0:
+            self._ampliar(etiquetas, tiempos)
+        elif not (np.isin(etiquetas, self.grupos).all() and np.isin(tiempos, self.tiempos).all()):
+            raise ValueError("Se intenta retirar un registro que no está en el estado")
+        celdas = np.ix_(np.searchsorted(self.grupos, etiquetas), np.searchsorted(self.tiempos, tiempos))
+        actualizados = self.conteos[celdas] + signo * delta
+        if (actualizados < 0).any():
+            raise ValueError("Se intenta retirar un registro que no está en el estado")
+        self.conteos[celdas] = actualizados
+
+    def agregar(self, tiempo, causa, grupo):
+        """Registra pacientes nuevos (o el seguimiento nuevo de un paciente retirado)."""
+        self._aplicar(tiempo, causa, grupo, 1)
+
+    def retirar(self, tiempo, causa, grupo):
+        """Quita registros existentes (deben coincidir en tiempo, causa y grupo)."""
+        self._aplicar(tiempo, causa, grupo, -1)
+
+    def corregir(self, anterior, nuevo):
+        """Reemplaza registros, p. ej. una censura que pasa a ser un evento tardío.
+
+        ``anterior`` y ``nuevo`` son tuplas ``(tiempo, causa, grupo)``.
+        """
+        self.retirar(*anterior)
+        self.agregar(*nuevo)
+
+    def tabla(self):
+        """Copia del estado como :class:`analisis.cif.TablaEventos` (entrada de Gray y del bootstrap)."""
+        return TablaEventos(grupos=self.grupos, tiempos=self.tiempos, causas=self.causas, conteos=self.conteos.copy())
+
+    def curvas(self):
+        """``{grupo: CurvaCIF}``, igual que :func:`analisis.cif.aalen_johansen`."""
+        return self.tabla().curvas()
+
+    def evaluar(self, horizontes):
+        """CIF en los horizontes con forma (grupos, causas, horizontes)."""
+        return self.tabla().evaluar(horizontes)
+
+    def guardar(self, ruta):
+        np.savez(ruta, causas=np.asarray(self.causas), grupos=self.grupos, tiempos=self.tiempos, conteos=self.conteos)
+
+    @classmethod
+    def cargar(cls, ruta):
+        with np.load(ruta, allow_pickle=False) as datos:
+            estado = cls(tuple(int(k) for k in datos["causas"]))
+            estado.grupos = datos["grupos"]
+            estado.tiempos = datos["tiempos"]
+            estado.conteos = datos["conteos"]
+        return estado
+
+
+def _union(actuales, nuevos):
+    """Unión ordenada que conserva el tipo de los valores nuevos si no hay actuales."""
+    return np.union1d(actuales, nuevos) if len(actuales) else np.asarray(nuevos)
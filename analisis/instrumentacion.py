@@ -0,0 +1,145 @@
+"""Medición de tiempos por paso (secciones, figuras, serialización).
+
+Un :class:`Medidor` desactivado no mide nada: ``medir`` devuelve un contexto
+nulo compartido y ``medido`` devuelve la función sin envolver, así que el
+costo es una comparación por llamada.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+from functools import wraps
+
+import pandas as pd
+
+_NULO = nullcontext()
+
+# Acumulados del proceso para el formato de Prometheus (compartidos entre sesiones)
+_ACUMULADOS = {}
+_CANDADO = threading.Lock()
+
+
+class Medidor:
+    """Registro de la duración de cada paso de una ejecución.
+
+    ``jsonl`` es un archivo al que se agrega una línea por paso medido;
+    ``prometheus`` es un archivo de texto con los acumulados del proceso,
+    reescrito en cada :meth:`exportar` (formato del *textfile collector*).
+    """
+
+    def __init__(self, activo=False, jsonl=None, prometheus=None):
+        self.activo = activo
+        self.jsonl = jsonl
+        self.prometheus = prometheus
+        self.ejecucion = f"{time.time_ns():x}"
+        self.registros = []
+        self._nivel = 0
+
+    @classmethod
+    def desde_entorno(cls):
+        """Configuración a partir de ``TABLERO_INSTRUMENTACION`` y ``TABLERO_METRICAS``.
+
+        ``TABLERO_METRICAS`` es la ruta de exportación: termina en ``.prom``
+        para Prometheus y en cualquier otra extensión para JSONL. Definirla
+        activa también las mediciones.
+        """
+        ruta = os.environ.get("TABLERO_METRICAS")
+        activo = bool(ruta) or os.environ.get("TABLERO_INSTRUMENTACION", "") not in ("", "0")
+        if ruta and ruta.endswith(".prom"):
+            return cls(activo, prometheus=ruta)
+        return cls(activo, jsonl=ruta)
+
+    def medir(self, paso):
+        """Contexto que registra la duración de ``paso``."""
+        if not self.activo:
+            return _NULO
+        return self._medir(paso)
+
+    @contextmanager
+    def _medir(self, paso):
+        nivel = self._nivel
+        self._nivel += 1
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            segundos = time.perf_counter() - inicio
+            self._nivel = nivel
+            self._registrar(paso, segundos, nivel)
+
+    def medido(self, paso=None):
+        """Decorador equivalente a :meth:`medir` (por defecto, con el nombre de la función)."""
+        def decorar(funcion):
+            if not self.activo:
+                return funcion
+            nombre = paso or funcion.__name__
+
+            @wraps(funcion)
+            def envuelta(*args, **kwargs):
+                with self._medir(nombre):
+                    return funcion(*args, **kwargs)
+            return envuelta
+        return decorar
+
+    def _registrar(self, paso, segundos, nivel):
+        registro = {"paso": paso, "segundos": segundos, "nivel": nivel}
+        self.registros.append(registro)
+        with _CANDADO:
+            total, veces = _ACUMULADOS.get(paso, (0.0, 0))
+            _ACUMULADOS[paso] = (total + segundos, veces + 1)
+            if self.jsonl:
+                linea = {
+                    "fecha": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+                    "ejecucion": self.ejecucion,
+                    **registro,
+                }
+                with open(self.jsonl, "a", encoding="utf-8") as archivo:
+                    archivo.write(json.dumps(linea, ensure_ascii=False) + "\n")
+
+    def tabla(self, n=None):
+        """Pasos de la ejecución ordenados de más lento a más rápido."""
+        tabla = pd.DataFrame(self.registros, columns=["paso", "segundos", "nivel"])
+        tabla = tabla.sort_values("segundos", ascending=False, ignore_index=True)
+        tabla["ms"] = (1000 * tabla.pop("segundos")).round(1)
+        return tabla if n is None else tabla.head(n)
+
+    def exportar(self):
+        """Reescribe el archivo de Prometheus con los acumulados del proceso."""
+        if not self.prometheus:
+            return
+        lineas = [
+            "# HELP tablero_paso_segundos_total Tiempo acumulado por paso del tablero.",
+            "# TYPE tablero_paso_segundos_total counter",
+        ]
+        with _CANDADO:
+            acumulados = dict(_ACUMULADOS)
+        for paso, (total, _) in sorted(acumulados.items()):
+            lineas.append(f'tablero_paso_segundos_total{{paso="{_escapar(paso)}"}} {total:.6f}')
+        lineas += [
+            "# HELP tablero_paso_ejecuciones_total Veces que se ejecutó cada paso.",
+            "# TYPE tablero_paso_ejecuciones_total counter",
+        ]
+        for paso, (_, veces) in sorted(acumulados.items()):
+            lineas.append(f'tablero_paso_ejecuciones_total{{paso="{_escapar(paso)}"}} {veces}')
+        # Escritura atómica: el recolector nunca ve un archivo a medias. El
+        # temporal es único por escritura (las sesiones son hilos del mismo proceso)
+        directorio, nombre = os.path.split(os.path.abspath(self.prometheus))
+        temporal = tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", dir=directorio, prefix=f"{nombre}.", suffix=".tmp", delete=False
+        )
+        with temporal as archivo:
+            try:
+                archivo.write("\n".join(lineas) + "\n")
+            except BaseException:
+                archivo.close()
+                os.unlink(archivo.name)
+                raise
+        os.replace(archivo.name, self.prometheus)
+
+
+def _escapar(texto):
+    return texto.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
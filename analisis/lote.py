@@ -0,0 +1,343 @@
+"""Cálculo por lotes de la CIF, la prueba de Gray y el bootstrap.
+
+Los resultados se guardan como artefactos versionados (Parquet más un
+manifiesto JSON) que el tablero lee sin volver a calcular nada. Este
+módulo no depende de streamlit ni de plotly.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from analisis.bootstrap import BandasCIF, ReplicasBootstrap, bandas_bootstrap, bootstrap_adaptativo, bootstrap_multinomial
+from analisis.cache import (
+    codificar_bandas, codificar_bootstrap, codificar_gray, decodificar_bandas, decodificar_bootstrap, decodificar_gray,
+)
+from analisis.cif import CurvaCIF, TablaEventos
+from analisis.cohorte import DIAS_POR_ANIO, HORIZONTES_ANIOS, huella
+from analisis.gray import ResultadoGray, prueba_gray, prueba_gray_permutacion
+
+# Versión del formato de los artefactos (cambia si cambian las tablas o los estimadores)
+FORMATO = 4
+
+B_BOOTSTRAP = 1000
+SEMILLA_BOOTSTRAP = 42
+HORIZONTES_DIAS = np.array(HORIZONTES_ANIOS) * DIAS_POR_ANIO
+# Horizontes de la tabla de Gray seguidos de la malla mensual hasta 5 años
+TAU_GRAY = np.concatenate([HORIZONTES_DIAS, np.arange(1, 61) * DIAS_POR_ANIO / 12])
+
+_ACTUAL = "ACTUAL"
+
+
+def parametros(B=B_BOOTSTRAP, semilla=SEMILLA_BOOTSTRAP):
+    """Parámetros de un cálculo, tal como se guardan en el manifiesto."""
+    return {
+        "B": int(B),
+        "semilla": int(semilla),
+        "horizontes": [float(h) for h in HORIZONTES_DIAS],
+        "tau": [float(t) for t in TAU_GRAY],
+    }
+
+
+@dataclass(frozen=True)
+class Artefactos:
+    """Resultados de un cálculo completo sobre una cohorte."""
+
+    huella: str
+    parametros: dict
+    cif: dict
+    bootstrap: ReplicasBootstrap
+    bandas: BandasCIF
+    gray: dict
+
+    def corresponde(self, huella_cohorte, B=B_BOOTSTRAP, semilla=SEMILLA_BOOTSTRAP):
+        """Indica si los artefactos sirven para esta cohorte y estos parámetros."""
+        return self.huella == huella_cohorte and self.parametros == parametros(B, semilla)
+
+
+def tabla_eventos(cohorte):
+    """:class:`TablaEventos` de la cohorte por tipo de donante (entrada de todos los estimadores)."""
+    return TablaEventos.desde_cohorte(
+        cohorte["Tiempo"].to_numpy(), cohorte["Causa"].to_numpy(), cohorte["DonanteVivo"].to_numpy()
+    )
+
+
+def _memoizar(nombre, funcion, tabla, parametros, codificar, decodificar, cache):
+    """``funcion(tabla, **parametros)``, leída de ``cache`` si ya se calculó.
+
+    La clave de la caché sale de los arreglos de la tabla, no de los de los
+    pacientes: calcularla cuesta lo mismo para cualquier tamaño de cohorte.
+    """
+    if cache is None:
+        return funcion(tabla, **parametros)
+    arreglos = (np.asarray(tabla.causas), tabla.grupos, tabla.tiempos, tabla.conteos)
+
+    def calcular_tabla(*_, **parametros):
+        return funcion(tabla, **parametros)
+
+    return cache.memoizar(nombre, calcular_tabla, arreglos, parametros, codificar, decodificar)
+
+
+def estimar_bootstrap(tabla, horizontes, B, semilla, cache=None):
+    """Bootstrap multinomial, leído de ``cache`` (:class:`CacheDisco`) si ya se calculó."""
+    parametros = {"horizontes": np.asarray(horizontes, dtype=float), "B": int(B), "semilla": int(semilla)}
+    return _memoizar(
+        "bootstrap_multinomial", bootstrap_multinomial, tabla, parametros,
+        codificar_bootstrap, decodificar_bootstrap, cache,
+    )
+
+
+def estimar_bootstrap_adaptativo(tabla, horizontes, tolerancia, semilla, cache=None):
+    """Bootstrap secuencial hasta ``tolerancia``, leído de ``cache`` si ya se calculó."""
+    parametros = {
+        "horizontes": np.asarray(horizontes, dtype=float), "tolerancia": float(tolerancia), "semilla": int(semilla)
+    }
+    return _memoizar(
+        "bootstrap_adaptativo", bootstrap_adaptativo, tabla, parametros,
+        codificar_bootstrap, decodificar_bootstrap, cache,
+    )
+
+
+def bootstrap_y_bandas(tabla, B=B_BOOTSTRAP, semilla=SEMILLA_BOOTSTRAP, cache=None):
+    """Réplicas en 1, 3 y 5 años y bandas puntuales y simultáneas en todos los tiempos.
+
+    Ver :func:`analisis.bootstrap.bandas_bootstrap`: las bandas de la curva
+    completa salen de estimadores de cuantiles en memoria acotada, sin
+    guardar las réplicas de cada tiempo. Leídas de ``cache`` si ya se
+    calcularon.
+    """
+    parametros = {"horizontes": HORIZONTES_DIAS.astype(float), "B": int(B), "semilla": int(semilla)}
+    return _memoizar(
+        "bandas_bootstrap", bandas_bootstrap, tabla, parametros, codificar_bandas, decodificar_bandas, cache
+    )
+
+
+def estimar_gray(tabla, tau, cache=None):
+    """Prueba de Gray en ``tau``, leída de ``cache`` si ya se calculó."""
+    parametros = {"tau": np.asarray(tau, dtype=float)}
+    return _memoizar("prueba_gray", prueba_gray, tabla, parametros, codificar_gray, decodificar_gray, cache)
+
+
+def estimar_gray_permutacion(tabla, tau, P, semilla, cache=None):
+    """Prueba de Gray por permutación, leída de ``cache`` si ya se calculó."""
+    parametros = {"tau": np.asarray(tau, dtype=float), "P": int(P), "semilla": int(semilla)}
+    return _memoizar(
+        "prueba_gray_permutacion", prueba_gray_permutacion, tabla, parametros,
+        codificar_gray, decodificar_gray, cache,
+    )
+
+
+def calcular(cohorte, B=B_BOOTSTRAP, semilla=SEMILLA_BOOTSTRAP, cache=None):
+    """CIF, bootstrap y prueba de Gray con los parámetros del tablero.
+
+    La cohorte se agrupa una sola vez en su :class:`TablaEventos`, que es
+    lo único que leen los estimadores.
+    """
+    return calcular_desde_tabla(tabla_eventos(cohorte), huella(cohorte), B, semilla, cache)
+
+
+def calcular_desde_tabla(tabla, huella_cohorte, B=B_BOOTSTRAP, semilla=SEMILLA_BOOTSTRAP, cache=None):
+    """Como :func:`calcular`, a partir de la tabla (p. ej. agregada por bloques) y la huella."""
+    bootstrap, bandas = bootstrap_y_bandas(tabla, B, semilla, cache)
+    return Artefactos(
+        huella=huella_cohorte,
+        parametros=parametros(B, semilla),
+        cif=tabla.curvas(),
+        bootstrap=bootstrap,
+        bandas=bandas,
+        gray=estimar_gray(tabla, TAU_GRAY, cache),
+    )
+
+
+def _tablas(artefactos):
+    """Tablas en formato largo de cada estimador."""
+    cif = []
+    for grupo, curva in artefactos.cif.items():
+        tabla = pd.DataFrame({
+            "grupo": grupo,
+            "tiempo": curva.tiempos,
+            "n_riesgo": curva.n_riesgo,
+            "supervivencia": curva.supervivencia,
+        })
+        for k, codigo in enumerate(curva.causas):
+            tabla[f"eventos_{codigo}"] = curva.eventos[k]
+            tabla[f"cif_{codigo}"] = curva.cif[k]
+        cif.append(tabla)
+
+    replicas = artefactos.bootstrap.replicas
+    indices = np.indices(replicas.shape).reshape(replicas.ndim, -1)
+    bootstrap = pd.DataFrame({
+        "replica": indices[0].astype(np.int32),
+        "grupo": np.asarray(artefactos.bootstrap.grupos)[indices[1]],
+        "causa": np.asarray(artefactos.bootstrap.causas, dtype=np.int8)[indices[2]],
+        "horizonte": artefactos.bootstrap.horizontes[indices[3]],
+        "cif": replicas.ravel(),
+    })
+
+    bandas = artefactos.bandas
+    indices = np.indices(bandas.estimado.shape).reshape(bandas.estimado.ndim, -1)
+    tabla_bandas = pd.DataFrame({
+        "grupo": np.asarray(bandas.grupos)[indices[0]],
+        "causa": np.asarray(bandas.causas, dtype=np.int8)[indices[1]],
+        "tiempo": bandas.tiempos[indices[2]],
+        "estimado": bandas.estimado.ravel(),
+        "inferior": bandas.inferior.ravel(),
+        "superior": bandas.superior.ravel(),
+        "inferior_simultanea": bandas.inferior_simultanea.ravel(),
+        "superior_simultanea": bandas.superior_simultanea.ravel(),
+    })
+
+    gray = pd.concat([
+        pd.DataFrame({
+            "causa": np.int8(codigo),
+            "tau": resultado.tau,
+            "estadistico": resultado.estadistico,
+            "p_valor": resultado.p_valor,
+        })
+        for codigo, resultado in artefactos.gray.items()
+    ], ignore_index=True)
+    return {"cif": pd.concat(cif, ignore_index=True), "bootstrap": bootstrap, "bandas": tabla_bandas, "gray": gray}
+
+
+def _sha256(ruta):
+    return hashlib.sha256(Path(ruta).read_bytes()).hexdigest()
+
+
+def guardar(artefactos, directorio):
+    """Guarda los artefactos en una versión nueva de ``directorio``.
+
+    Cada cálculo queda en su propio subdirectorio (fecha y huella de la
+    cohorte, con un sufijo si ya existe) y el archivo ``ACTUAL`` apunta al último, de modo que el
+    tablero nunca lee una versión a medio escribir. Devuelve la ruta.
+    """
+    directorio = Path(directorio)
+    fecha = datetime.now(timezone.utc)
+    base = f"{fecha:%Y%m%dT%H%M%SZ}-{artefactos.huella[:12]}"
+    directorio.mkdir(parents=True, exist_ok=True)
+    # Dos cálculos en el mismo segundo no comparten directorio: el segundo lleva sufijo
+    for intento in range(1000):
+        version = base if intento == 0 else f"{base}-{intento}"
+        destino = directorio / version
+        try:
+            destino.mkdir()
+            break
+        except FileExistsError:
+            continue
+    else:
+        raise FileExistsError(f"No hay nombre libre para la versión {base} en {directorio}")
+
+    archivos = {}
+    for nombre, tabla in _tablas(artefactos).items():
+        ruta = destino / f"{nombre}.parquet"
+        tabla.to_parquet(ruta, index=False)
+        archivos[ruta.name] = _sha256(ruta)
+
+    manifiesto = {
+        "formato": FORMATO,
+        "creado": fecha.isoformat(timespec="seconds"),
+        "huella": artefactos.huella,
+        "parametros": artefactos.parametros,
+        "causas": list(artefactos.bootstrap.causas),
+        "grupos": list(artefactos.bootstrap.grupos),
+        "estimado": artefactos.bootstrap.estimado.tolist(),
+        "gl": next(iter(artefactos.gray.values())).gl,
+        "archivos": archivos,
+    }
+    (destino / "manifiesto.json").write_text(json.dumps(manifiesto, indent=2, ensure_ascii=False))
+
+    # Temporal único por escritura: no choca entre hilos ni con otro proceso
+    temporal = tempfile.NamedTemporaryFile("w", dir=directorio, prefix=f"{_ACTUAL}.", suffix=".tmp", delete=False)
+    with temporal as archivo:
+        try:
+            archivo.write(version)
+        except BaseException:
+            archivo.close()
+            os.unlink(archivo.name)
+            raise
+    os.replace(archivo.name, directorio / _ACTUAL)
+    return destino
+
+
+def version_actual(directorio):
+    """Nombre de la última versión guardada en ``directorio`` (o ``None``)."""
+    try:
+        return (Path(directorio) / _ACTUAL).read_text().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def leer(directorio, version=None):
+    """Lee una versión de los artefactos (por defecto, la actual).
+
+    Cada archivo se compara con la suma sha256 del manifiesto; si alguno no
+    coincide (copia truncada o modificada) se lanza ``ValueError``.
+    """
+    version = version or version_actual(directorio)
+    if version is None:
+        raise FileNotFoundError(f"No hay artefactos en {directorio}")
+    origen = Path(directorio) / version
+    manifiesto = json.loads((origen / "manifiesto.json").read_text())
+    if manifiesto["formato"] != FORMATO:
+        raise ValueError(f"Formato de artefactos {manifiesto['formato']} no soportado (se espera {FORMATO})")
+    for nombre, suma in manifiesto["archivos"].items():
+        if _sha256(origen / nombre) != suma:
+            raise ValueError(f"La suma sha256 de {origen / nombre} no coincide con la del manifiesto")
+    causas = tuple(manifiesto["causas"])
+    grupos = tuple(manifiesto["grupos"])
+    params = manifiesto["parametros"]
+
+    cif = {}
+    tabla_cif = pd.read_parquet(origen / "cif.parquet")
+    for grupo, tabla in tabla_cif.groupby("grupo", sort=False):
+        cif[grupo.item() if hasattr(grupo, "item") else grupo] = CurvaCIF(
+            tiempos=tabla["tiempo"].to_numpy(),
+            causas=causas,
+            n_riesgo=tabla["n_riesgo"].to_numpy(),
+            eventos=np.stack([tabla[f"eventos_{k}"].to_numpy() for k in causas]),
+            supervivencia=tabla["supervivencia"].to_numpy(),
+            cif=np.stack([tabla[f"cif_{k}"].to_numpy() for k in causas]),
+        )
+
+    horizontes = np.asarray(params["horizontes"])
+    forma = (params["B"], len(grupos), len(causas), len(horizontes))
+    bootstrap = ReplicasBootstrap(
+        grupos=grupos,
+        causas=causas,
+        horizontes=horizontes,
+        estimado=np.asarray(manifiesto["estimado"]),
+        replicas=pd.read_parquet(origen / "bootstrap.parquet", columns=["cif"])["cif"].to_numpy().reshape(forma),
+    )
+
+    tabla_bandas = pd.read_parquet(origen / "bandas.parquet")
+    forma = (len(grupos), len(causas), -1)
+    bandas = BandasCIF(
+        tiempos=tabla_bandas["tiempo"].unique(),
+        grupos=grupos,
+        causas=causas,
+        estimado=tabla_bandas["estimado"].to_numpy().reshape(forma),
+        inferior=tabla_bandas["inferior"].to_numpy().reshape(forma),
+        superior=tabla_bandas["superior"].to_numpy().reshape(forma),
+        inferior_simultanea=tabla_bandas["inferior_simultanea"].to_numpy().reshape(forma),
+        superior_simultanea=tabla_bandas["superior_simultanea"].to_numpy().reshape(forma),
+    )
+
+    gray = {}
+    tabla_gray = pd.read_parquet(origen / "gray.parquet")
+    for codigo, tabla in tabla_gray.groupby("causa", sort=False):
+        gray[int(codigo)] = ResultadoGray(
+            causa=int(codigo),
+            tau=tabla["tau"].to_numpy(),
+            estadistico=tabla["estadistico"].to_numpy(),
+            gl=manifiesto["gl"],
+            p_valor=tabla["p_valor"].to_numpy(),
+        )
+    return Artefactos(
+        huella=manifiesto["huella"], parametros=params, cif=cif, bootstrap=bootstrap, bandas=bandas, gray=gray
+    )
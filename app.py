@@ -1,1028 +1,1634 @@
-import streamlit as st
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
-import numpy as np  # <-- Esta línea es la que faltaba
-from plotly.subplots import make_subplots
-
-# ---------------------------------------------------------
-# Configuración básica de la página
-# ---------------------------------------------------------
-st.set_page_config(
-    page_title="Proyecto final – Estadística no paramétrica",
-    page_icon=None,
-    layout="wide"
-)
-
-# ---------------------------------------------------------
-# Estilos CSS personalizados - Fondo negro, texto blanco, cajas grises
-# ---------------------------------------------------------
-st.markdown("""
-<style>
-    /* Fondo general negro */
-    .stApp {
-        background-color: #0f0c14;
-        color: #e5e7eb;
-        font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-    }
-    /* Títulos */
-    .stTitle {
-        color: #d1e8ff;
-        font-weight: bold;
-        text-align: center;
-        margin-bottom: 0.5rem;
-    }
-    .stSubheader {
-        color: #93c5fd;
-        font-weight: 600;
-        border-bottom: 2px solid #3b82f6;
-        padding-bottom: 0.5rem;
-        margin-top: 1.5rem;
-    }
-    /* Cajas de interpretación uniformes (gris oscuro) */
-    .interpretation-box {
-        background-color: #2d2937;
-        border-left: 4px solid #3b82f6;
-        padding: 16px;
-        border-radius: 6px;
-        margin: 10px 0;
-    }
-    .interpretation-box h4 {
-        color: #d1e8ff;
-        margin-top: 0;
-    }
-    .interpretation-box p {
-        color: #cbd5e1;
-        margin: 0;
-    }
-</style>
-""", unsafe_allow_html=True)
-
-# ---------------------------------------------------------
-# Barra Lateral – Solo información del proyecto
-# ---------------------------------------------------------
-st.sidebar.header("Información del Proyecto")
-
-st.sidebar.write("**Nombre del Proyecto:**")
-st.sidebar.write("Análisis No Paramétrico de Riesgos Competitivos en Trasplante Renal")
-
-st.sidebar.write("**Autores:**")
-st.sidebar.write("Camila Mantilla – Julián Toloza – Maritza Jiménez")
-
-st.sidebar.write("**Fecha de Entrega:**")
-st.sidebar.write("18 de noviembre de 2025")
-
-st.sidebar.write("**Artículo Base:**")
-st.sidebar.write("Pinto-Ramírez et al., PLOS ONE, 2022")
-
-st.sidebar.markdown("---")
-
-# Filtro interactivo
-evento_filtro = st.sidebar.selectbox(
-    "Seleccionar evento para visualizar:",
-    ["Todos los eventos", "Muerte", "Pérdida del injerto"],
-    index=0
-)
-
-# ---------------------------------------------------------
-# Encabezado principal
-# ---------------------------------------------------------
-st.title("Análisis No Paramétrico de Riesgos Competitivos en Trasplante Renal")
-st.subheader("Estimación de la Función de Incidencia Acumulada (CIF), prueba de Gray y bootstrap")
-
-st.markdown("---")
-
-# ---------------------------------------------------------
-# Propósito del Dashboard (sin la pregunta)
-# ---------------------------------------------------------
-st.header("Propósito del Dashboard")
-
-st.markdown(
-    """
-<div class="interpretation-box">
-  <p>Este tablero presenta un análisis no paramétrico de 1.454 receptores de trasplante renal en Colombia, explorando cómo compiten los riesgos de muerte y pérdida del injerto durante 5 años. Compara estos riesgos según el tipo de donante usando la prueba de Gray y cuantifica las diferencias con intervalos de confianza por bootstrap a 1, 3 y 5 años.</p>
-</div>
-""",
-    unsafe_allow_html=True,
-)
-
-# ---------------------------------------------------------
-# Pestañas (4)
-# ---------------------------------------------------------
-tab1, tab2, tab3, tab4 = st.tabs([
-    "Análisis Exploratorio de Datos",
-    "Fórmulas de Métodos y su Aplicación",
-    "Resultados de Métodos Aplicados",
-    "Hallazgos y Conclusiones"
-])
-
-# ---------------------------------------------------------
-# PESTAÑA 1: Análisis Exploratorio de Datos
-# ---------------------------------------------------------
-with tab1:
-    st.header("Análisis Exploratorio de Datos")
-
-    st.markdown("""
-    El análisis exploratorio caracteriza de forma general la cohorte, describiendo la distribución por sexo, tipo de donante y la frecuencia de los eventos principales (pérdida del injerto y muerte), así como la presencia de desenlaces intercurrentes relevantes. Para las variables continuas se examinan medidas descriptivas y se evalúa visualmente su distribución, lo que permite identificar sesgos, asimetrías y desviaciones de la normalidad. Estos resultados orientan la elección de métodos no paramétricos en los análisis posteriores.
-    """)
-
-    # Distribución de eventos clínicos principales
-    st.subheader("Distribución de eventos clínicos principales")
-
-    df_eventos = pd.DataFrame({
-        "Evento": ["Censurado", "Muerte", "Pérdida del injerto"],
-        "Porcentaje": [79.0, 9.4, 11.6]
-    })
-    fig_eventos = px.pie(
-        df_eventos, values='Porcentaje', names='Evento',
-        color='Evento',
-        color_discrete_map={
-            'Censurado': '#4b5563',
-            'Muerte': '#93c5fd',
-            'Pérdida del injerto': '#60a5fa'
-        },
-        hole=0.5,
-        title="Distribución de eventos clínicos principales"
-    )
-    fig_eventos.update_traces(textposition='inside', textinfo='percent+label')
-    fig_eventos.update_layout(
-        showlegend=False,
-        paper_bgcolor='#0f0c14',
-        plot_bgcolor='#0f0c14',
-        font_color='#e5e7eb'
-    )
-    st.plotly_chart(fig_eventos, use_container_width=True)
-
-    # Tabla de distribución
-    st.subheader("Tabla de distribución")
-    df_distribucion = pd.DataFrame({
-        "Variable": ["Sexo", "Sexo", "PerdidaInjerto", "PerdidaInjerto", "Muerte", "Muerte", "DonanteVivo", "DonanteVivo", "BKV", "BKV", "CMV", "CMV", "RechazoAgudo", "RechazoAgudo", "StentCoronario", "StentCoronario"],
-        "Categoría": ["Masculino", "Femenino", "No", "Sí", "No", "Sí", "Fallecido", "Vivo", "No", "Sí", "No", "Sí", "No", "Sí", "No", "Sí"],
-        "Conteo": [586, 868, 1263, 191, 1204, 250, 1002, 452, 1418, 36, 1378, 76, 981, 473, 1441, 13],
-        "Porcentaje (%)": [40.30, 59.70, 86.86, 13.14, 82.81, 17.19, 68.91, 31.09, 97.52, 2.48, 94.77, 5.23, 67.47, 32.53, 99.11, 0.89]
-    })
-    st.dataframe(
-        df_distribucion.style.format({'Porcentaje (%)': '{:.2f}%'})
-        .set_properties(**{'background-color': '#1e1b26', 'color': '#e5e7eb'}),
-        use_container_width=True
-    )
-
-    st.info("La mayoría de pacientes queda censurada al cierre; los eventos (muerte y pérdida del injerto) son minoritarios y desbalanceados. Esto respalda el uso de métodos no paramétricos con riesgos competitivos.")
-
-    # Distribución por tipo de donante
-    st.subheader("Distribución de pacientes por tipo de donante")
-
-    df_donantes = pd.DataFrame({
-        "Tipo": ["Donante Fallecido", "Donante Vivo"],
-        "Porcentaje": [68.9, 31.1]
-    })
-    fig_donantes = px.pie(
-        df_donantes, values='Porcentaje', names='Tipo',
-        color='Tipo',
-        color_discrete_map={'Donante Fallecido': '#93c5fd', 'Donante Vivo': '#60a5fa'},
-        title="Distribución de pacientes por tipo de donante"
-    )
-    fig_donantes.update_traces(textposition='inside', textinfo='percent+label')
-    fig_donantes.update_layout(
-        showlegend=False,
-        paper_bgcolor='#0f0c14',
-        plot_bgcolor='#0f0c14',
-        font_color='#e5e7eb'
-    )
-    st.plotly_chart(fig_donantes, use_container_width=True)
-
-    # Cantidad de eventos por tipo de donante
-    st.subheader("Cantidad de eventos por tipo de donante")
-
-    data_eventos_donante = {
-        'Tipo de Donante': ['Donante Fallecido', 'Donante Vivo'],
-        'Censurado': [754, 394],
-        'Muerte': [121, 16],
-        'Pérdida del Injerto': [127, 42]
-    }
-    df_eventos_donante = pd.DataFrame(data_eventos_donante)
-
-    if evento_filtro == "Muerte":
-        df_plot = df_eventos_donante[['Tipo de Donante', 'Muerte']].melt(
-            id_vars='Tipo de Donante', var_name='Evento', value_name='Cantidad'
-        )
-        color_map = {'Muerte': '#93c5fd'}
-        title = 'Cantidad de Muertes por Tipo de Donante'
-    elif evento_filtro == "Pérdida del injerto":
-        df_plot = df_eventos_donante[['Tipo de Donante', 'Pérdida del Injerto']].melt(
-            id_vars='Tipo de Donante', var_name='Evento', value_name='Cantidad'
-        )
-        color_map = {'Pérdida del Injerto': '#60a5fa'}
-        title = 'Cantidad de Pérdidas del Injerto por Tipo de Donante'
-    else:
-        df_plot = df_eventos_donante.melt(
-            id_vars='Tipo de Donante', var_name='Evento', value_name='Cantidad'
-        )
-        color_map = {
-            'Censurado': '#4b5563',
-            'Muerte': '#93c5fd',
-            'Pérdida del Injerto': '#60a5fa'
-        }
-        title = 'Cantidad de Eventos por Tipo de Donante'
-
-    fig_barras = px.bar(
-        df_plot,
-        x='Tipo de Donante',
-        y='Cantidad',
-        color='Evento',
-        color_discrete_map=color_map,
-        title=title
-    )
-    fig_barras.update_layout(
-        barmode='group',
-        xaxis_title='Tipo de Donante',
-        yaxis_title='Número de Pacientes',
-        legend_title='Evento',
-        template='plotly_dark',
-        paper_bgcolor='#0f0c14',
-        plot_bgcolor='#0f0c14',
-        font_color='#e5e7eb'
-    )
-    st.plotly_chart(fig_barras, use_container_width=True)
-
-    st.markdown("""
-    **Eventos por tipo de donante (conteos):**
-    - **Muerte:** 121 en donante fallecido vs 16 en donante vivo.
-    - **Pérdida del injerto:** 127 vs 42.
-    - **Censurado:** 754 vs 394.
-
-    *Nota: Son conteos, no tasas; no implican causalidad.*
-    """)
-
-    # Distribución de edad y sexo por tipo de evento
-    st.subheader("Distribución de edad y sexo por tipo de evento")
-
-    col1, col2 = st.columns(2)
-
-    with col1:
-        df_edad = pd.DataFrame({
-            "Tipo de Evento": ["Censurado", "Muerte", "Pérdida del injerto"],
-            "Mediana Edad": [43, 52, 44]
-        })
-        fig_edad = px.bar(
-            df_edad, x='Tipo de Evento', y='Mediana Edad',
-            color='Tipo de Evento',
-            color_discrete_map={
-                'Censurado': '#4b5563',
-                'Muerte': '#93c5fd',
-                'Pérdida del injerto': '#60a5fa'
-            },
-            title="Mediana de Edad por Tipo de Evento"
-        )
-        fig_edad.update_layout(
-            yaxis_title="Edad (años)",
-            paper_bgcolor='#0f0c14',
-            plot_bgcolor='#0f0c14',
-            font_color='#e5e7eb'
-        )
-        st.plotly_chart(fig_edad, use_container_width=True)
-        st.caption("→ Sugiere mayor riesgo de muerte en pacientes de mayor edad.")
-
-    with col2:
-        data_sexo = {
-            'Tipo de Evento': ['Censurado', 'Muerte', 'Pérdida del injerto'],
-            'Femenino': [670, 90, 108],
-            'Masculino': [478, 47, 61]
-        }
-        df_sexo = pd.DataFrame(data_sexo)
-        fig_sexo = go.Figure()
-        fig_sexo.add_trace(go.Bar(
-            name='Femenino', x=df_sexo['Tipo de Evento'], y=df_sexo['Femenino'],
-            marker_color='#cbd5e1'
-        ))
-        fig_sexo.add_trace(go.Bar(
-            name='Masculino', x=df_sexo['Tipo de Evento'], y=df_sexo['Masculino'],
-            marker_color='#93c5fd'
-        ))
-        fig_sexo.update_layout(
-            title_text='Distribución de Sexo por Tipo de Evento',
-            barmode='group',
-            xaxis_title='Tipo de Evento',
-            yaxis_title='Número de Pacientes',
-            legend_title='Sexo',
-            template='plotly_dark',
-            paper_bgcolor='#0f0c14',
-            plot_bgcolor='#0f0c14',
-            font_color='#e5e7eb'
-        )
-        st.plotly_chart(fig_sexo, use_container_width=True)
-        st.caption("Predomina el sexo femenino tanto en la cohorte como en los eventos. Esto refleja la composición muestral, no diferencias ajustadas.")
-
-    # Evaluación de la Normalidad de Variables Continuas
-    st.subheader("Evaluación de la Normalidad de Variables Continuas")
-
-    st.markdown("""
-    Para las variables continuas (edad, creatinina a 12 meses, tiempo en diálisis, tiempo de isquemia fría), se evaluó su distribución mediante Q-Q plots y la prueba de Anderson-Darling.
-    """)
-
-    df_ad = pd.DataFrame({
-        "Variable": ["Edad", "Creatinina12m", "TiempoDialisis", "CIT"],
-        "Estadístico AD": [6.2565, 156.1973, 140.3597, 70.8260],
-        "Valor Crítico (5%)": [0.7850, 0.7850, 0.7850, 0.7850],
-        "Conclusión": ["NO normal", "NO normal", "NO normal", "NO normal"]
-    })
-    st.dataframe(
-        df_ad.style.set_properties(**{'background-color': '#1e1b26', 'color': '#e5e7eb'}),
-        use_container_width=True
-    )
-
-    st.markdown("""
-    <div class="interpretation-box">
-      <p><strong>Todos los estadísticos AD superan el valor crítico 0.785 → se rechaza la normalidad en todas las variables (incluida Edad).</strong></p>
-    </div>
-    """, unsafe_allow_html=True)
-
-    st.markdown("""
-    **Interpretación de los Q-Q plots (según el PDF):**
-    - **Edad**: Se aproxima a la línea teórica solo en la parte central; en colas muestra desvíos moderados → distribución casi normal, pero con colas no normales.
-    - **Creatinina a 12 meses, Tiempo en diálisis y Tiempo de isquemia fría (CIT)**: Exhiben curvaturas marcadas y colas pesadas, alejándose claramente de la normalidad.
-    """)
-
-    st.markdown("""
-    <div class="interpretation-box">
-      <p><strong>La distribución de los datos (eventos desbalanceados, variables continuas no normales) justifica plenamente el uso de métodos no paramétricos en los análisis posteriores.</strong></p>
-    </div>
-    """, unsafe_allow_html=True)
-
-    # BKV y CMV por tipo de evento
-    st.subheader("BKV y CMV por tipo de evento")
-
-    # Datos para BKV
-    df_bkv = pd.DataFrame({
-        "Tipo de Evento": ["Censurado", "Muerte", "Pérdida del injerto"],
-        "Porcentaje": [1.7, 0.7, 8.9]
-    })
-
-    fig_bkv = px.bar(
-        df_bkv, x='Tipo de Evento', y='Porcentaje',
-        color='Tipo de Evento',
-        color_discrete_map={'Censurado': '#93c5fd', 'Muerte': '#60a5fa', 'Pérdida del injerto': '#3b82f6'},
-        title="Nefropatía por BKV por evento"
-    )
-    fig_bkv.update_layout(
-        yaxis_title="Porcentaje (%)",
-        paper_bgcolor='#0f0c14',
-        plot_bgcolor='#0f0c14',
-        font_color='#e5e7eb'
-    )
-    st.plotly_chart(fig_bkv, use_container_width=True)
-
-    # Datos para CMV
-    df_cmv = pd.DataFrame({
-        "Tipo de Evento": ["Censurado", "Muerte", "Pérdida del injerto"],
-        "Porcentaje": [3.8, 13.1, 8.3]
-    })
-
-    fig_cmv = px.bar(
-        df_cmv, x='Tipo de Evento', y='Porcentaje',
-        color='Tipo de Evento',
-        color_discrete_map={'Censurado': '#93c5fd', 'Muerte': '#60a5fa', 'Pérdida del injerto': '#3b82f6'},
-        title="Enfermedad por CMV por evento"
-    )
-    fig_cmv.update_layout(
-        yaxis_title="Porcentaje (%)",
-        paper_bgcolor='#0f0c14',
-        plot_bgcolor='#0f0c14',
-        font_color='#e5e7eb'
-    )
-    st.plotly_chart(fig_cmv, use_container_width=True)
-
-    st.markdown("""
-    **Nefropatía por BKV:**
-    - La mayor proporción aparece en Pérdida del injerto (~8.9%), es baja en Censurado (~1.7%) y mínima en Muerte (~0.7%).
-    - El BKV se asocia principalmente con deterioro del injerto más que con mortalidad.
-
-    **Enfermedad por CMV:**
-    - La proporción es más alta en Muerte (~13.1%) y también relevante en Pérdida del injerto (~8.3%), menor en Censurado (~3.8%).
-    - El CMV se relaciona con desenlaces adversos, especialmente mortalidad.
-    """)
-
-    # Gráficas complementarias (al final)
-    st.subheader("Gráficas complementarias")
-
-    # Datos para Creatinina a 12 meses (simulación realista)
-    # Usaremos valores medios y desviaciones típicas estimadas del PDF
-    # Censurado: mediana 1.28, rango intercuartilico ~1.0-1.6
-    # Muerte: mediana 1.68, rango intercuartilico ~1.3-2.0
-    # Pérdida del injerto: mediana 3.49, rango intercuartilico ~2.5-4.5
-    # Generamos datos sintéticos para el boxplot
-    np.random.seed(42)  # Para reproducibilidad
-    n_censurado = 1204
-    n_muerte = 250
-    n_perdida = 191
-
-    # Simular datos para Creatinina a 12 meses
-    creatinina_censurado = np.random.normal(loc=1.28, scale=0.3, size=n_censurado)
-    creatinina_muerte = np.random.normal(loc=1.68, scale=0.4, size=n_muerte)
-    creatinina_perdida = np.random.normal(loc=3.49, scale=0.8, size=n_perdida)
-
-    # Asegurar que los valores estén dentro de rangos razonables
-    creatinina_censurado = np.clip(creatinina_censurado, 0.5, 3.0)
-    creatinina_muerte = np.clip(creatinina_muerte, 0.5, 4.0)
-    creatinina_perdida = np.clip(creatinina_perdida, 1.0, 8.0)
-
-    df_creatinina_data = pd.DataFrame({
-        "Tipo de Evento": ["Censurado"] * n_censurado + ["Muerte"] * n_muerte + ["Pérdida del injerto"] * n_perdida,
-        "Creatinina a 12 meses": np.concatenate([creatinina_censurado, creatinina_muerte, creatinina_perdida])
-    })
-
-    fig_creatinina = px.box(
-        df_creatinina_data,
-        x='Tipo de Evento',
-        y='Creatinina a 12 meses',
-        color='Tipo de Evento',
-        color_discrete_map={'Censurado': '#93c5fd', 'Muerte': '#60a5fa', 'Pérdida del injerto': '#3b82f6'},
-        title="Distribución de creatinina a 12 meses según tipo de evento"
-    )
-    fig_creatinina.update_traces(
-        boxmean=True,  # Mostrar la media
-        marker=dict(size=4),
-        line=dict(width=2)
-    )
-    fig_creatinina.update_layout(
-        yaxis_title="Creatinina a 12 meses (mg/dL)",
-        paper_bgcolor='#0f0c14',
-        plot_bgcolor='#0f0c14',
-        font_color='#e5e7eb',
-        yaxis_range=[0, 12]  # Limitar el eje Y para que se vea como en la imagen
-    )
-    st.plotly_chart(fig_creatinina, use_container_width=True)
-
-    st.markdown("""
-    **Creatinina a 12 meses (mg/dL):**
-    - La mediana es más alta en Pérdida del injerto (~3.5 mg/dL), intermedia en Muerte (~1.7 mg/dL) y más baja en Censurado (~1.3 mg/dL).
-    - Hay dispersión y valores atípicos marcados en pérdida del injerto, consistente con mayor deterioro de función renal.
-    - Peores valores de creatinina a 12 meses se asocian con mayor riesgo de pérdida del injerto; el grupo de muerte muestra elevación moderada.
-    """)
-
-    # Datos para Tiempo en diálisis (simulación realista)
-    # Censurado: mediana 9.0, rango intercuartilico ~6-12
-    # Muerte: mediana 13.0, rango intercuartilico ~8-18
-    # Pérdida del injerto: mediana 11.0, rango intercuartilico ~6-16
-    # Generamos datos sintéticos para el boxplot
-    tiempo_censurado = np.random.normal(loc=9.0, scale=3.0, size=n_censurado)
-    tiempo_muerte = np.random.normal(loc=13.0, scale=4.0, size=n_muerte)
-    tiempo_perdida = np.random.normal(loc=11.0, scale=4.0, size=n_perdida)
-
-    # Asegurar que los valores estén dentro de rangos razonables
-    tiempo_censurado = np.clip(tiempo_censurado, 0, 200)
-    tiempo_muerte = np.clip(tiempo_muerte, 0, 200)
-    tiempo_perdida = np.clip(tiempo_perdida, 0, 200)
-
-    df_tiempo_dialisis_data = pd.DataFrame({
-        "Tipo de Evento": ["Censurado"] * n_censurado + ["Muerte"] * n_muerte + ["Pérdida del injerto"] * n_perdida,
-        "Tiempo en diálisis": np.concatenate([tiempo_censurado, tiempo_muerte, tiempo_perdida])
-    })
-
-    fig_tiempo_dialisis = px.box(
-        df_tiempo_dialisis_data,
-        x='Tipo de Evento',
-        y='Tiempo en diálisis',
-        color='Tipo de Evento',
-        color_discrete_map={'Censurado': '#93c5fd', 'Muerte': '#60a5fa', 'Pérdida del injerto': '#3b82f6'},
-        title="Distribución del tiempo en diálisis según tipo de evento"
-    )
-    fig_tiempo_dialisis.update_traces(
-        boxmean=True,  # Mostrar la media
-        marker=dict(size=4),
-        line=dict(width=2)
-    )
-    fig_tiempo_dialisis.update_layout(
-        yaxis_title="Tiempo en diálisis (meses)",
-        paper_bgcolor='#0f0c14',
-        plot_bgcolor='#0f0c14',
-        font_color='#e5e7eb',
-        yaxis_range=[0, 200]  # Limitar el eje Y para que se vea como en la imagen
-    )
-    st.plotly_chart(fig_tiempo_dialisis, use_container_width=True)
-
-    st.markdown("""
-    **Tiempo en diálisis (meses):**
-    - La mediana es mayor en Muerte (~13 meses), seguida de Pérdida del injerto (~11 meses) y Censurado (~9 meses).
-    - Se observan colas largas y outliers en los tres grupos, especialmente en Censurado y Pérdida del injerto.
-    - Mayor exposición previa a diálisis parece relacionarse con peores desenlaces (muerte y pérdida).
-    """)
-# ---------------------------------------------------------
-# PESTAÑA 2: Fórmulas de Métodos y su Aplicación
-# ---------------------------------------------------------
-with tab2:
-    st.header("Fórmulas de Métodos y su Aplicación")
-
-    st.markdown("""
-    Esta sección describe las tres herramientas no paramétricas fundamentales utilizadas en este análisis para abordar el problema de los riesgos competitivos. Para cada método, se explica su propósito, se presenta su fórmula clave en una caja gris, se detalla su aplicación en el contexto de este estudio y se establece su relación con el artículo base.
-    """)
-
-    # Sección 1: CIF
-    st.subheader("1. Estimación de la Incidencia por Causa (CIF)")
-
-    st.markdown("""
-    <div class="interpretation-box">
-      <h4>Fórmula General:</h4>
-      <p>La Función de Incidencia Acumulada (CIF) se calcula mediante la siguiente integral:</p>
-    </div>
-    """, unsafe_allow_html=True)
-
-    # Fórmula CIF con st.latex()
-    st.latex(r"F_k(t) = \int_0^t S(u^-) \lambda_k(u)  du")
-
-    st.markdown("""
-    <div class="interpretation-box">
-      <p><strong>Donde:</strong></p>
-      <ul>
-        <li><code>S(u⁻)</code>: Probabilidad de seguir sin ningún evento justo antes del tiempo <code>u</code>.</li>
-        <li><code>λ<sub>k</sub>(u)</code>: Riesgo instantáneo de la causa <code>k</code> en el tiempo <code>u</code>.</li>
-      </ul>
-    </div>
-    """, unsafe_allow_html=True)
-
-    st.markdown("""
-    **¿Qué es y para qué sirve?**
-    
-    La CIF es una herramienta estadística que nos permite estimar la probabilidad real de que un paciente experimente un evento específico (como muerte o pérdida del injerto) en un periodo de tiempo determinado, teniendo en cuenta que otros eventos pueden ocurrir primero y "competir" por ese resultado. En otras palabras, nos dice: "¿Cuántos pacientes, por cada 100, han experimentado este evento específico hasta un momento dado, considerando que algunos pudieron haber experimentado otro evento antes?"
-    """)
-
-    st.markdown("""
-    **Cómo se aplica en este estudio:**
-    
-    Se calcula la CIF para muerte (k=1) y pérdida del injerto (k=2) a 1, 3 y 5 años, separando por tipo de donante (fallecido vs vivo) usando el estimador de Aalen-Johansen.
-    """)
-
-    st.markdown("""
-    **Relación con el artículo:**
-    
-    El artículo de Pinto-Ramírez et al. utiliza la CIF para reportar la probabilidad acumulada a 5 años. Nuestro análisis complementa esto al mostrar las curvas completas y agregar intervalos de confianza por bootstrap.
-    """)
-
-    # Sección 2: Prueba de Gray
-    st.subheader("2. Comparación entre grupos: prueba de Gray")
-
-    st.markdown("""
-    <div class="interpretation-box">
-      <h4>Fórmula General:</h4>
-      <p>El estadístico de la prueba de Gray se define como:</p>
-    </div>
-    """, unsafe_allow_html=True)
-
-    # Fórmula Gray con st.latex()
-    st.latex(r"T_k = \frac{\left[ \sum_{u \leq \tau} w(u) \left( d\hat{F}_{k,DD}(u) - d\hat{F}_{k,LD}(u) \right) \right]^2}{\text{Var}\left[ \sum_{u \leq \tau} w(u) \left( d\hat{F}_{k,DD}(u) - d\hat{F}_{k,LD}(u) \right) \right]} \sim \chi^2_{(1)}")
-
-    st.markdown("""
-    <div class="interpretation-box">
-      <p><strong>Donde:</strong></p>
-      <ul>
-        <li><code>dF̂<sub>k,g</sub>(u)</code>: Incremento de la CIF estimada para la causa <code>k</code> en el grupo <code>g</code> en el tiempo <code>u</code>.</li>
-        <li><code>w(u)</code>: Peso basado en la supervivencia global estimada justo antes de <code>u</code>.</li>
-        <li><code>Var</code>: Varianza estimada (estilo Greenwood).</li>
-      </ul>
-      <p>El estadístico <code>T<sub>k</sub></code> sigue aproximadamente una distribución chi-cuadrado con 1 grado de libertad.</p>
-    </div>
-    """, unsafe_allow_html=True)
-
-    st.markdown("""
-    **¿Qué es y para qué sirve?**
-    
-    La prueba de Gray es un test estadístico diseñado para comparar curvas de CIF entre grupos cuando existen riesgos competitivos, evitando el sesgo del test log-rank.
-    """)
-
-    st.markdown("""
-    **Cómo se aplica en este estudio:**
-    
-    Se aplica para comparar donante fallecido (DD) vs donante vivo (LD) para cada causa a 1, 3 y 5 años.
-    """)
-
-    st.markdown("""
-    **Relación con el artículo:**
-    
-    El artículo original utiliza la prueba de Gray como comparación no ajustada antes del modelo de Fine-Gray.
-    """)
-
-    # Sección 3: Bootstrap
-    st.subheader("3. Incertidumbre y diferencias absolutas: análisis bootstrap")
-
-    st.markdown("""
-    <div class="interpretation-box">
-      <h4>Fórmula General (IC por percentiles):</h4>
-      <p>Si <code>θ</code> es el parámetro de interés (por ejemplo, la CIF o la diferencia de CIF) y <code>θ̂</code> es su estimador en la muestra original, el intervalo de confianza del 95% por percentiles se calcula como:</p>
-    </div>
-    """, unsafe_allow_html=True)
-
-    # Fórmula Bootstrap con st.latex()
-    st.latex(r"\text{IC}_{95\%} = \left[ Q_{2.5\%}(\hat{\theta}^*), Q_{97.5\%}(\hat{\theta}^*) \right]")
-
-    st.markdown("""
-    <div class="interpretation-box">
-      <p><strong>Donde:</strong></p>
-      <ul>
-        <li><code>θ̂*</code>: Los B estimadores obtenidos de las B réplicas bootstrap.</li>
-        <li><code>Q<sub>p</sub>(θ̂*)</code>: El percentil p de las B réplicas bootstrap.</li>
-      </ul>
-      <p>Si el intervalo de confianza de la diferencia absoluta no incluye 0, concluimos que hay una diferencia significativa entre los grupos.</p>
-    </div>
-    """, unsafe_allow_html=True)
-
-    st.markdown("""
-    **¿Qué es y para qué sirve?**
-    
-    El bootstrap es un método no paramétrico que nos permite estimar la incertidumbre de cualquier estadístico (como la CIF o la diferencia entre dos CIF) cuando no conocemos su distribución muestral o esta no es normal. En nuestro caso, lo usamos para obtener intervalos de confianza del 95% para la CIF y para la diferencia absoluta entre los grupos (DD vs LD), lo que nos permite expresar los resultados con una medida de certeza.
-    """)
-
-    st.markdown("""
-    **Cómo se aplica en este estudio:**
-    
-    Se generan 1000 réplicas, se recalculan las CIF y las diferencias, y se obtienen los IC del 95% para cada horizonte (1, 3, 5 años).
-    """)
-
-    st.markdown("""
-    **Relación con el artículo:**
-    
-    El artículo original no reporta intervalos de confianza para las CIF ni para las diferencias absolutas. Nuestro análisis complementa esto al agregar estos intervalos.
-    """)
-
-# ---------------------------------------------------------
-# PESTAÑA 3: Resultados de Métodos Aplicados
-# ---------------------------------------------------------
-with tab3:
-    st.header("Resultados de Métodos Aplicados")
-
-    # ---------------------------------------------------------
-    # Filtro interactivo por tipo de donante (en la barra lateral)
-    # ---------------------------------------------------------
-    st.sidebar.subheader("Filtro de Gráficos")
-    grupo_filtro = st.sidebar.selectbox(
-        "Mostrar curvas y barras de:",
-        ["Ambos grupos", "Solo Donante Fallecido", "Solo Donante Vivo"],
-        index=0
-    )
-
-    # ---------------------------------------------------------
-    # Sección: Estimación de la CIF
-    # ---------------------------------------------------------
-    st.subheader("Estimación de la Incidencia por Causa (CIF)")
-
-    st.markdown("""
-    Esta sección presenta las curvas de Función de Incidencia Acumulada (CIF) para muerte y pérdida del injerto, separadas por tipo de donante (Donante Fallecido vs Donante Vivo). Las curvas muestran cómo evoluciona el riesgo acumulado a lo largo del tiempo.
-    """)
-
-    # Datos de CIF del PDF
-    years = [0, 1, 3, 5]  # Añadimos 0 para empezar desde el origen
-    cif_muerte_dd = [0, 5.8, 12.9, 17.2]
-    cif_muerte_ld = [0, 1.4, 4.3, 5.5]
-    cif_graft_dd = [0, 9.0, 12.5, 16.4]
-    cif_graft_ld = [0, 5.1, 9.2, 15.1]
-
-    # Crear la figura con subplots
-    fig_cif_complete = make_subplots(
-        rows=1, cols=2,
-        subplot_titles=("Muerte", "Pérdida del Injerto"),
-        x_title="Tiempo (años)",
-        y_title="% Incidencia Acumulada"
-    )
-
-    # Determinar qué grupos mostrar según el filtro
-    if grupo_filtro == "Ambos grupos":
-        show_dd = True
-        show_ld = True
-    elif grupo_filtro == "Solo Donante Fallecido":
-        show_dd = True
-        show_ld = False
-    else:  # Solo Donante Vivo
-        show_dd = False
-        show_ld = True
-
-    # Curva de Muerte
-    if show_dd:
-        fig_cif_complete.add_trace(
-            go.Scatter(x=years, y=cif_muerte_dd, mode='lines+markers', name='Donante Fallecido', line=dict(color='#93c5fd', width=3), marker=dict(size=8)),
-            row=1, col=1
-        )
-    if show_ld:
-        fig_cif_complete.add_trace(
-            go.Scatter(x=years, y=cif_muerte_ld, mode='lines+markers', name='Donante Vivo', line=dict(color='#60a5fa', width=3), marker=dict(size=8)),
-            row=1, col=1
-        )
-
-    # Curva de Pérdida del Injerto
-    if show_dd:
-        fig_cif_complete.add_trace(
-            go.Scatter(x=years, y=cif_graft_dd, mode='lines+markers', name='Donante Fallecido', line=dict(color='#93c5fd', width=3), marker=dict(size=8)),
-            row=1, col=2
-        )
-    if show_ld:
-        fig_cif_complete.add_trace(
-            go.Scatter(x=years, y=cif_graft_ld, mode='lines+markers', name='Donante Vivo', line=dict(color='#60a5fa', width=3), marker=dict(size=8)),
-            row=1, col=2
-        )
-
-    fig_cif_complete.update_layout(
-        title_text="Incidencia acumulada (CIF) por causa y tipo de donante",
-        template='plotly_dark',
-        paper_bgcolor='#0f0c14',
-        plot_bgcolor='#0f0c14',
-        font_color='#e5e7eb',
-        showlegend=False
-    )
-
-    # Añadir anotaciones en los puntos finales (5 años)
-    if show_dd:
-        fig_cif_complete.add_annotation(
-            x=5, y=17.2, text="17.2%", showarrow=True, arrowhead=1, ax=0, ay=-30, font=dict(color='#93c5fd'),
-            row=1, col=1
-        )
-        fig_cif_complete.add_annotation(
-            x=5, y=16.4, text="16.4%", showarrow=True, arrowhead=1, ax=0, ay=-30, font=dict(color='#93c5fd'),
-            row=1, col=2
-        )
-    if show_ld:
-        fig_cif_complete.add_annotation(
-            x=5, y=5.5, text="5.5%", showarrow=True, arrowhead=1, ax=0, ay=30, font=dict(color='#60a5fa'),
-            row=1, col=1
-        )
-        fig_cif_complete.add_annotation(
-            x=5, y=15.1, text="15.1%", showarrow=True, arrowhead=1, ax=0, ay=30, font=dict(color='#60a5fa'),
-            row=1, col=2
-        )
-
-    # Añadir anotaciones en todos los puntos (0, 1, 3 años) sin duplicados
-    for i in range(len(years)):
-        if show_dd:
-            # Anotación para Donante Fallecido
-            fig_cif_complete.add_annotation(
-                x=years[i], y=cif_muerte_dd[i], text=f"{cif_muerte_dd[i]}%", showarrow=True, arrowhead=1, ax=0, ay=-10, font=dict(color='#93c5fd'),
-                row=1, col=1
-            )
-            fig_cif_complete.add_annotation(
-                x=years[i], y=cif_graft_dd[i], text=f"{cif_graft_dd[i]}%", showarrow=True, arrowhead=1, ax=0, ay=-10, font=dict(color='#93c5fd'),
-                row=1, col=2
-            )
-        if show_ld:
-            # Anotación para Donante Vivo
-            fig_cif_complete.add_annotation(
-                x=years[i], y=cif_muerte_ld[i], text=f"{cif_muerte_ld[i]}%", showarrow=True, arrowhead=1, ax=0, ay=10, font=dict(color='#60a5fa'),
-                row=1, col=1
-            )
-            fig_cif_complete.add_annotation(
-                x=years[i], y=cif_graft_ld[i], text=f"{cif_graft_ld[i]}%", showarrow=True, arrowhead=1, ax=0, ay=10, font=dict(color='#60a5fa'),
-                row=1, col=2
-            )
-
-    st.plotly_chart(fig_cif_complete, use_container_width=True)
-
-    # ---------------------------------------------------------
-    # Interpretación de las curvas CIF (en bullet points)
-    # ---------------------------------------------------------
-    st.markdown("""
-    **Patrón general:** En ambos desenlaces, los receptores de donante fallecido (DD) acumulan mayor riesgo que los de donante vivo (DV) a lo largo del seguimiento.
-    - **Muerte (causa 1):**
-        - DD ≈ 5.8%, 12.9%, 17.2% a 1, 3 y 5 años.
-        - DV ≈ 1.4%, 4.3%, 5.5% en los mismos puntos.
-        - **Conclusión:** Brecha persistente DD > DV; la diferencia se agranda con el tiempo.
-    - **Pérdida del injerto (causa 2):**
-        - DD ≈ 9.0%, 12.5%, 16.4% a 1, 3 y 5 años.
-        - DV ≈ 5.1%, 9.2%, 15.1%.
-        - **Conclusión:** DV parte mejor al inicio, pero las curvas se acercan hacia 5 años.
-
-    **Notas clínicas:** El tipo de donante importa. El trasplante con donante vivo muestra menor mortalidad y menor pérdida temprana; hacia 5 años la diferencia en pérdida del injerto se reduce, mientras que en mortalidad la ventaja de DV se mantiene.
-    """)
-
-    # ---------------------------------------------------------
-    # Gráficas de barras (6 gráficos)
-    # ---------------------------------------------------------
-    st.subheader("CIF a 1, 3 y 5 años (con intervalos de confianza)")
-
-    # Datos para los gráficos de barras
-    data = {
-        'Grupo': ['DD', 'LD'] * 6,
-        'Causa': ['Muerte'] * 2 + ['Pérdida'] * 2 + ['Muerte'] * 2 + ['Pérdida'] * 2 + ['Muerte'] * 2 + ['Pérdida'] * 2,
-        'Horizonte': ['1 año'] * 4 + ['3 años'] * 4 + ['5 años'] * 4,
-        'CIF': [5.8, 1.4, 9.0, 5.1, 12.9, 4.3, 12.5, 9.2, 17.2, 5.5, 16.4, 15.1],
-        'IC_Lower': [4.5, 0.5, 7.2, 3.1, 10.5, 2.2, 10.4, 6.0, 14.5, 2.9, 13.6, 10.8],
-        'IC_Upper': [7.4, 2.7, 10.9, 7.3, 15.5, 6.7, 14.9, 12.4, 20.2, 8.8, 19.3, 19.9]
-    }
-    df = pd.DataFrame(data)
-
-    # Función para crear gráfico de barras
-    def create_bar_chart(causa, horizonte, title):
-        filtered_df = df[(df['Causa'] == causa) & (df['Horizonte'] == horizonte)]
-        # Filtrar según el grupo seleccionado
-        if grupo_filtro == "Solo Donante Fallecido":
-            filtered_df = filtered_df[filtered_df['Grupo'] == 'DD']
-        elif grupo_filtro == "Solo Donante Vivo":
-            filtered_df = filtered_df[filtered_df['Grupo'] == 'LD']
-        # Si es "Ambos grupos", no filtramos
-        fig = px.bar(
-            filtered_df, x='Grupo', y='CIF', color='Grupo',
-            color_discrete_map={'DD': '#93c5fd', 'LD': '#60a5fa'},
-            title=title, text='CIF'
-        )
-        fig.update_traces(
-            error_y=dict(
-                type='data',
-                array=filtered_df['IC_Upper'] - filtered_df['CIF'],
-                arrayminus=filtered_df['CIF'] - filtered_df['IC_Lower']
-            ),
-            texttemplate='%{text}%', textposition='outside'
-        )
-        fig.update_layout(
-            yaxis_title="% (Incidencia acumulada)",
-            template='plotly_dark',
-            paper_bgcolor='#0f0c14',
-            plot_bgcolor='#0f0c14',
-            font_color='#e5e7eb',
-            showlegend=False
-        )
-        return fig
-
-    # Crear y mostrar los 6 gráficos
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        st.plotly_chart(create_bar_chart('Muerte', '1 año', 'Muerte — CIF a 1 año'), use_container_width=True)
-        st.plotly_chart(create_bar_chart('Muerte', '3 años', 'Muerte — CIF a 3 años'), use_container_width=True)
-        st.plotly_chart(create_bar_chart('Muerte', '5 años', 'Muerte — CIF a 5 años'), use_container_width=True)
-    
-    with col2:
-        st.plotly_chart(create_bar_chart('Pérdida', '1 año', 'Pérdida — CIF a 1 año'), use_container_width=True)
-        st.plotly_chart(create_bar_chart('Pérdida', '3 años', 'Pérdida — CIF a 3 años'), use_container_width=True)
-        st.plotly_chart(create_bar_chart('Pérdida', '5 años', 'Pérdida — CIF a 5 años'), use_container_width=True)
-
-    # Tabla de CIF (solo para referencia, no es el foco)
-    st.markdown("""
-    **CIF por año (DD vs. LD)**
-    - **Muerte (causa 1).**
-        - A 1 año: DD ≈ 5.8% vs LD ≈ 1.4% → mayor riesgo en DD.
-        - A 3 años: DD ≈ 12.9% vs LD ≈ 4.3% → la brecha aumenta.
-        - A 5 años: DD ≈ 17.2% vs LD ≈ 5.5% → DD mantiene riesgo claramente superior.
-        - El tipo de donante se asocia fuertemente con la mortalidad acumulada; el exceso de riesgo en DD se amplía en el tiempo.
-    - **Pérdida del injerto (causa 2).**
-        - A 1 año: DD ≈ 9.0% vs LD ≈ 5.1% → DD mayor.
-        - A 3 años: DD ≈ 12.5% vs LD ≈ 9.2% → la diferencia persiste pero se acorta.
-        - A 5 años: DD ≈ 16.4% vs LD ≈ 15.1% → valores muy cercanos; los IC parecen solaparse.
-        - La ventaja inicial de LD frente a pérdida del injerto se reduce con el tiempo; a 5 años ambos grupos son similares.
-    """)
-
-    # ---------------------------------------------------------
-    # Sección: Prueba de Gray
-    # ---------------------------------------------------------
-    st.subheader("Comparación entre grupos: prueba de Gray")
-
-    st.markdown("""
-    **Qué responde.** Determina si las curvas de incidencia acumulada (CIF) de dos o más grupos son distintas para una causa específica considerando los riesgos competitivos.
-    """)
-
-    # Tabla de la prueba de Gray
-    gray_df = pd.DataFrame({
-        "Año (t)": [1, 3, 5],
-        "chi² Muerte": [12.76, 19.80, 23.65],
-        "p-valor Muerte": ["<0.001", "<0.001", "<0.001"],
-        "Decisión (Muerte)": ["Rechaza H0", "Rechaza H0", "Rechaza H0"],
-        "chi² Pérdida": [5.79, 4.15, 2.38],
-        "p-valor Pérdida": ["0.016", "0.042", "0.123"],
-        "Decisión (Pérdida)": ["Rechaza H0", "Rechaza H0", "No rechaza H0"]
-    })
-
-    st.dataframe(gray_df.style.set_properties(**{'background-color': '#1e1b26', 'color': '#e5e7eb'}), use_container_width=True)
-
-    st.markdown("""
-    **Interpretación:**
-    - **Muerte**
-        - A 1, 3 y 5 años: p < 0.001 en todos.
-        - Hay diferencia clara y sostenida entre DD y LD en la incidencia de muerte (se rechaza H0 siempre). En línea con el artículo: el tipo de donante es un factor clave de mortalidad (junto con edad, diabetes, CMV, isquemia fría, etc.).
-    - **Pérdida del injerto**
-        - 1 año: p = 0.016 → hay diferencia (rechaza H0).
-        - 3 años: p = 0.042 → sigue habiendo diferencia (rechaza H0).
-        - 5 años: p = 0.123 → ya no hay evidencia de diferencia (no se rechaza H0).
-        - La brecha DD vs LD en pérdida del injerto es temprana y se diluye hacia el año 5. Esto encaja con el artículo: los drivers de pérdida (BKV, rechazo agudo, creatinina 12 m, isquemia fría, rehospitalizaciones) actúan sobre todo al inicio; con el tiempo, la competencia con muerte y el manejo clínico reducen esa diferencia.
-    """)
-
-    # ---------------------------------------------------------
-    # Sección: Análisis Bootstrap
-    # ---------------------------------------------------------
-    st.subheader("Incertidumbre y diferencias absolutas: análisis bootstrap")
-
-    st.markdown("""
-    **¿Qué es y qué responde?** El bootstrap es un método no paramétrico para medir la incertidumbre de un estimador. En nuestro estudio, responde a dos preguntas prácticas:
-    1. ¿Cuál es la variabilidad de la CIF en cada grupo de donante (DD vs LD) a 1, 3 y 5 años?
-    2. ¿La diferencia absoluta de CIF entre DD y LD (ΔCIF = CIF_DD − CIF_LD) es distinta de 0?
-    """)
-
-    # Tabla de Bootstrap para Muerte
-    st.markdown("Bootstrap de CIF — Muerte (causa 1). DD vs LD")
-    bootstrap_muerte_df = pd.DataFrame({
-        "Horizonte (años)": [1, 3, 5],
-        "CIF % Donante fallecido (IC 95%)": ["5.8 (4.5-7.4)", "12.9 (10.5-15.5)", "17.2 (14.5-20.2)"],
-        "CIF % Donante vivo (IC 95%)": ["1.4 (0.5-2.7)", "4.3 (2.2-6.7)", "5.5 (2.9-8.8)"],
-        "Delta CIF DD-LD, puntos % (IC 95%)": ["4.4 (2.6-6.3)", "8.6 (5.4-11.9)", "11.7 (7.5-15.9)"],
-        "Conclusión": ["Delta>0 (DD > LD, significativo)", "Delta>0 (DD > LD, significativo)", "Delta>0 (DD > LD, significativo)"]
-    })
-    st.dataframe(bootstrap_muerte_df.style.set_properties(**{'background-color': '#1e1b26', 'color': '#e5e7eb'}), use_container_width=True)
-
-    # Tabla de Bootstrap para Pérdida
-    st.markdown("Bootstrap de CIF — Pérdida del injerto (causa 2). DD vs LD")
-    bootstrap_perdida_df = pd.DataFrame({
-        "Horizonte (años)": [1, 3, 5],
-        "CIF % Donante fallecido (IC 95%)": ["9.0 (7.2-10.9)", "12.5 (10.4-14.9)", "16.4 (13.6-19.3)"],
-        "CIF % Donante vivo (IC 95%)": ["5.1 (3.1-7.3)", "9.2 (6.0-12.4)", "15.1 (10.8-19.9)"],
-        "Delta CIF DD-LD, puntos % (IC 95%)": ["3.8 (0.9-6.7)", "3.3 (-0.5-7.3)", "1.3 (-4.2-6.6)"],
-        "Conclusión": ["Delta>0 (DD > LD, significativo)", "Incluye 0 (no concluyente)", "Incluye 0 (no concluyente)"]
-    })
-    st.dataframe(bootstrap_perdida_df.style.set_properties(**{'background-color': '#1e1b26', 'color': '#e5e7eb'}), use_container_width=True)
-
-    st.markdown("""
-    **Definiciones:**
-    - **CIF:** Porcentaje de pacientes que ya presentaron el evento antes o en el horizonte (1, 3 o 5 años).
-    - **Delta CIF (pp):** Diferencia en puntos porcentuales entre Donante Fallecido (DD) y Donante Vivo (LD).
-    - **IC 95% que no incluye 0:** Diferencia concluyente.
-    - **IC 95% que sí incluye 0:** No concluyente (no podemos asegurar diferencia).
-    """)
-
-    # ---------------------------------------------------------
-    # Sección: Resultados Clave
-    # ---------------------------------------------------------
-    st.subheader("Resultados clave")
-
-    st.markdown("""
-    - **Muerte (causa 1)**
-        - 1 año: ΔCIF 4.4 pp (IC 2.6–6.3) → concluyente (DD > LD).
-        - 3 años: ΔCIF 8.6 pp (IC 5.4–11.9) → concluyente (DD > LD).
-        - 5 años: ΔCIF 11.7 pp (IC 7.5–15.9) → concluyente (DD > LD).
-        - La mortalidad acumulada es mayor en DD y la brecha crece con el tiempo.
-    - **Pérdida del injerto (causa 2)**
-        - 1 año: ΔCIF 3.8 pp (IC 0.9–6.7) → concluyente (DD > LD).
-        - 3 años: ΔCIF 3.3 pp (IC −0.5–7.3) → no concluyente.
-        - 5 años: ΔCIF 1.3 pp (IC −4.2–6.6) → no concluyente.
-        - La ventaja temprana de LD se diluye hacia 3–5 años.
-    """)
-    # ---------------------------------------------------------
-# PESTAÑA 4: Hallazgos y Conclusiones
-# ---------------------------------------------------------
-with tab4:
-    st.header("Hallazgos y Conclusiones")
-
-    # ---------------------------------------------------------
-    # Sección: Discusión
-    # ---------------------------------------------------------
-    st.subheader("Discusión")
-
-    st.markdown("""
-    <div class="interpretation-box">
-      <p>Este análisis no paramétrico complementa el estudio original al centrarse en la comunicación clínica y metodológica de los riesgos competitivos.</p>
-      <ul>
-        <li><strong>CIF vs. Kaplan-Meier:</strong> La CIF es superior porque estima el riesgo absoluto real de cada evento (muerte o pérdida del injerto), reconociendo que uno puede impedir al otro. Si se hubiera usado Kaplan-Meier, la suma de los riesgos estimados para muerte y pérdida habría superado el 100%, lo cual es imposible y engañoso.</li>
-        <li><strong>Prueba de Gray vs. Log-rank:</strong> La prueba de Gray es el estándar para comparar grupos en este contexto. A diferencia del log-rank, que trata la muerte como censura, Gray compara directamente las curvas de CIF, evitando sesgos. Nuestros resultados confirman que la diferencia entre donantes vivos y fallecidos es significativa para la mortalidad (p<0.001) pero se diluye para la pérdida del injerto a 5 años (p=0.123).</li>
-        <li><strong>Bootstrap e Intervalos de Confianza:</strong> El bootstrap nos permite reportar diferencias absolutas de riesgo con su incertidumbre. Por ejemplo, a 5 años, los receptores de donante fallecido tienen un 11.7% más de riesgo de muerte (IC 95%: 7.5-15.9 pp) que los de donante vivo. Esta forma de comunicar “cuánto más” es mucho más útil clínicamente que un simple p-valor o una razón de riesgo.</li>
-        <li><strong>Nuestro enfoque añade valor al:</strong>
-          <ul>
-            <li>Justificar explícitamente por qué se usan métodos no paramétricos (CIF, Gray, bootstrap) en lugar de otros.</li>
-            <li>Reportar riesgo absoluto y diferencias absolutas con intervalos de confianza, lo que facilita la interpretación clínica.</li>
-            <li>Evitar supuestos de normalidad para variables continuas (como la edad o la creatinina), que en este caso no se cumplen.</li>
-          </ul>
-        </li>
-      </ul>
-    </div>
-    """, unsafe_allow_html=True)
-
-    # ---------------------------------------------------------
-    # Sección: Limitaciones
-    # ---------------------------------------------------------
-    st.subheader("Limitaciones")
-
-    st.markdown("""
-    <div class="interpretation-box">
-      <ul>
-        <li><strong>No ajustamos por otros factores clínicos:</strong> Nuestro análisis (CIF, prueba de Gray) se centra solo en el tipo de donante (fallecido vs. vivo). No considera otras variables importantes como la edad del receptor, la diabetes o las infecciones virales (CMV/BKV), que sí pueden afectar los resultados. El artículo original sí ajustó por estas variables usando un modelo más complejo (Fine-Gray).</li>
-        <li><strong>Prueba de Gray aplicada año por año:</strong> Para ver cómo evoluciona la diferencia entre grupos, realizamos la prueba de Gray separadamente a 1, 3 y 5 años. Esto es útil para mostrar el cambio en el tiempo, pero no es el método estándar, ya que puede reducir la capacidad de detectar una diferencia real (potencia estadística).</li>
-        <li><strong>Precisión del bootstrap:</strong> Los intervalos de confianza obtenidos con el bootstrap dependen del tamaño de la muestra y del desbalance entre grupos (hay muchos más receptores de donante fallecido que de donante vivo). Aunque es un método robusto, nuestros resultados podrían tener cierta variabilidad debido a esta estructura de la muestra.</li>
-      </ul>
-    </div>
-    """, unsafe_allow_html=True)
-
-    # ---------------------------------------------------------
-    # Sección: Conclusiones
-    # ---------------------------------------------------------
-    st.subheader("Conclusiones")
-
-    st.markdown("""
-    <div class="interpretation-box">
-      <p>Este análisis muestra que el tipo de donante tiene un impacto claro en la supervivencia del receptor, pero no tanto en la pérdida del injerto a largo plazo.</p>
-      <h4>Sobre la muerte del paciente:</h4>
-      <ul>
-        <li>Los receptores de un donante fallecido tienen un riesgo mayor de morir en comparación con los de un donante vivo, y esta diferencia aumenta con el tiempo (de 4.4% al año 1 a 11.7% al año 5). Estos resultados son estadísticamente sólidos y coinciden con lo encontrado en el artículo original.</li>
-      </ul>
-      <h4>Sobre la pérdida del injerto:</h4>
-      <ul>
-        <li>Al principio (primer año), también hay una ventaja para quienes reciben un injerto de donante vivo. Sin embargo, a los 3 y 5 años, esa diferencia ya no es clara ni concluyente. Esto puede deberse a que muchos pacientes con donante fallecido mueren antes de perder el injerto (riesgo competitivo) o a que el seguimiento médico reduce las diferencias iniciales.</li>
-      </ul>
-      <h4>¿Qué nos dicen los métodos juntos?</h4>
-      <ul>
-        <li>La CIF nos dice “cuántos pacientes” tienen cada desenlace.</li>
-        <li>La prueba de Gray confirma que las curvas de riesgo están separadas, especialmente para la mortalidad.</li>
-        <li>El bootstrap nos permite decir “cuán grande” es la diferencia y con qué certeza (por ejemplo: “11.7 puntos porcentuales más, con un margen entre 7.5 y 15.9”).</li>
-      </ul>
-      <p><strong>En resumen, este enfoque no paramétrico ofrece una forma más clara y realista de interpretar los resultados en estudios donde eventos como la muerte y la pérdida del injerto compiten entre sí.</strong></p>
-    </div>
-    """, unsafe_allow_html=True)
\ No newline at end of file
+import os
+import tempfile
+import time
+
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+import numpy as np  # <-- Esta línea es la que faltaba
+from plotly.subplots import make_subplots
+
+from analisis import lote
+from analisis.agregados import Agregados, agregar_archivo
+from analisis.bootstrap import aceleracion_jackknife, tabla_bootstrap
+from analisis.cache import CacheDisco
+from analisis.cohorte import CAUSAS, DIAS_POR_ANIO, HORIZONTES_ANIOS, generar_cohorte, huella, leer_cohorte
+from analisis.descriptivo import (
+    estratos, mediana_por_evento, proporcion_por_evento, resumen_caja, tabla_distribucion
+)
+from analisis.finegray import ajustar_fine_gray, tabla_fine_gray
+from analisis.gray import barrido_gray, tabla_barrido, tabla_gray
+from analisis.instrumentacion import Medidor
+from analisis.normalidad import normalidad, tabla_normalidad
+
+inicio_ejecucion = time.perf_counter()
+
+# Tiempos por sección, estimador y figura; desactivado salvo que se pida con
+# TABLERO_INSTRUMENTACION=1 o TABLERO_METRICAS=<ruta .jsonl o .prom>
+medidor = Medidor.desde_entorno()
+
+# Parámetros del bootstrap (los mismos que usa el cálculo por lotes)
+B_BOOTSTRAP = lote.B_BOOTSTRAP
+SEMILLA_BOOTSTRAP = lote.SEMILLA_BOOTSTRAP
+
+# Cohorte a nivel de paciente en Parquet o Arrow IPC; sin archivo se usa la sintética
+RUTA_COHORTE = os.environ.get("COHORTE_RUTA")
+# Con un número de filas, el archivo se lee por bloques y solo se guardan sus
+# agregados (registros que no caben en memoria); se omiten las partes que
+# necesitan los datos de cada paciente
+FILAS_BLOQUE = int(os.environ.get("TABLERO_BLOQUE_FILAS", 0)) if RUTA_COHORTE else 0
+AVISO_BLOQUES = "Esta parte necesita los datos de cada paciente y se omite al leer la cohorte por bloques."
+# Artefactos de "python -m analisis calcular"; sin ellos se calcula en el tablero
+RUTA_RESULTADOS = os.environ.get("TABLERO_RESULTADOS")
+
+# ---------------------------------------------------------
+# Configuración básica de la página
+# ---------------------------------------------------------
+st.set_page_config(
+    page_title="Proyecto final – Estadística no paramétrica",
+    page_icon=None,
+    layout="wide"
+)
+
+# ---------------------------------------------------------
+# Estilos CSS personalizados - Fondo negro, texto blanco, cajas grises
+# ---------------------------------------------------------
+st.markdown("""
+<style>
+    /* Fondo general negro */
+    .stApp {
+        background-color: #0f0c14;
+        color: #e5e7eb;
+        font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+    }
+    /* Títulos */
+    .stTitle {
+        color: #d1e8ff;
+        font-weight: bold;
+        text-align: center;
+        margin-bottom: 0.5rem;
+    }
+    .stSubheader {
+        color: #93c5fd;
+        font-weight: 600;
+        border-bottom: 2px solid #3b82f6;
+        padding-bottom: 0.5rem;
+        margin-top: 1.5rem;
+    }
+    /* Cajas de interpretación uniformes (gris oscuro) */
+    .interpretation-box {
+        background-color: #2d2937;
+        border-left: 4px solid #3b82f6;
+        padding: 16px;
+        border-radius: 6px;
+        margin: 10px 0;
+    }
+    .interpretation-box h4 {
+        color: #d1e8ff;
+        margin-top: 0;
+    }
+    .interpretation-box p {
+        color: #cbd5e1;
+        margin: 0;
+    }
+    /* Selector de secciones con apariencia de pestañas */
+    .st-key-seccion div[role="radiogroup"] {
+        gap: 1.5rem;
+        border-bottom: 1px solid #2d2937;
+    }
+    .st-key-seccion label > div:first-child {
+        display: none;
+    }
+    .st-key-seccion label {
+        padding: 0.5rem 0;
+        margin-right: 0;
+        border-bottom: 2px solid transparent;
+    }
+    .st-key-seccion label:has(input:checked) {
+        border-bottom-color: #3b82f6;
+        color: #93c5fd;
+    }
+</style>
+""", unsafe_allow_html=True)
+
+# ---------------------------------------------------------
+# Capa de caché: datos, estimadores y figuras
+# ---------------------------------------------------------
+# Los datos se cachean con st.cache_data (cada sesión recibe su copia). Los
+# resultados de los estimadores y las figuras, que nunca se modifican después
+# de construirse, se comparten con st.cache_resource: deserializar una figura
+# de Plotly en cada ejecución cuesta casi tanto como construirla.
+# Las claves son explícitas: huella de la cohorte, valor del filtro y
+# parámetros del estimador; los argumentos con "_" no entran en la clave.
+# Todas las entradas expiran (TTL) y su número está acotado.
+CACHE_TTL = 3600  # segundos
+CACHE_MAX_DATOS = 4
+CACHE_MAX_FIGURAS = 64
+
+# Caché en disco de bootstrap y Gray, compartida entre procesos y reinicios
+CACHE_DISCO = CacheDisco(
+    os.environ.get("TABLERO_CACHE", os.path.join(tempfile.gettempdir(), "tablero-cif")),
+    limite_mb=float(os.environ.get("TABLERO_CACHE_MB", 512))
+)
+
+cache_figuras = st.cache_resource(ttl=CACHE_TTL, max_entries=CACHE_MAX_FIGURAS, show_spinner=False)
+
+
+def figura_cacheada(funcion):
+    """Figura cacheada y medida (la medición incluye la búsqueda en caché)."""
+    return medidor.medido(f"figura: {funcion.__name__}")(cache_figuras(funcion))
+
+
+def mostrar_figura(fig, **kwargs):
+    """st.plotly_chart medido aparte de la construcción (serialización y envío)."""
+    if not medidor.activo:
+        return st.plotly_chart(fig, **kwargs)
+    with medidor.medir(f"serializar: {fig.layout.title.text or 'figura'}"):
+        return st.plotly_chart(fig, **kwargs)
+
+
+@medidor.medido()
+@st.cache_data(ttl=CACHE_TTL, max_entries=CACHE_MAX_DATOS, show_spinner=False)
+def cargar_cohorte(ruta=RUTA_COHORTE, modificado=None, semilla=42):
+    # "modificado" (fecha del archivo) invalida la caché si la cohorte cambia
+    cohorte = leer_cohorte(ruta) if ruta else generar_cohorte(semilla=semilla)
+    return cohorte, huella(cohorte)
+
+
+@medidor.medido()
+@st.cache_resource(ttl=CACHE_TTL, max_entries=CACHE_MAX_DATOS, show_spinner="Agregando la cohorte por bloques...")
+def cargar_agregados(ruta, modificado, filas):
+    return agregar_archivo(ruta, filas)
+
+
+def cohorte_actual():
+    """Cohorte y huella, releyendo el archivo solo si cambió en disco.
+
+    Leyendo por bloques no hay cohorte a nivel de paciente: se devuelve
+    ``None`` con la huella de la cohorte completa.
+    """
+    modificado = os.path.getmtime(RUTA_COHORTE) if RUTA_COHORTE else None
+    if FILAS_BLOQUE:
+        return None, cargar_agregados(RUTA_COHORTE, modificado, FILAS_BLOQUE)[1]
+    return cargar_cohorte(RUTA_COHORTE, modificado)
+
+
+@medidor.medido()
+@st.cache_resource(ttl=CACHE_TTL, max_entries=CACHE_MAX_DATOS, show_spinner=False)
+def agregados_cohorte(huella_cohorte, _cohorte):
+    # Conteos por tiempo único (CIF, Gray, bootstrap) y por tipo de evento (EDA)
+    if _cohorte is None:
+        return cargar_agregados(RUTA_COHORTE, os.path.getmtime(RUTA_COHORTE), FILAS_BLOQUE)[0]
+    return Agregados.desde_cohorte(_cohorte)
+
+
+@medidor.medido()
+@st.cache_resource(ttl=CACHE_TTL, max_entries=CACHE_MAX_DATOS, show_spinner=False)
+def cargar_artefactos(ruta, version):
+    return lote.leer(ruta, version)
+
+
+def artefactos_precalculados(huella_cohorte):
+    """Artefactos de la última versión si corresponden a esta cohorte y parámetros."""
+    version = lote.version_actual(RUTA_RESULTADOS) if RUTA_RESULTADOS else None
+    if version is None:
+        return None
+    try:
+        artefactos = cargar_artefactos(RUTA_RESULTADOS, version)
+    except ValueError:
+        return None  # formato anterior o archivos dañados: se calcula en el tablero
+    return artefactos if artefactos.corresponde(huella_cohorte, B_BOOTSTRAP, SEMILLA_BOOTSTRAP) else None
+
+
+def bootstrap_cohorte(huella_cohorte, cohorte):
+    """Réplicas en 1, 3 y 5 años y bandas, de los artefactos precalculados o calculadas aquí."""
+    artefactos = artefactos_precalculados(huella_cohorte)
+    if artefactos:
+        return artefactos.bootstrap, artefactos.bandas
+    return estimar_bootstrap(huella_cohorte, B_BOOTSTRAP, SEMILLA_BOOTSTRAP, cohorte)
+
+
+def n_pacientes():
+    """Número de pacientes de la cohorte actual."""
+    cohorte, huella_cohorte = cohorte_actual()
+    return agregados_cohorte(huella_cohorte, cohorte).n
+
+
+def gray_cohorte(huella_cohorte, cohorte):
+    """Prueba de Gray en 1, 3 y 5 años y la malla mensual, de los artefactos o calculada aquí."""
+    artefactos = artefactos_precalculados(huella_cohorte)
+    if artefactos:
+        return artefactos.gray
+    return estimar_gray(huella_cohorte, tuple(lote.TAU_GRAY), cohorte)
+
+
+@medidor.medido()
+@st.cache_resource(ttl=CACHE_TTL, max_entries=CACHE_MAX_DATOS, show_spinner=False)
+def calcular_normalidad(huella_cohorte, _cohorte):
+    return normalidad(_cohorte)
+
+
+@medidor.medido()
+@st.cache_resource(ttl=CACHE_TTL, max_entries=CACHE_MAX_DATOS, show_spinner=False)
+def calcular_resumen_caja(huella_cohorte, columna, _cohorte):
+    return resumen_caja(_cohorte, columna)
+
+
+def tabla_eventos(huella_cohorte, cohorte):
+    """Conteos por grupo, tiempo único y causa: la única entrada de CIF, Gray y bootstrap."""
+    return agregados_cohorte(huella_cohorte, cohorte).tabla
+
+
+@medidor.medido()
+@st.cache_resource(ttl=CACHE_TTL, max_entries=CACHE_MAX_DATOS, show_spinner=False)
+def estimar_cif(huella_cohorte, _cohorte):
+    return tabla_eventos(huella_cohorte, _cohorte).curvas()
+
+
+@medidor.medido()
+@st.cache_resource(ttl=CACHE_TTL, max_entries=CACHE_MAX_DATOS, show_spinner="Calculando réplicas bootstrap...")
+def estimar_bootstrap(huella_cohorte, B, semilla, _cohorte):
+    # Réplicas en 1, 3 y 5 años y bandas puntuales y simultáneas en todos los tiempos
+    return lote.bootstrap_y_bandas(tabla_eventos(huella_cohorte, _cohorte), B, semilla, cache=CACHE_DISCO)
+
+
+@medidor.medido()
+@st.cache_resource(ttl=CACHE_TTL, max_entries=CACHE_MAX_DATOS, show_spinner="Generando réplicas hasta estabilizar los IC...")
+def estimar_bootstrap_adaptativo(huella_cohorte, tolerancia, semilla, _cohorte):
+    return lote.estimar_bootstrap_adaptativo(
+        tabla_eventos(huella_cohorte, _cohorte),
+        lote.HORIZONTES_DIAS,
+        tolerancia,
+        semilla,
+        cache=CACHE_DISCO
+    )
+
+
+@medidor.medido()
+@st.cache_resource(ttl=CACHE_TTL, max_entries=CACHE_MAX_DATOS, show_spinner=False)
+def estimar_aceleracion(huella_cohorte, _cohorte):
+    # Jackknife leave-one-out por actualización de la tabla de conteos
+    return aceleracion_jackknife(tabla_eventos(huella_cohorte, _cohorte), lote.HORIZONTES_DIAS)
+
+
+@medidor.medido()
+@st.cache_resource(ttl=CACHE_TTL, max_entries=CACHE_MAX_DATOS, show_spinner="Evaluando permutaciones...")
+def estimar_gray_permutacion(huella_cohorte, P, semilla, _cohorte):
+    # Solo en 1, 3 y 5 años: la tabla no usa la malla mensual
+    return lote.estimar_gray_permutacion(
+        tabla_eventos(huella_cohorte, _cohorte),
+        lote.HORIZONTES_DIAS,
+        P,
+        semilla,
+        cache=CACHE_DISCO
+    )
+
+
+@medidor.medido()
+@st.cache_resource(ttl=CACHE_TTL, max_entries=CACHE_MAX_DATOS, show_spinner="Prueba de Gray para cada covariable...")
+def estimar_barrido_gray(huella_cohorte, _cohorte):
+    # Todas las covariables y ambas causas sobre un mismo índice de tiempos
+    return barrido_gray(
+        _cohorte["Tiempo"].to_numpy(),
+        _cohorte["Causa"].to_numpy(),
+        estratos(_cohorte),
+        lote.HORIZONTES_DIAS
+    )
+
+
+@medidor.medido()
+@st.cache_resource(ttl=CACHE_TTL, max_entries=CACHE_MAX_DATOS, show_spinner="Ajustando el modelo de Fine-Gray...")
+def estimar_fine_gray(huella_cohorte, _cohorte):
+    return ajustar_fine_gray(_cohorte)
+
+
+@medidor.medido()
+@st.cache_resource(ttl=CACHE_TTL, max_entries=CACHE_MAX_DATOS, show_spinner=False)
+def estimar_gray(huella_cohorte, tau, _cohorte):
+    return lote.estimar_gray(tabla_eventos(huella_cohorte, _cohorte), np.array(tau), cache=CACHE_DISCO)
+
+
+# ---------------------------------------------------------
+# Filtro de grupos en el navegador
+# ---------------------------------------------------------
+# Grupos visibles para cada opción del filtro por tipo de donante
+OPCIONES_GRUPO = {
+    "Ambos grupos": ("DD", "LD"),
+    "Solo Donante Fallecido": ("DD",),
+    "Solo Donante Vivo": ("LD",)
+}
+
+
+def agregar_selector_grupo(fig):
+    """Añade botones de Plotly que muestran u ocultan cada tipo de donante.
+
+    Las trazas se identifican por su ``legendgroup`` y las anotaciones por su
+    ``name`` ("DD" o "LD"); las que no tienen grupo quedan siempre visibles.
+    El cambio ocurre en el navegador, sin volver a ejecutar el script.
+    """
+    grupos_trazas = [traza.legendgroup for traza in fig.data]
+    grupos_anotaciones = [anotacion.name for anotacion in fig.layout.annotations]
+    botones = []
+    for opcion, visibles in OPCIONES_GRUPO.items():
+        diseno = {
+            f"annotations[{i}].visible": grupo in visibles
+            for i, grupo in enumerate(grupos_anotaciones) if grupo in ("DD", "LD")
+        }
+        botones.append(dict(
+            label=opcion, method="update",
+            args=[{"visible": [grupo not in ("DD", "LD") or grupo in visibles for grupo in grupos_trazas]}, diseno]
+        ))
+    fig.update_layout(
+        updatemenus=[dict(
+            type="buttons", direction="right", buttons=botones, showactive=True,
+            x=0, xanchor="left", y=1.12, yanchor="bottom",
+            bgcolor='#2d2937', bordercolor='#3b82f6', font=dict(color='#e5e7eb')
+        )],
+        margin=dict(t=120)
+    )
+    return fig
+
+
+# ---------------------------------------------------------
+# Textos con los valores calculados sobre la cohorte
+# ---------------------------------------------------------
+# Nombres de las variables continuas en los textos
+NOMBRES_CONTINUAS = {
+    "Edad": "Edad",
+    "Creatinina12m": "Creatinina a 12 meses",
+    "TiempoDialisis": "Tiempo en diálisis",
+    "CIT": "Tiempo de isquemia fría (CIT)",
+}
+
+
+def miles(n):
+    """Entero con punto de miles: 1.454."""
+    return f"{int(n):,}".replace(",", ".")
+
+
+def porcentajes(valores):
+    """"5.7%, 12.5%, 16.9%" a partir de proporciones."""
+    return ", ".join(f"{100 * v:.1f}%" for v in valores)
+
+
+def tendencia_brecha(dd, ld, vivo="LD"):
+    """Frase sobre el signo y la evolución de la brecha DD - LD en los horizontes."""
+    brecha = np.asarray(dd) - np.asarray(ld)
+    if (brecha > 0).all():
+        orden = f"DD > {vivo} en todos los horizontes"
+    elif (brecha < 0).all():
+        orden = f"DD < {vivo} en todos los horizontes"
+    else:
+        orden = f"El orden entre DD y {vivo} cambia entre horizontes"
+    evolucion = "se agranda" if abs(brecha[-1]) > abs(brecha[0]) else "se reduce"
+    return f"{orden}; la diferencia {evolucion} con el tiempo"
+
+
+def conclusion_diferencia(ic):
+    """Lectura del IC de ΔCIF = CIF_DD - CIF_LD."""
+    if ic[0] > 0:
+        return "concluyente (DD > LD)"
+    if ic[1] < 0:
+        return "concluyente (DD < LD)"
+    return "no concluyente"
+
+
+def patron_horizontes(significativo, adjetivo="concluyente"):
+    """Frase sobre en qué horizontes (1, 3 y 5 años) la diferencia es ``adjetivo``."""
+    significativo = np.asarray(significativo)
+    if significativo.all():
+        return f"La diferencia es {adjetivo} en todos los horizontes"
+    if not significativo.any():
+        return f"La diferencia no es {adjetivo} en ningún horizonte"
+    if significativo[0] and not significativo[-1]:
+        anio = HORIZONTES_ANIOS[int(np.argmin(significativo))]
+        return f"La diferencia es {adjetivo} al inicio y deja de serlo desde el año {anio}"
+    return f"La diferencia es {adjetivo} solo en algunos horizontes"
+
+
+def texto_p(p):
+    return "p < 0.001" if p < 0.001 else f"p = {p:.3f}"
+
+
+def frase_proporciones(proporcion):
+    """Tipos de evento de mayor a menor proporción, con su porcentaje."""
+    orden = proporcion.sort_values(ascending=False)
+    partes = [f"{evento} (~{100 * valor:.1f}%)" for evento, valor in orden.items()]
+    return f"La mayor proporción aparece en {partes[0]}, seguida de {', '.join(partes[1:-1]) + ' y ' if len(partes) > 2 else ''}{partes[-1]}"
+
+
+def frase_medianas(mediana, unidad, decimales=1):
+    """Tipos de evento de mayor a menor mediana, con su valor."""
+    orden = mediana.sort_values(ascending=False)
+    partes = [f"{evento} (~{valor:.{decimales}f} {unidad})" for evento, valor in orden.items()]
+    return f"La mediana es más alta en {partes[0]}, seguida de {', '.join(partes[1:-1]) + ' y ' if len(partes) > 2 else ''}{partes[-1]}"
+
+
+def frase_dispersion(resumen, unidad, decimales=1):
+    """Tipo de evento con mayor RIC y atípicos (fuera de 1.5 RIC) de cada tipo."""
+    ric = resumen["q3"] - resumen["q1"]
+    atipicos = ", ".join(f"{evento} {miles(n)}" for evento, n in resumen["n_atipicos"].items())
+    return (
+        f"La mayor dispersión está en {ric.idxmax()} (RIC ≈ {ric.max():.{decimales}f} {unidad}); "
+        f"valores atípicos (fuera de 1.5 RIC): {atipicos}"
+    )
+
+
+def lectura_qq(nombre, estadistico, critico, n):
+    """Lectura del Q-Q plot de una variable a partir de su estadístico de Anderson-Darling.
+
+    AD crece con n para una misma forma; AD/n es la distancia ponderada entre
+    la distribución empírica y la normal, que no depende del tamaño.
+    """
+    if estadistico <= critico:
+        lectura = "los puntos siguen la recta teórica; compatible con la normal"
+    elif estadistico / n <= 0.005:
+        lectura = "se aproxima a la recta en la parte central, con desvíos moderados en las colas"
+    else:
+        lectura = "se aleja claramente de la recta teórica, lejos de la normalidad"
+    return f"- **{nombre}** (AD = {estadistico:.2f}): {lectura}."
+
+
+def p_gray(resultados_gray, codigo):
+    """p-valores de Gray en 1, 3 y 5 años (las primeras posiciones de ``tau``)."""
+    return resultados_gray[codigo].p_valor[:len(HORIZONTES_ANIOS)]
+
+
+def lineas_diferencia(resultado_bootstrap):
+    """Viñetas de ΔCIF con su IC del 95% por causa y horizonte."""
+    delta, ic = resultado_bootstrap.diferencia()
+    lineas = []
+    for codigo, nombre in CAUSAS.items():
+        k = resultado_bootstrap.causas.index(codigo)
+        lineas.append(f"- **{nombre} (causa {codigo})**")
+        for h, anio in enumerate(HORIZONTES_ANIOS):
+            lineas.append(
+                f"    - {anio} año{'s' if anio > 1 else ''}: ΔCIF {100 * delta[k, h]:.1f} pp "
+                f"(IC {100 * ic[0, k, h]:.1f}–{100 * ic[1, k, h]:.1f}) → {conclusion_diferencia(ic[:, k, h])}."
+            )
+        lineas.append(f"    - {patron_horizontes((ic[0, k] > 0) | (ic[1, k] < 0))}.")
+    return "\n".join(lineas)
+
+
+# ---------------------------------------------------------
+# Barra Lateral – Solo información del proyecto
+# ---------------------------------------------------------
+st.sidebar.header("Información del Proyecto")
+
+st.sidebar.write("**Nombre del Proyecto:**")
+st.sidebar.write("Análisis No Paramétrico de Riesgos Competitivos en Trasplante Renal")
+
+st.sidebar.write("**Autores:**")
+st.sidebar.write("Camila Mantilla – Julián Toloza – Maritza Jiménez")
+
+st.sidebar.write("**Fecha de Entrega:**")
+st.sidebar.write("18 de noviembre de 2025")
+
+st.sidebar.write("**Artículo Base:**")
+st.sidebar.write("Pinto-Ramírez et al., PLOS ONE, 2022")
+
+st.sidebar.markdown("---")
+
+# ---------------------------------------------------------
+# Encabezado principal
+# ---------------------------------------------------------
+st.title("Análisis No Paramétrico de Riesgos Competitivos en Trasplante Renal")
+st.subheader("Estimación de la Función de Incidencia Acumulada (CIF), prueba de Gray y bootstrap")
+
+st.markdown("---")
+
+# ---------------------------------------------------------
+# Propósito del Dashboard (sin la pregunta)
+# ---------------------------------------------------------
+st.header("Propósito del Dashboard")
+
+st.markdown(
+    f"""
+<div class="interpretation-box">
+  <p>Este tablero presenta un análisis no paramétrico de {miles(n_pacientes())} receptores de trasplante renal en Colombia, explorando cómo compiten los riesgos de muerte y pérdida del injerto durante 5 años. Compara estos riesgos según el tipo de donante usando la prueba de Gray y cuantifica las diferencias con intervalos de confianza por bootstrap a 1, 3 y 5 años.</p>
+</div>
+""",
+    unsafe_allow_html=True,
+)
+
+# ---------------------------------------------------------
+# PESTAÑA 1: Análisis Exploratorio de Datos
+# ---------------------------------------------------------
+def seccion_exploratorio():
+    st.header("Análisis Exploratorio de Datos")
+
+    st.markdown("""
+    El análisis exploratorio caracteriza de forma general la cohorte, describiendo la distribución por sexo, tipo de donante y la frecuencia de los eventos principales (pérdida del injerto y muerte), así como la presencia de desenlaces intercurrentes relevantes. Para las variables continuas se examinan medidas descriptivas y se evalúa visualmente su distribución, lo que permite identificar sesgos, asimetrías y desviaciones de la normalidad. Estos resultados orientan la elección de métodos no paramétricos en los análisis posteriores.
+    """)
+
+    # Las tablas y gráficos de conteos salen de los agregados de la cohorte;
+    # la normalidad y las cajas, de los datos de cada paciente
+    cohorte, huella_cohorte = cohorte_actual()
+    agregados = agregados_cohorte(huella_cohorte, cohorte)
+
+    # Distribución de eventos clínicos principales
+    st.subheader("Distribución de eventos clínicos principales")
+
+    @figura_cacheada
+    def figura_eventos(huella_cohorte, _agregados):
+        conteo = _agregados.eventos["DonanteVivo"].sum()
+        df_eventos = pd.DataFrame({
+            "Evento": conteo.index,
+            "Porcentaje": (100 * conteo / conteo.sum()).round(1).to_numpy()
+        })
+        fig_eventos = px.pie(
+            df_eventos, values='Porcentaje', names='Evento',
+            color='Evento',
+            color_discrete_map={
+                'Censurado': '#4b5563',
+                'Muerte': '#93c5fd',
+                'Pérdida del injerto': '#60a5fa'
+            },
+            hole=0.5,
+            title="Distribución de eventos clínicos principales"
+        )
+        fig_eventos.update_traces(textposition='inside', textinfo='percent+label')
+        fig_eventos.update_layout(
+            showlegend=False,
+            paper_bgcolor='#0f0c14',
+            plot_bgcolor='#0f0c14',
+            font_color='#e5e7eb'
+        )
+        return fig_eventos
+
+    mostrar_figura(figura_eventos(huella_cohorte, agregados), use_container_width=True)
+
+    # Tabla de distribución
+    st.subheader("Tabla de distribución")
+    df_distribucion = tabla_distribucion(agregados.eventos)
+    st.dataframe(
+        df_distribucion.style.format({'Porcentaje (%)': '{:.2f}%'})
+        .set_properties(**{'background-color': '#1e1b26', 'color': '#e5e7eb'}),
+        use_container_width=True
+    )
+
+    st.info("La mayoría de pacientes queda censurada al cierre; los eventos (muerte y pérdida del injerto) son minoritarios y desbalanceados. Esto respalda el uso de métodos no paramétricos con riesgos competitivos.")
+
+    # Distribución por tipo de donante
+    st.subheader("Distribución de pacientes por tipo de donante")
+
+    @figura_cacheada
+    def figura_donantes(huella_cohorte, _agregados):
+        conteo = _agregados.eventos["DonanteVivo"].sum(axis=1).reindex([False, True], fill_value=0)
+        df_donantes = pd.DataFrame({
+            "Tipo": ["Donante Fallecido", "Donante Vivo"],
+            "Porcentaje": (100 * conteo / conteo.sum()).round(1).to_numpy()
+        })
+        fig_donantes = px.pie(
+            df_donantes, values='Porcentaje', names='Tipo',
+            color='Tipo',
+            color_discrete_map={'Donante Fallecido': '#93c5fd', 'Donante Vivo': '#60a5fa'},
+            title="Distribución de pacientes por tipo de donante"
+        )
+        fig_donantes.update_traces(textposition='inside', textinfo='percent+label')
+        fig_donantes.update_layout(
+            showlegend=False,
+            paper_bgcolor='#0f0c14',
+            plot_bgcolor='#0f0c14',
+            font_color='#e5e7eb'
+        )
+        return fig_donantes
+
+    mostrar_figura(figura_donantes(huella_cohorte, agregados), use_container_width=True)
+
+    # Cantidad de eventos por tipo de donante
+    st.subheader("Cantidad de eventos por tipo de donante")
+
+    @figura_cacheada
+    def figura_barras(huella_cohorte, evento_filtro, _agregados):
+        df_eventos_donante = (
+            _agregados.eventos["DonanteVivo"]
+            .rename(columns={'Pérdida del injerto': 'Pérdida del Injerto'}, index={False: 'Donante Fallecido', True: 'Donante Vivo'})
+            .rename_axis(index='Tipo de Donante', columns=None)
+            .reset_index()
+        )
+
+        if evento_filtro == "Muerte":
+            df_plot = df_eventos_donante[['Tipo de Donante', 'Muerte']].melt(
+                id_vars='Tipo de Donante', var_name='Evento', value_name='Cantidad'
+            )
+            color_map = {'Muerte': '#93c5fd'}
+            title = 'Cantidad de Muertes por Tipo de Donante'
+        elif evento_filtro == "Pérdida del injerto":
+            df_plot = df_eventos_donante[['Tipo de Donante', 'Pérdida del Injerto']].melt(
+                id_vars='Tipo de Donante', var_name='Evento', value_name='Cantidad'
+            )
+            color_map = {'Pérdida del Injerto': '#60a5fa'}
+            title = 'Cantidad de Pérdidas del Injerto por Tipo de Donante'
+        else:
+            df_plot = df_eventos_donante.melt(
+                id_vars='Tipo de Donante', var_name='Evento', value_name='Cantidad'
+            )
+            color_map = {
+                'Censurado': '#4b5563',
+                'Muerte': '#93c5fd',
+                'Pérdida del Injerto': '#60a5fa'
+            }
+            title = 'Cantidad de Eventos por Tipo de Donante'
+
+        fig_barras = px.bar(
+            df_plot,
+            x='Tipo de Donante',
+            y='Cantidad',
+            color='Evento',
+            color_discrete_map=color_map,
+            title=title
+        )
+        fig_barras.update_layout(
+            barmode='group',
+            xaxis_title='Tipo de Donante',
+            yaxis_title='Número de Pacientes',
+            legend_title='Evento',
+            template='plotly_dark',
+            paper_bgcolor='#0f0c14',
+            plot_bgcolor='#0f0c14',
+            font_color='#e5e7eb'
+        )
+        return fig_barras
+
+    # El filtro de evento solo afecta a este gráfico: ambos viven en un
+    # fragmento, así que cambiarlo no vuelve a ejecutar el resto de la página
+    @st.fragment
+    def grafico_eventos_donante():
+        # Filtro interactivo
+        evento_filtro = st.sidebar.selectbox(
+            "Seleccionar evento para visualizar:",
+            ["Todos los eventos", "Muerte", "Pérdida del injerto"],
+            index=0
+        )
+        mostrar_figura(figura_barras(huella_cohorte, evento_filtro, agregados), use_container_width=True)
+
+    grafico_eventos_donante()
+
+    conteos_donante = agregados.eventos["DonanteVivo"].reindex([False, True], fill_value=0)
+    st.markdown(f"""
+    **Eventos por tipo de donante (conteos):**
+    - **Muerte:** {miles(conteos_donante.loc[False, 'Muerte'])} en donante fallecido vs {miles(conteos_donante.loc[True, 'Muerte'])} en donante vivo.
+    - **Pérdida del injerto:** {miles(conteos_donante.loc[False, 'Pérdida del injerto'])} vs {miles(conteos_donante.loc[True, 'Pérdida del injerto'])}.
+    - **Censurado:** {miles(conteos_donante.loc[False, 'Censurado'])} vs {miles(conteos_donante.loc[True, 'Censurado'])}.
+
+    *Nota: Son conteos, no tasas; no implican causalidad.*
+    """)
+
+    # Distribución de edad y sexo por tipo de evento
+    st.subheader("Distribución de edad y sexo por tipo de evento")
+
+    col1, col2 = st.columns(2)
+
+    with col1:
+        @figura_cacheada
+        def figura_edad(huella_cohorte, _agregados):
+            mediana = mediana_por_evento(_agregados.eventos["Edad"])
+            df_edad = pd.DataFrame({
+                "Tipo de Evento": mediana.index,
+                "Mediana Edad": mediana.to_numpy()
+            })
+            fig_edad = px.bar(
+                df_edad, x='Tipo de Evento', y='Mediana Edad',
+                color='Tipo de Evento',
+                color_discrete_map={
+                    'Censurado': '#4b5563',
+                    'Muerte': '#93c5fd',
+                    'Pérdida del injerto': '#60a5fa'
+                },
+                title="Mediana de Edad por Tipo de Evento"
+            )
+            fig_edad.update_layout(
+                yaxis_title="Edad (años)",
+                paper_bgcolor='#0f0c14',
+                plot_bgcolor='#0f0c14',
+                font_color='#e5e7eb'
+            )
+            return fig_edad
+
+        mostrar_figura(figura_edad(huella_cohorte, agregados), use_container_width=True)
+        mediana_edad = mediana_por_evento(agregados.eventos["Edad"])
+        lectura_edad = f"→ {frase_medianas(mediana_edad, 'años', 0)}."
+        if mediana_edad.idxmax() == "Muerte":
+            lectura_edad += " Sugiere mayor riesgo de muerte en pacientes de mayor edad."
+        st.caption(lectura_edad)
+
+    with col2:
+        @figura_cacheada
+        def figura_sexo(huella_cohorte, _agregados):
+            df_sexo = _agregados.eventos["Sexo"].T.rename_axis('Tipo de Evento').reset_index()
+            fig_sexo = go.Figure()
+            fig_sexo.add_trace(go.Bar(
+                name='Femenino', x=df_sexo['Tipo de Evento'], y=df_sexo['Femenino'],
+                marker_color='#cbd5e1'
+            ))
+            fig_sexo.add_trace(go.Bar(
+                name='Masculino', x=df_sexo['Tipo de Evento'], y=df_sexo['Masculino'],
+                marker_color='#93c5fd'
+            ))
+            fig_sexo.update_layout(
+                title_text='Distribución de Sexo por Tipo de Evento',
+                barmode='group',
+                xaxis_title='Tipo de Evento',
+                yaxis_title='Número de Pacientes',
+                legend_title='Sexo',
+                template='plotly_dark',
+                paper_bgcolor='#0f0c14',
+                plot_bgcolor='#0f0c14',
+                font_color='#e5e7eb'
+            )
+            return fig_sexo
+
+        mostrar_figura(figura_sexo(huella_cohorte, agregados), use_container_width=True)
+        conteos_sexo = agregados.eventos["Sexo"]
+        predominante = conteos_sexo.sum(axis=1).idxmax()
+        if (conteos_sexo.idxmax() == predominante).all():
+            lectura_sexo = f"Predomina el sexo {predominante.lower()} tanto en la cohorte como en los eventos."
+        else:
+            lectura_sexo = f"Predomina el sexo {predominante.lower()} en la cohorte, aunque no en todos los tipos de evento."
+        st.caption(f"{lectura_sexo} Esto refleja la composición muestral, no diferencias ajustadas.")
+
+    # Evaluación de la Normalidad de Variables Continuas
+    st.subheader("Evaluación de la Normalidad de Variables Continuas")
+
+    st.markdown("""
+    Para las variables continuas (edad, creatinina a 12 meses, tiempo en diálisis, tiempo de isquemia fría), se evaluó su distribución mediante Q-Q plots y la prueba de Anderson-Darling.
+    """)
+
+    if cohorte is None:
+        st.info(AVISO_BLOQUES)
+    else:
+        # Anderson-Darling y Q-Q de todas las variables continuas en una pasada
+        resultado_normalidad = calcular_normalidad(huella_cohorte, cohorte)
+        df_ad = tabla_normalidad(resultado_normalidad)
+        st.dataframe(
+            df_ad.style.set_properties(**{'background-color': '#1e1b26', 'color': '#e5e7eb'}),
+            use_container_width=True
+        )
+
+        if (df_ad["Conclusión"] == "NO normal").all():
+            conclusion_ad = f"Todos los estadísticos AD superan el valor crítico {resultado_normalidad.critico:.3f} → se rechaza la normalidad en todas las variables."
+        else:
+            no_normales = ", ".join(df_ad.loc[df_ad["Conclusión"] == "NO normal", "Variable"]) or "ninguna"
+            conclusion_ad = f"Se rechaza la normalidad (AD > {resultado_normalidad.critico:.3f}) en: {no_normales}."
+        st.markdown(f"""
+        <div class="interpretation-box">
+          <p><strong>{conclusion_ad}</strong></p>
+        </div>
+        """, unsafe_allow_html=True)
+
+        # Q-Q plots: a lo sumo ~2.000 puntos por variable, con las colas completas
+        @figura_cacheada
+        def figura_qq(huella_cohorte, _resultado):
+            fig = make_subplots(rows=2, cols=2, subplot_titles=_resultado.columnas)
+            extremos = _resultado.teoricos[[0, -1]]
+            for j, columna in enumerate(_resultado.columnas):
+                fila, col = divmod(j, 2)
+                fig.add_trace(
+                    go.Scattergl(
+                        x=_resultado.teoricos, y=_resultado.muestra[:, j], mode='markers', name=columna,
+                        marker=dict(color='#60a5fa', size=4)
+                    ),
+                    row=fila + 1, col=col + 1
+                )
+                # Recta de la normal con la media y la desviación de la muestra
+                fig.add_trace(
+                    go.Scatter(
+                        x=extremos, y=_resultado.media[j] + _resultado.desviacion[j] * extremos, mode='lines',
+                        name='Normal', line=dict(color='#f87171', dash='dash')
+                    ),
+                    row=fila + 1, col=col + 1
+                )
+            fig.update_xaxes(title_text="Cuantiles teóricos", row=2)
+            fig.update_yaxes(title_text="Cuantiles observados", col=1)
+            fig.update_layout(
+                title_text=f"Q-Q plots normales (n = {_resultado.n:,})",
+                height=700,
+                template='plotly_dark',
+                paper_bgcolor='#0f0c14',
+                plot_bgcolor='#0f0c14',
+                font_color='#e5e7eb',
+                showlegend=False
+            )
+            return fig
+
+        mostrar_figura(figura_qq(huella_cohorte, resultado_normalidad), use_container_width=True)
+
+        lineas = ["**Interpretación de los Q-Q plots:**"]
+        for j in np.argsort(resultado_normalidad.estadistico):
+            columna = resultado_normalidad.columnas[j]
+            lineas.append(lectura_qq(
+                NOMBRES_CONTINUAS.get(columna, columna), resultado_normalidad.estadistico[j], resultado_normalidad.critico,
+                resultado_normalidad.n
+            ))
+        st.markdown("\n".join(lineas))
+
+    st.markdown("""
+    <div class="interpretation-box">
+      <p><strong>La distribución de los datos (eventos desbalanceados, variables continuas no normales) justifica plenamente el uso de métodos no paramétricos en los análisis posteriores.</strong></p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    # BKV y CMV por tipo de evento
+    st.subheader("BKV y CMV por tipo de evento")
+
+    # Datos para BKV
+    @figura_cacheada
+    def figura_bkv(huella_cohorte, _agregados):
+        porcentaje = 100 * proporcion_por_evento(_agregados.eventos["BKV"])
+        df_bkv = pd.DataFrame({
+            "Tipo de Evento": porcentaje.index,
+            "Porcentaje": porcentaje.round(1).to_numpy()
+        })
+
+        fig_bkv = px.bar(
+            df_bkv, x='Tipo de Evento', y='Porcentaje',
+            color='Tipo de Evento',
+            color_discrete_map={'Censurado': '#93c5fd', 'Muerte': '#60a5fa', 'Pérdida del injerto': '#3b82f6'},
+            title="Nefropatía por BKV por evento"
+        )
+        fig_bkv.update_layout(
+            yaxis_title="Porcentaje (%)",
+            paper_bgcolor='#0f0c14',
+            plot_bgcolor='#0f0c14',
+            font_color='#e5e7eb'
+        )
+        return fig_bkv
+
+    mostrar_figura(figura_bkv(huella_cohorte, agregados), use_container_width=True)
+
+    # Datos para CMV
+    @figura_cacheada
+    def figura_cmv(huella_cohorte, _agregados):
+        porcentaje = 100 * proporcion_por_evento(_agregados.eventos["CMV"])
+        df_cmv = pd.DataFrame({
+            "Tipo de Evento": porcentaje.index,
+            "Porcentaje": porcentaje.round(1).to_numpy()
+        })
+
+        fig_cmv = px.bar(
+            df_cmv, x='Tipo de Evento', y='Porcentaje',
+            color='Tipo de Evento',
+            color_discrete_map={'Censurado': '#93c5fd', 'Muerte': '#60a5fa', 'Pérdida del injerto': '#3b82f6'},
+            title="Enfermedad por CMV por evento"
+        )
+        fig_cmv.update_layout(
+            yaxis_title="Porcentaje (%)",
+            paper_bgcolor='#0f0c14',
+            plot_bgcolor='#0f0c14',
+            font_color='#e5e7eb'
+        )
+        return fig_cmv
+
+    mostrar_figura(figura_cmv(huella_cohorte, agregados), use_container_width=True)
+
+    proporcion_bkv = proporcion_por_evento(agregados.eventos["BKV"])
+    proporcion_cmv = proporcion_por_evento(agregados.eventos["CMV"])
+    lineas = ["**Nefropatía por BKV:**", f"- {frase_proporciones(proporcion_bkv)}."]
+    if proporcion_bkv.idxmax() == "Pérdida del injerto":
+        lineas.append("- El BKV se asocia principalmente con deterioro del injerto más que con mortalidad.")
+    lineas += ["", "**Enfermedad por CMV:**", f"- {frase_proporciones(proporcion_cmv)}."]
+    if proporcion_cmv.idxmax() == "Muerte":
+        lineas.append("- El CMV se relaciona con desenlaces adversos, especialmente mortalidad.")
+    st.markdown("\n".join(lineas))
+
+    # Gráficas complementarias (al final)
+    st.subheader("Gráficas complementarias")
+
+    if cohorte is None:
+        st.info(AVISO_BLOQUES)
+    else:
+        # Cajas construidas a partir de estadísticos calculados en el servidor: se
+        # envían cuartiles, bigotes, media y una muestra acotada de atípicos, no
+        # todos los valores de la cohorte
+        def figura_caja(huella_cohorte, _cohorte, columna, title):
+            resumen, atipicos = calcular_resumen_caja(huella_cohorte, columna, _cohorte)
+            colores = {'Censurado': '#93c5fd', 'Muerte': '#60a5fa', 'Pérdida del injerto': '#3b82f6'}
+            fig = go.Figure()
+            for evento, fila in resumen.iterrows():
+                fig.add_trace(go.Box(
+                    name=evento, x=[evento], q1=[fila['q1']], median=[fila['mediana']], q3=[fila['q3']],
+                    lowerfence=[fila['bigote_inf']], upperfence=[fila['bigote_sup']], mean=[fila['media']],
+                    boxmean=True, marker_color=colores[evento], line=dict(width=2), legendgroup=evento
+                ))
+                puntos = atipicos.loc[atipicos['Tipo de Evento'] == evento, columna]
+                fig.add_trace(go.Scatter(
+                    x=[evento] * len(puntos), y=puntos, mode='markers', name=evento, legendgroup=evento,
+                    marker=dict(color=colores[evento], size=4), showlegend=False,
+                    hovertemplate=f"{evento}<br>%{{y:.2f}}<extra>atípico</extra>"
+                ))
+            fig.update_layout(title=title)
+            return fig
+
+        @figura_cacheada
+        def figura_creatinina(huella_cohorte, _cohorte):
+            fig_creatinina = figura_caja(huella_cohorte, _cohorte, "Creatinina12m", "Distribución de creatinina a 12 meses según tipo de evento")
+            fig_creatinina.update_layout(
+                yaxis_title="Creatinina a 12 meses (mg/dL)",
+                paper_bgcolor='#0f0c14',
+                plot_bgcolor='#0f0c14',
+                font_color='#e5e7eb',
+                yaxis_rangemode='tozero'
+            )
+            return fig_creatinina
+
+        mostrar_figura(figura_creatinina(huella_cohorte, cohorte), use_container_width=True)
+
+        resumen_creatinina, _ = calcular_resumen_caja(huella_cohorte, "Creatinina12m", cohorte)
+        mediana = resumen_creatinina["mediana"]
+        lineas = [
+            "**Creatinina a 12 meses (mg/dL):**",
+            f"- {frase_medianas(mediana, 'mg/dL')}.",
+            f"- {frase_dispersion(resumen_creatinina, 'mg/dL')}.",
+        ]
+        if mediana.idxmax() == "Pérdida del injerto":
+            lectura = "- Peores valores de creatinina a 12 meses se asocian con mayor riesgo de pérdida del injerto"
+            if mediana["Muerte"] > mediana["Censurado"]:
+                lectura += "; el grupo de muerte muestra elevación moderada"
+            lineas.append(lectura + ".")
+        st.markdown("\n".join(lineas))
+
+        @figura_cacheada
+        def figura_tiempo_dialisis(huella_cohorte, _cohorte):
+            fig_tiempo_dialisis = figura_caja(huella_cohorte, _cohorte, "TiempoDialisis", "Distribución del tiempo en diálisis según tipo de evento")
+            fig_tiempo_dialisis.update_layout(
+                yaxis_title="Tiempo en diálisis (meses)",
+                paper_bgcolor='#0f0c14',
+                plot_bgcolor='#0f0c14',
+                font_color='#e5e7eb',
+                yaxis_rangemode='tozero'
+            )
+            return fig_tiempo_dialisis
+
+        mostrar_figura(figura_tiempo_dialisis(huella_cohorte, cohorte), use_container_width=True)
+
+        resumen_dialisis, _ = calcular_resumen_caja(huella_cohorte, "TiempoDialisis", cohorte)
+        mediana = resumen_dialisis["mediana"]
+        lineas = [
+            "**Tiempo en diálisis (meses):**",
+            f"- {frase_medianas(mediana, 'meses')}.",
+            f"- {frase_dispersion(resumen_dialisis, 'meses')}.",
+        ]
+        if mediana.idxmin() == "Censurado":
+            lineas.append("- Mayor exposición previa a diálisis parece relacionarse con peores desenlaces (muerte y pérdida).")
+        st.markdown("\n".join(lineas))
+# ---------------------------------------------------------
+# PESTAÑA 2: Fórmulas de Métodos y su Aplicación
+# ---------------------------------------------------------
+def seccion_formulas():
+    st.header("Fórmulas de Métodos y su Aplicación")
+
+    st.markdown("""
+    Esta sección describe las tres herramientas no paramétricas fundamentales utilizadas en este análisis para abordar el problema de los riesgos competitivos. Para cada método, se explica su propósito, se presenta su fórmula clave en una caja gris, se detalla su aplicación en el contexto de este estudio y se establece su relación con el artículo base.
+    """)
+
+    # Sección 1: CIF
+    st.subheader("1. Estimación de la Incidencia por Causa (CIF)")
+
+    st.markdown("""
+    <div class="interpretation-box">
+      <h4>Fórmula General:</h4>
+      <p>La Función de Incidencia Acumulada (CIF) se calcula mediante la siguiente integral:</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    # Fórmula CIF con st.latex()
+    st.latex(r"F_k(t) = \int_0^t S(u^-) \lambda_k(u)  du")
+
+    st.markdown("""
+    <div class="interpretation-box">
+      <p><strong>Donde:</strong></p>
+      <ul>
+        <li><code>S(u⁻)</code>: Probabilidad de seguir sin ningún evento justo antes del tiempo <code>u</code>.</li>
+        <li><code>λ<sub>k</sub>(u)</code>: Riesgo instantáneo de la causa <code>k</code> en el tiempo <code>u</code>.</li>
+      </ul>
+    </div>
+    """, unsafe_allow_html=True)
+
+    st.markdown("""
+    **¿Qué es y para qué sirve?**
+    
+    La CIF es una herramienta estadística que nos permite estimar la probabilidad real de que un paciente experimente un evento específico (como muerte o pérdida del injerto) en un periodo de tiempo determinado, teniendo en cuenta que otros eventos pueden ocurrir primero y "competir" por ese resultado. En otras palabras, nos dice: "¿Cuántos pacientes, por cada 100, han experimentado este evento específico hasta un momento dado, considerando que algunos pudieron haber experimentado otro evento antes?"
+    """)
+
+    st.markdown("""
+    **Cómo se aplica en este estudio:**
+    
+    Se calcula la CIF para muerte (k=1) y pérdida del injerto (k=2) a 1, 3 y 5 años, separando por tipo de donante (fallecido vs vivo) usando el estimador de Aalen-Johansen.
+    """)
+
+    st.markdown("""
+    **Relación con el artículo:**
+    
+    El artículo de Pinto-Ramírez et al. utiliza la CIF para reportar la probabilidad acumulada a 5 años. Nuestro análisis complementa esto al mostrar las curvas completas y agregar intervalos de confianza por bootstrap.
+    """)
+
+    # Sección 2: Prueba de Gray
+    st.subheader("2. Comparación entre grupos: prueba de Gray")
+
+    st.markdown("""
+    <div class="interpretation-box">
+      <h4>Fórmula General:</h4>
+      <p>El estadístico de la prueba de Gray se define como:</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    # Fórmula Gray con st.latex()
+    st.latex(r"T_k = \frac{\left[ \sum_{u \leq \tau} w(u) \left( d\hat{F}_{k,DD}(u) - d\hat{F}_{k,LD}(u) \right) \right]^2}{\text{Var}\left[ \sum_{u \leq \tau} w(u) \left( d\hat{F}_{k,DD}(u) - d\hat{F}_{k,LD}(u) \right) \right]} \sim \chi^2_{(1)}")
+
+    st.markdown("""
+    <div class="interpretation-box">
+      <p><strong>Donde:</strong></p>
+      <ul>
+        <li><code>dF̂<sub>k,g</sub>(u)</code>: Incremento de la CIF estimada para la causa <code>k</code> en el grupo <code>g</code> en el tiempo <code>u</code>.</li>
+        <li><code>w(u)</code>: Peso basado en la supervivencia global estimada justo antes de <code>u</code>.</li>
+        <li><code>Var</code>: Varianza de Gray (1988), que incluye cómo cada evento modifica las CIF y la supervivencia con que se ponderan los tiempos posteriores.</li>
+      </ul>
+      <p>El estadístico <code>T<sub>k</sub></code> sigue aproximadamente una distribución chi-cuadrado con 1 grado de libertad.</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    st.markdown("""
+    **¿Qué es y para qué sirve?**
+    
+    La prueba de Gray es un test estadístico diseñado para comparar curvas de CIF entre grupos cuando existen riesgos competitivos, evitando el sesgo del test log-rank.
+    """)
+
+    st.markdown("""
+    **Cómo se aplica en este estudio:**
+    
+    Se aplica para comparar donante fallecido (DD) vs donante vivo (LD) para cada causa a 1, 3 y 5 años.
+    """)
+
+    st.markdown("""
+    **Relación con el artículo:**
+    
+    El artículo original utiliza la prueba de Gray como comparación no ajustada antes del modelo de Fine-Gray.
+    """)
+
+    # Sección 3: Bootstrap
+    st.subheader("3. Incertidumbre y diferencias absolutas: análisis bootstrap")
+
+    st.markdown("""
+    <div class="interpretation-box">
+      <h4>Fórmula General (IC por percentiles):</h4>
+      <p>Si <code>θ</code> es el parámetro de interés (por ejemplo, la CIF o la diferencia de CIF) y <code>θ̂</code> es su estimador en la muestra original, el intervalo de confianza del 95% por percentiles se calcula como:</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    # Fórmula Bootstrap con st.latex()
+    st.latex(r"\text{IC}_{95\%} = \left[ Q_{2.5\%}(\hat{\theta}^*), Q_{97.5\%}(\hat{\theta}^*) \right]")
+
+    st.markdown("""
+    <div class="interpretation-box">
+      <p><strong>Donde:</strong></p>
+      <ul>
+        <li><code>θ̂*</code>: Los B estimadores obtenidos de las B réplicas bootstrap.</li>
+        <li><code>Q<sub>p</sub>(θ̂*)</code>: El percentil p de las B réplicas bootstrap.</li>
+      </ul>
+      <p>Si el intervalo de confianza de la diferencia absoluta no incluye 0, concluimos que hay una diferencia significativa entre los grupos.</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    st.markdown("""
+    <div class="interpretation-box">
+      <h4>Variante BCa (sesgo corregido y acelerado):</h4>
+      <p>Cuando las réplicas son asimétricas (como la diferencia de CIF en pérdida del injerto), los percentiles se desplazan con una corrección de sesgo <code>z₀</code> (proporción de réplicas por debajo de <code>θ̂</code>) y una aceleración <code>a</code> estimada por jackknife (dejando fuera un paciente cada vez):</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    st.latex(r"\alpha_{1,2} = \Phi\left(z_0 + \frac{z_0 + z_{\alpha}}{1 - a\,(z_0 + z_{\alpha})}\right), \quad \text{IC}_{95\%} = \left[ Q_{\alpha_1}(\hat{\theta}^*), Q_{\alpha_2}(\hat{\theta}^*) \right]")
+
+    st.markdown("""
+    **¿Qué es y para qué sirve?**
+    
+    El bootstrap es un método no paramétrico que nos permite estimar la incertidumbre de cualquier estadístico (como la CIF o la diferencia entre dos CIF) cuando no conocemos su distribución muestral o esta no es normal. En nuestro caso, lo usamos para obtener intervalos de confianza del 95% para la CIF y para la diferencia absoluta entre los grupos (DD vs LD), lo que nos permite expresar los resultados con una medida de certeza.
+    """)
+
+    st.markdown(f"""
+    **Cómo se aplica en este estudio:**
+    
+    Se generan {B_BOOTSTRAP} réplicas, se recalculan las CIF y las diferencias, y se obtienen los IC del 95% para cada horizonte (1, 3, 5 años).
+    """)
+
+    st.markdown("""
+    **Relación con el artículo:**
+    
+    El artículo original no reporta intervalos de confianza para las CIF ni para las diferencias absolutas. Nuestro análisis complementa esto al agregar estos intervalos.
+    """)
+
+# ---------------------------------------------------------
+# PESTAÑA 3: Resultados de Métodos Aplicados
+# ---------------------------------------------------------
+def seccion_resultados():
+    st.header("Resultados de Métodos Aplicados")
+
+    # ---------------------------------------------------------
+    # Sección: Estimación de la CIF
+    # ---------------------------------------------------------
+    st.subheader("Estimación de la Incidencia por Causa (CIF)")
+
+    st.markdown("""
+    Esta sección presenta las curvas de Función de Incidencia Acumulada (CIF) para muerte y pérdida del injerto, separadas por tipo de donante (Donante Fallecido vs Donante Vivo). Las curvas muestran cómo evoluciona el riesgo acumulado a lo largo del tiempo.
+    """)
+
+    # CIF de Aalen-Johansen estimada sobre la cohorte a nivel de paciente
+    # (o leída de los artefactos precalculados, si existen para esta cohorte)
+    cohorte, huella_cohorte = cohorte_actual()
+    artefactos = artefactos_precalculados(huella_cohorte)
+    curvas_cif = artefactos.cif if artefactos else estimar_cif(huella_cohorte, cohorte)
+    # CIF en 1, 3 y 5 años por grupo y causa, para los textos de la sección
+    cif_anios = {
+        grupo: {k: curva.evaluar(lote.HORIZONTES_DIAS, k) for k in CAUSAS}
+        for grupo, curva in curvas_cif.items()
+    }
+
+    @figura_cacheada
+    def figura_cif(huella_cohorte, grupo_filtro, en_navegador, banda, _curvas, _bandas):
+        curva_dd, curva_ld = _curvas[False], _curvas[True]
+        horizontes_dias = np.array(HORIZONTES_ANIOS) * DIAS_POR_ANIO
+
+        # Crear la figura con subplots
+        fig_cif_complete = make_subplots(
+            rows=1, cols=2,
+            subplot_titles=("Muerte", "Pérdida del Injerto"),
+            x_title="Tiempo (años)",
+            y_title="% Incidencia Acumulada"
+        )
+
+        # Determinar qué grupos mostrar según el filtro
+        if grupo_filtro == "Ambos grupos":
+            show_dd = True
+            show_ld = True
+        elif grupo_filtro == "Solo Donante Fallecido":
+            show_dd = True
+            show_ld = False
+        else:  # Solo Donante Vivo
+            show_dd = False
+            show_ld = True
+
+        grupos_cif = []
+        if show_dd:
+            grupos_cif.append((curva_dd, 'DD', 'Donante Fallecido', '#93c5fd', 'rgba(147, 197, 253, 0.2)', -10))
+        if show_ld:
+            grupos_cif.append((curva_ld, 'LD', 'Donante Vivo', '#60a5fa', 'rgba(96, 165, 250, 0.2)', 10))
+
+        # Curvas escalonadas completas (col 1: muerte, col 2: pérdida del injerto)
+        x_bandas = np.concatenate([[0], _bandas.tiempos / DIAS_POR_ANIO])
+        for col, causa in enumerate(CAUSAS, start=1):
+            for curva, grupo, nombre, color, relleno, desplazamiento in grupos_cif:
+                if banda != "Ninguna":
+                    # Banda del 95% sombreada: límite inferior y superior rellenando hasta él
+                    g, k = _bandas.grupos.index(grupo == 'LD'), _bandas.causas.index(causa)
+                    if banda == "Simultánea":
+                        inferior, superior = _bandas.inferior_simultanea[g, k], _bandas.superior_simultanea[g, k]
+                    else:
+                        inferior, superior = _bandas.inferior[g, k], _bandas.superior[g, k]
+                    for limite, relleno_traza in ((inferior, None), (superior, 'tonexty')):
+                        fig_cif_complete.add_trace(
+                            go.Scatter(
+                                x=x_bandas, y=np.concatenate([[0], 100 * limite]),
+                                mode='lines', line_shape='hv', line=dict(width=0), fill=relleno_traza, fillcolor=relleno,
+                                legendgroup=grupo, hoverinfo='skip', showlegend=False
+                            ),
+                            row=1, col=col
+                        )
+                fig_cif_complete.add_trace(
+                    go.Scatter(
+                        x=np.concatenate([[0], curva.tiempos / DIAS_POR_ANIO]),
+                        y=np.concatenate([[0], 100 * curva.cif[curva.causas.index(causa)]]),
+                        mode='lines', line_shape='hv', name=nombre, legendgroup=grupo,
+                        line=dict(color=color, width=3)
+                    ),
+                    row=1, col=col
+                )
+                # Anotaciones en los horizontes de 1, 3 y 5 años
+                valores = 100 * curva.evaluar(horizontes_dias, causa)
+                for anio, valor in zip(HORIZONTES_ANIOS, valores):
+                    fig_cif_complete.add_annotation(
+                        x=anio, y=valor, text=f"{valor:.1f}%", showarrow=True, arrowhead=1, ax=0, ay=desplazamiento, font=dict(color=color), name=grupo,
+                        row=1, col=col
+                    )
+
+        fig_cif_complete.update_layout(
+            title_text="Incidencia acumulada (CIF) por causa y tipo de donante",
+            template='plotly_dark',
+            paper_bgcolor='#0f0c14',
+            plot_bgcolor='#0f0c14',
+            font_color='#e5e7eb',
+            showlegend=False
+        )
+        if en_navegador:
+            agregar_selector_grupo(fig_cif_complete)
+        return fig_cif_complete
+
+    # Bootstrap de la CIF (pesos multinomiales por bloques): réplicas en 1, 3 y
+    # 5 años y bandas sobre la curva completa
+    resultado_bootstrap, bandas_cif = bootstrap_cohorte(huella_cohorte, cohorte)
+
+    # Barras de la CIF en el horizonte elegido; las bandas son escalonadas en
+    # los tiempos observados, así que cada mes es una búsqueda binaria y no
+    # hace falta cachear la figura
+    def figura_cif_horizonte(meses, grupo_filtro, en_navegador, bandas):
+        estimado, inferior, superior = (100 * valores[..., 0] for valores in bandas.evaluar([meses * DIAS_POR_ANIO / 12]))
+        fig = go.Figure()
+        for g, (grupo, nombre, color) in enumerate([('DD', 'Donante Fallecido', '#93c5fd'), ('LD', 'Donante Vivo', '#60a5fa')]):
+            if grupo not in OPCIONES_GRUPO[grupo_filtro]:
+                continue
+            fig.add_trace(go.Bar(
+                x=[CAUSAS[k] for k in bandas.causas], y=estimado[g], name=nombre, legendgroup=grupo,
+                marker_color=color, text=estimado[g], texttemplate='%{text:.1f}%', textposition='outside',
+                error_y=dict(type='data', array=superior[g] - estimado[g], arrayminus=estimado[g] - inferior[g])
+            ))
+        fig.update_layout(
+            title=f"CIF a {meses} meses con IC 95%",
+            barmode='group',
+            yaxis_title="% (Incidencia acumulada)",
+            template='plotly_dark',
+            paper_bgcolor='#0f0c14',
+            plot_bgcolor='#0f0c14',
+            font_color='#e5e7eb'
+        )
+        if en_navegador:
+            agregar_selector_grupo(fig)
+        return fig
+
+    # ---------------------------------------------------------
+    # Gráficos controlados por el filtro de grupo (fragmento)
+    # ---------------------------------------------------------
+    # El filtro por tipo de donante solo afecta a la curva CIF y a las barras:
+    # viven en un fragmento junto con el widget, de modo que cambiarlo vuelve
+    # a ejecutar solo estos gráficos y no las tablas de Gray y bootstrap.
+    # En el modo "en el navegador" las figuras se envían una vez con ambos
+    # grupos y los botones de Plotly ocultan trazas sin volver al servidor.
+    @st.fragment
+    def graficos_cif():
+        # Filtro interactivo por tipo de donante (en la barra lateral)
+        st.sidebar.subheader("Filtro de Gráficos")
+        en_navegador = st.sidebar.toggle(
+            "Filtrar grupos en el navegador", value=True,
+            help="Los botones sobre cada figura cambian el grupo visible sin volver a ejecutar la app."
+        )
+        if en_navegador:
+            grupo_filtro = "Ambos grupos"
+        else:
+            grupo_filtro = st.sidebar.selectbox(
+                "Mostrar curvas y barras de:",
+                list(OPCIONES_GRUPO),
+                index=0
+            )
+        banda = st.sidebar.radio(
+            "Banda bootstrap del 95% en las curvas", ["Puntual", "Simultánea", "Ninguna"],
+            help="La puntual cubre la CIF en cada tiempo por separado; la simultánea, la curva completa a la vez."
+        )
+        meses = st.sidebar.slider(
+            "Horizonte de las barras (meses)", 0, 60, 12,
+            help="CIF e intervalo bootstrap del 95% en cualquier mes hasta 5 años."
+        )
+
+        mostrar_figura(figura_cif(huella_cohorte, grupo_filtro, en_navegador, banda, curvas_cif, bandas_cif), use_container_width=True)
+        st.caption(
+            f"Bandas de {B_BOOTSTRAP} réplicas bootstrap. La puntual es el IC del 95% de cada tiempo por separado "
+            "(percentiles estimados con el algoritmo P², sin guardar las réplicas de cada tiempo). La simultánea "
+            "contiene la curva completa con un 95% de confianza, por eso es más ancha."
+        )
+
+        # ---------------------------------------------------------
+        # Interpretación de las curvas CIF (en bullet points)
+        # ---------------------------------------------------------
+        dd, ld = cif_anios[False], cif_anios[True]
+        if all((dd[k] > ld[k]).all() for k in CAUSAS):
+            patron = "En ambos desenlaces, los receptores de donante fallecido (DD) acumulan mayor riesgo que los de donante vivo (DV) a lo largo del seguimiento."
+        else:
+            patron = "El riesgo acumulado de los receptores de donante fallecido (DD) frente a los de donante vivo (DV) depende del desenlace y del horizonte."
+        st.markdown(f"""
+        **Patrón general:** {patron}
+        - **Muerte (causa 1):**
+            - DD ≈ {porcentajes(dd[1])} a 1, 3 y 5 años.
+            - DV ≈ {porcentajes(ld[1])} en los mismos puntos.
+            - **Conclusión:** {tendencia_brecha(dd[1], ld[1], "DV")}.
+        - **Pérdida del injerto (causa 2):**
+            - DD ≈ {porcentajes(dd[2])} a 1, 3 y 5 años.
+            - DV ≈ {porcentajes(ld[2])}.
+            - **Conclusión:** {tendencia_brecha(dd[2], ld[2], "DV")}.
+
+        **Notas clínicas:** La brecha DD − DV pasa de {100 * (dd[1][0] - ld[1][0]):.1f} a {100 * (dd[1][-1] - ld[1][-1]):.1f} puntos % en mortalidad y de {100 * (dd[2][0] - ld[2][0]):.1f} a {100 * (dd[2][-1] - ld[2][-1]):.1f} puntos % en pérdida del injerto entre el año 1 y el año 5.
+        """)
+
+        # ---------------------------------------------------------
+        # Gráfica de barras en el horizonte elegido
+        # ---------------------------------------------------------
+        st.subheader("CIF en un horizonte a elegir (con intervalos de confianza)")
+
+        mostrar_figura(figura_cif_horizonte(meses, grupo_filtro, en_navegador, bandas_cif), use_container_width=True)
+
+    graficos_cif()
+
+    # Tabla de CIF (solo para referencia, no es el foco)
+    lineas = ["**CIF por año (DD vs. LD)**"]
+    for k, nombre in CAUSAS.items():
+        dd, ld = cif_anios[False][k], cif_anios[True][k]
+        lineas.append(f"- **{nombre} (causa {k}).**")
+        for anio, a, b in zip(HORIZONTES_ANIOS, dd, ld):
+            mayor = "mayor riesgo en DD" if a > b else "mayor riesgo en LD" if a < b else "riesgos iguales"
+            lineas.append(f"    - A {anio} año{'s' if anio > 1 else ''}: DD ≈ {100 * a:.1f}% vs LD ≈ {100 * b:.1f}% → {mayor}.")
+        lineas.append(f"    - {tendencia_brecha(dd, ld)}.")
+    st.markdown("\n".join(lineas))
+
+    # ---------------------------------------------------------
+    # Sección: Prueba de Gray
+    # ---------------------------------------------------------
+    st.subheader("Comparación entre grupos: prueba de Gray")
+
+    st.markdown("""
+    **Qué responde.** Determina si las curvas de incidencia acumulada (CIF) de dos o más grupos son distintas para una causa específica considerando los riesgos competitivos.
+    """)
+
+    # Tabla de la prueba de Gray
+    # Una sola pasada: horizontes de 1, 3 y 5 años más una malla mensual
+    resultados_gray = gray_cohorte(huella_cohorte, cohorte)
+
+    # p-valores chi-cuadrado o por permutación (fragmento: solo se vuelve a
+    # ejecutar la tabla)
+    @st.fragment
+    def tabla_prueba_gray():
+        resultados = resultados_gray
+        if st.toggle(
+            "p-valores por permutación",
+            help="Permuta las etiquetas de donante y compara con el estadístico observado; no depende de la aproximación chi-cuadrado."
+        ):
+            P = st.select_slider("Permutaciones", options=[1000, 2000, 5000, 10000], value=2000)
+            resultados = estimar_gray_permutacion(huella_cohorte, P, SEMILLA_BOOTSTRAP, cohorte)
+        gray_df = tabla_gray(resultados, HORIZONTES_ANIOS, {1: 'Muerte', 2: 'Pérdida'})
+        st.dataframe(gray_df.style.set_properties(**{'background-color': '#1e1b26', 'color': '#e5e7eb'}), use_container_width=True)
+
+    tabla_prueba_gray()
+
+    # Estadístico de Gray frente al horizonte de truncamiento
+    @figura_cacheada
+    def figura_gray_tau(huella_cohorte, _resultados_gray):
+        fig_gray_tau = go.Figure()
+        for codigo, color in ((1, '#93c5fd'), (2, '#60a5fa')):
+            fig_gray_tau.add_trace(go.Scatter(
+                x=np.arange(1, 61) / 12, y=_resultados_gray[codigo].estadistico[3:],
+                mode='lines', line_shape='hv', name=CAUSAS[codigo], line=dict(color=color, width=3)
+            ))
+        fig_gray_tau.add_hline(
+            y=3.841, line_dash='dash', line_color='#cbd5e1',
+            annotation_text="Valor crítico χ²(1) al 5%", annotation_font_color='#cbd5e1'
+        )
+        fig_gray_tau.update_layout(
+            title_text="Estadístico de Gray (chi²) según el horizonte τ",
+            xaxis_title="Horizonte τ (años)",
+            yaxis_title="chi²",
+            legend_title='Causa',
+            template='plotly_dark',
+            paper_bgcolor='#0f0c14',
+            plot_bgcolor='#0f0c14',
+            font_color='#e5e7eb'
+        )
+        return fig_gray_tau
+
+    mostrar_figura(figura_gray_tau(huella_cohorte, resultados_gray), use_container_width=True)
+
+    # Interpretación con los p-valores chi-cuadrado de la tabla (alfa = 0.05)
+    lineas = ["**Interpretación:**"]
+    for codigo, nombre in CAUSAS.items():
+        p_valores = p_gray(resultados_gray, codigo)
+        rechaza = p_valores < 0.05
+        lineas.append(f"- **{nombre}**")
+        for anio, p, r in zip(HORIZONTES_ANIOS, p_valores, rechaza):
+            decision = "hay diferencia (se rechaza H0)" if r else "no hay evidencia de diferencia (no se rechaza H0)"
+            lineas.append(f"    - {anio} año{'s' if anio > 1 else ''}: {texto_p(p)} → {decision}.")
+        resumen = f"{patron_horizontes(rechaza, 'significativa')}."
+        if codigo == 1 and rechaza.all():
+            resumen += " En línea con el artículo: el tipo de donante es un factor clave de mortalidad (junto con edad, diabetes, CMV, isquemia fría, etc.)."
+        elif codigo == 2 and rechaza[0] and not rechaza[-1]:
+            resumen += " Esto encaja con el artículo: los drivers de pérdida (BKV, rechazo agudo, creatinina 12 m, isquemia fría, rehospitalizaciones) actúan sobre todo al inicio; con el tiempo, la competencia con muerte y el manejo clínico reducen esa diferencia."
+        lineas.append(f"    - {resumen}")
+    st.markdown("\n".join(lineas))
+
+    # Prueba de Gray para cada covariable (K grupos; las continuas por cuartiles)
+    st.markdown("**Prueba de Gray para cada covariable** (las variables continuas se agrupan en cuartiles; haga clic en una columna para ordenar)")
+    if cohorte is None:
+        st.info(AVISO_BLOQUES)
+    else:
+        barrido_df = tabla_barrido(estimar_barrido_gray(huella_cohorte, cohorte), HORIZONTES_ANIOS, CAUSAS)
+        barrido_df = barrido_df.sort_values(f"p-valor {HORIZONTES_ANIOS[-1]} año(s)", ignore_index=True)
+        st.dataframe(
+            barrido_df,
+            column_config={
+                columna: st.column_config.NumberColumn(format="%.2e" if columna.startswith("p-valor") else "%.2f")
+                for columna in barrido_df.columns if columna.startswith(("p-valor", "chi²"))
+            },
+            hide_index=True,
+            use_container_width=True
+        )
+
+    # ---------------------------------------------------------
+    # Sección: Análisis Bootstrap
+    # ---------------------------------------------------------
+    st.subheader("Incertidumbre y diferencias absolutas: análisis bootstrap")
+
+    st.markdown("""
+    **¿Qué es y qué responde?** El bootstrap es un método no paramétrico para medir la incertidumbre de un estimador. En nuestro estudio, responde a dos preguntas prácticas:
+    1. ¿Cuál es la variabilidad de la CIF en cada grupo de donante (DD vs LD) a 1, 3 y 5 años?
+    2. ¿La diferencia absoluta de CIF entre DD y LD (ΔCIF = CIF_DD − CIF_LD) es distinta de 0?
+    """)
+
+    # Tablas de bootstrap (fragmento: cambiar el modo o la tolerancia solo
+    # vuelve a ejecutar las tablas)
+    @st.fragment
+    def tablas_bootstrap():
+        adaptativo = st.toggle(
+            "Bootstrap adaptativo",
+            help="Genera réplicas por lotes y fija cada IC cuando el error Monte Carlo de sus extremos es menor que la tolerancia."
+        )
+        resultado = resultado_bootstrap
+        if adaptativo:
+            tolerancia = st.number_input(
+                "Tolerancia del error Monte Carlo de los extremos (puntos %)",
+                min_value=0.05, max_value=2.0, value=0.25, step=0.05
+            )
+            resultado = estimar_bootstrap_adaptativo(huella_cohorte, tolerancia / 100, SEMILLA_BOOTSTRAP, cohorte)
+        tipo_intervalo = st.radio(
+            "Tipo de intervalo", ["Percentil", "BCa"], horizontal=True,
+            help="BCa corrige el sesgo y la asimetría de las réplicas; la aceleración sale de un jackknife leave-one-out."
+        )
+        aceleracion = estimar_aceleracion(huella_cohorte, cohorte) if tipo_intervalo == "BCa" else None
+
+        # Tabla de Bootstrap para Muerte
+        st.markdown("Bootstrap de CIF — Muerte (causa 1). DD vs LD")
+        bootstrap_muerte_df = tabla_bootstrap(resultado, 1, HORIZONTES_ANIOS, aceleracion=aceleracion)
+        st.dataframe(bootstrap_muerte_df.style.set_properties(**{'background-color': '#1e1b26', 'color': '#e5e7eb'}), use_container_width=True)
+
+        # Tabla de Bootstrap para Pérdida
+        st.markdown("Bootstrap de CIF — Pérdida del injerto (causa 2). DD vs LD")
+        bootstrap_perdida_df = tabla_bootstrap(resultado, 2, HORIZONTES_ANIOS, aceleracion=aceleracion)
+        st.dataframe(bootstrap_perdida_df.style.set_properties(**{'background-color': '#1e1b26', 'color': '#e5e7eb'}), use_container_width=True)
+
+    tablas_bootstrap()
+
+    st.markdown("""
+    **Definiciones:**
+    - **CIF:** Porcentaje de pacientes que ya presentaron el evento antes o en el horizonte (1, 3 o 5 años).
+    - **Delta CIF (pp):** Diferencia en puntos porcentuales entre Donante Fallecido (DD) y Donante Vivo (LD).
+    - **IC 95% que no incluye 0:** Diferencia concluyente.
+    - **IC 95% que sí incluye 0:** No concluyente (no podemos asegurar diferencia).
+    """)
+
+    # ---------------------------------------------------------
+    # Sección: Regresión de Fine-Gray
+    # ---------------------------------------------------------
+    st.subheader("Regresión de Fine-Gray: razones de riesgo de subdistribución (sHR)")
+
+    st.markdown("""
+    **¿Qué responde?** El modelo de Fine-Gray estima el efecto de cada variable sobre la incidencia acumulada de una causa **ajustando por las demás**. Un sHR > 1 indica mayor incidencia del evento; un sHR < 1, menor. Los pacientes con el evento competidor siguen en el conjunto en riesgo con un peso IPCW (inverso de la probabilidad de no haber sido censurados).
+    """)
+    if cohorte is None:
+        st.info(AVISO_BLOQUES)
+    else:
+        fine_gray_df = tabla_fine_gray(
+            estimar_fine_gray(huella_cohorte, cohorte),
+            CAUSAS,
+            etiquetas={
+                "DonanteVivo": "Donante vivo (vs. fallecido)",
+                "Edad": "Edad del receptor (por año)",
+                "BKV": "Infección por BKV",
+                "CMV": "Infección por CMV",
+                "RechazoAgudo": "Rechazo agudo",
+            }
+        )
+        st.dataframe(fine_gray_df.style.set_properties(**{'background-color': '#1e1b26', 'color': '#e5e7eb'}), hide_index=True, use_container_width=True)
+        st.caption("IC y p-valores con errores estándar robustos (sándwich de Fine y Gray), que incluyen la variabilidad de la estimación de los pesos IPCW.")
+
+    # ---------------------------------------------------------
+    # Sección: Resultados Clave
+    # ---------------------------------------------------------
+    st.subheader("Resultados clave")
+
+    st.markdown(lineas_diferencia(resultado_bootstrap))
+    # ---------------------------------------------------------
+# PESTAÑA 4: Hallazgos y Conclusiones
+# ---------------------------------------------------------
+def seccion_conclusiones():
+    st.header("Hallazgos y Conclusiones")
+
+    # Las cifras de los textos salen del bootstrap de la cohorte actual
+    cohorte, huella_cohorte = cohorte_actual()
+    resultado_bootstrap, _ = bootstrap_cohorte(huella_cohorte, cohorte)
+    resultados_gray = gray_cohorte(huella_cohorte, cohorte)
+    p_muerte, p_perdida = p_gray(resultados_gray, 1)[-1], p_gray(resultados_gray, 2)[-1]
+
+    def significativa(p):
+        return "es significativa" if p < 0.05 else "no es significativa"
+
+    delta, ic = resultado_bootstrap.diferencia()
+    muerte, perdida = resultado_bootstrap.causas.index(1), resultado_bootstrap.causas.index(2)
+    concluyente = (ic[0] > 0) | (ic[1] < 0)
+    riesgo_5 = f"{100 * abs(delta[muerte, -1]):.1f} puntos porcentuales {'más' if delta[muerte, -1] > 0 else 'menos'}"
+    ic_5 = f"{100 * ic[0, muerte, -1]:.1f} y {100 * ic[1, muerte, -1]:.1f}"
+
+    # ---------------------------------------------------------
+    # Sección: Discusión
+    # ---------------------------------------------------------
+    st.subheader("Discusión")
+
+    st.markdown(f"""
+    <div class="interpretation-box">
+      <p>Este análisis no paramétrico complementa el estudio original al centrarse en la comunicación clínica y metodológica de los riesgos competitivos.</p>
+      <ul>
+        <li><strong>CIF vs. Kaplan-Meier:</strong> La CIF es superior porque estima el riesgo absoluto real de cada evento (muerte o pérdida del injerto), reconociendo que uno puede impedir al otro. Si se hubiera usado Kaplan-Meier, la suma de los riesgos estimados para muerte y pérdida habría superado el 100%, lo cual es imposible y engañoso.</li>
+        <li><strong>Prueba de Gray vs. Log-rank:</strong> La prueba de Gray es el estándar para comparar grupos en este contexto. A diferencia del log-rank, que trata la muerte como censura, Gray compara directamente las curvas de CIF, evitando sesgos. En esta cohorte, a 5 años la diferencia entre donantes vivos y fallecidos {significativa(p_muerte)} para la mortalidad ({texto_p(p_muerte)}) y {significativa(p_perdida)} para la pérdida del injerto ({texto_p(p_perdida)}).</li>
+        <li><strong>Bootstrap e Intervalos de Confianza:</strong> El bootstrap nos permite reportar diferencias absolutas de riesgo con su incertidumbre. Por ejemplo, a 5 años, los receptores de donante fallecido tienen {riesgo_5} de riesgo de muerte (IC 95%: entre {ic_5} pp) que los de donante vivo. Esta forma de comunicar “cuánto más” es mucho más útil clínicamente que un simple p-valor o una razón de riesgo.</li>
+        <li><strong>Nuestro enfoque añade valor al:</strong>
+          <ul>
+            <li>Justificar explícitamente por qué se usan métodos no paramétricos (CIF, Gray, bootstrap) en lugar de otros.</li>
+            <li>Reportar riesgo absoluto y diferencias absolutas con intervalos de confianza, lo que facilita la interpretación clínica.</li>
+            <li>Evitar supuestos de normalidad para variables continuas (como la edad o la creatinina), que en este caso no se cumplen.</li>
+          </ul>
+        </li>
+      </ul>
+    </div>
+    """, unsafe_allow_html=True)
+
+    # ---------------------------------------------------------
+    # Sección: Limitaciones
+    # ---------------------------------------------------------
+    st.subheader("Limitaciones")
+
+    st.markdown("""
+    <div class="interpretation-box">
+      <ul>
+        <li><strong>Ajuste limitado por otros factores clínicos:</strong> La CIF, la prueba de Gray y el bootstrap comparan solo por tipo de donante (fallecido vs. vivo). El modelo de Fine-Gray ajusta por edad, BKV, CMV y rechazo agudo, pero no incluye otras variables del artículo original (p. ej., diabetes, creatinina a los 12 meses o isquemia fría).</li>
+        <li><strong>Prueba de Gray truncada por horizonte:</strong> Para ver cómo evoluciona la diferencia entre grupos, el estadístico de Gray se lee truncado en cada horizonte (1, 3 y 5 años y una malla mensual) a partir de una sola pasada por los tiempos de evento. Esto es útil para mostrar el cambio en el tiempo, pero no es el método estándar: mirar muchos horizontes multiplica las comparaciones, y truncar pronto puede reducir la capacidad de detectar una diferencia real (potencia estadística).</li>
+        <li><strong>Precisión del bootstrap:</strong> Los intervalos de confianza obtenidos con el bootstrap dependen del tamaño de la muestra y del desbalance entre grupos (hay muchos más receptores de donante fallecido que de donante vivo). Aunque es un método robusto, nuestros resultados podrían tener cierta variabilidad debido a esta estructura de la muestra.</li>
+      </ul>
+    </div>
+    """, unsafe_allow_html=True)
+
+    # ---------------------------------------------------------
+    # Sección: Conclusiones
+    # ---------------------------------------------------------
+    st.subheader("Conclusiones")
+
+    # Frases por causa a partir de ΔCIF y su IC en 1 y 5 años
+    def resumen_causa(k, evento):
+        return (
+            f"La diferencia DD − LD en el riesgo de {evento} es de {100 * delta[k, 0]:.1f} puntos % al año 1 "
+            f"y de {100 * delta[k, -1]:.1f} al año 5 (IC 95%: {100 * ic[0, k, -1]:.1f} a {100 * ic[1, k, -1]:.1f}). "
+            f"{patron_horizontes(concluyente[k])}."
+        )
+
+    nota_perdida = ""
+    if concluyente[perdida, 0] and not concluyente[perdida, -1]:
+        nota_perdida = " Esto puede deberse a que muchos pacientes con donante fallecido mueren antes de perder el injerto (riesgo competitivo) o a que el seguimiento médico reduce las diferencias iniciales."
+    st.markdown(f"""
+    <div class="interpretation-box">
+      <p>Este análisis compara, por tipo de donante, el riesgo absoluto de muerte del receptor y de pérdida del injerto. A 5 años la diferencia es {conclusion_diferencia(ic[:, muerte, -1])} en mortalidad y {conclusion_diferencia(ic[:, perdida, -1])} en pérdida del injerto.</p>
+      <h4>Sobre la muerte del paciente:</h4>
+      <ul>
+        <li>{resumen_causa(muerte, "muerte")}</li>
+      </ul>
+      <h4>Sobre la pérdida del injerto:</h4>
+      <ul>
+        <li>{resumen_causa(perdida, "pérdida del injerto")}{nota_perdida}</li>
+      </ul>
+      <h4>¿Qué nos dicen los métodos juntos?</h4>
+      <ul>
+        <li>La CIF nos dice “cuántos pacientes” tienen cada desenlace.</li>
+        <li>La prueba de Gray indica si las curvas de riesgo están separadas: a 5 años, {texto_p(p_muerte)} en mortalidad y {texto_p(p_perdida)} en pérdida del injerto.</li>
+        <li>El bootstrap nos permite decir “cuán grande” es la diferencia y con qué certeza (por ejemplo, para la muerte a 5 años: “{riesgo_5}, con un margen entre {ic_5}”).</li>
+      </ul>
+      <p><strong>En resumen, este enfoque no paramétrico ofrece una forma más clara y realista de interpretar los resultados en estudios donde eventos como la muerte y la pérdida del injerto compiten entre sí.</strong></p>
+    </div>
+    """, unsafe_allow_html=True)
+
+# ---------------------------------------------------------
+# Navegación entre secciones (4)
+# ---------------------------------------------------------
+# A diferencia de st.tabs, que ejecuta el cuerpo de las cuatro pestañas en
+# cada interacción, el selector solo ejecuta la sección activa; las
+# secciones pesadas (bootstrap, Gray) se calculan únicamente al abrirlas.
+SECCIONES = {
+    "Análisis Exploratorio de Datos": seccion_exploratorio,
+    "Fórmulas de Métodos y su Aplicación": seccion_formulas,
+    "Resultados de Métodos Aplicados": seccion_resultados,
+    "Hallazgos y Conclusiones": seccion_conclusiones
+}
+seccion_activa = st.radio(
+    "Sección", list(SECCIONES), horizontal=True,
+    label_visibility="collapsed", key="seccion"
+)
+with medidor.medir(f"sección: {seccion_activa}"):
+    SECCIONES[seccion_activa]()
+
+# Latencia de esta ejecución del script (se actualiza en cada interacción)
+st.sidebar.caption(f"Última ejecución: {1000 * (time.perf_counter() - inicio_ejecucion):.0f} ms")
+
+# Panel de instrumentación: pasos más lentos de esta ejecución
+if medidor.activo:
+    medidor.exportar()
+    with st.sidebar.expander("Pasos más lentos"):
+        st.dataframe(medidor.tabla(10), hide_index=True, use_container_width=True)
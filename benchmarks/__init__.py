@@ -0,0 +1,10 @@
+"""Benchmarks de los estimadores y del ciclo de ejecución del tablero.
+
+Los módulos ``bench_*.py`` siguen las convenciones de asv: clases con
+``params``/``param_names``, ``setup``/``teardown`` y métodos ``time_*``.
+Se ejecutan con el corredor incluido, que guarda los resultados en JSON y
+los compara con una ejecución anterior::
+
+    python -m benchmarks --salida resultados/bench.json
+    python -m benchmarks --filtro Gray --comparar resultados/bench.json
+"""
@@ -0,0 +1,158 @@
+"""Corredor de los benchmarks: mide, guarda en JSON y compara versiones."""
+
+import argparse
+import importlib
+import itertools
+import json
+import os
+import platform
+import pkgutil
+import re
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import benchmarks
+
+VERSION_FORMATO = 1
+# Duración mínima de cada muestra (segundos)
+DURACION_MUESTRA = 0.1
+
+
+def _casos(patron):
+    """Clases de benchmark de los módulos ``bench_*`` que coinciden con ``patron``."""
+    for info in pkgutil.iter_modules(benchmarks.__path__):
+        if not info.name.startswith("bench_"):
+            continue
+        modulo = importlib.import_module(f"benchmarks.{info.name}")
+        for nombre, clase in vars(modulo).items():
+            if not isinstance(clase, type) or clase.__module__ != modulo.__name__:
+                continue
+            metodos = [m for m in vars(clase) if m.startswith("time_")]
+            metodos = [m for m in metodos if re.search(patron, f"{info.name}.{nombre}.{m}")]
+            if metodos:
+                yield f"{info.name}.{nombre}", clase, metodos
+
+
+def _combinaciones(clase):
+    params = getattr(clase, "params", [])
+    if params and not isinstance(params[0], (list, tuple)):
+        params = [params]
+    nombres = getattr(clase, "param_names", [f"p{i}" for i in range(len(params))])
+    for valores in itertools.product(*params):
+        yield dict(zip(nombres, valores))
+
+
+def _medir(funcion, valores, numero):
+    inicio = time.perf_counter()
+    for _ in range(numero):
+        funcion(*valores)
+    return (time.perf_counter() - inicio) / numero
+
+
+def ejecutar(patron=".", repeticiones=3, tamano_maximo=None):
+    """Ejecuta los benchmarks y devuelve una fila por (método, parámetros)."""
+    resultados = []
+    for prefijo, clase, metodos in _casos(patron):
+        for parametros in _combinaciones(clase):
+            if tamano_maximo and parametros.get("n", 0) > tamano_maximo:
+                continue
+            caso = clase()
+            valores = list(parametros.values())
+            if hasattr(caso, "setup"):
+                caso.setup(*valores)
+            try:
+                for metodo in metodos:
+                    funcion = getattr(caso, metodo)
+                    # Llamadas rápidas: cada muestra promedia varias, como en asv
+                    # (si la primera ya dura lo suficiente, cuenta como muestra)
+                    primera = _medir(funcion, valores, 1)
+                    numero = max(1, int(DURACION_MUESTRA / max(primera, 1e-9)))
+                    n_muestras = getattr(clase, "repeat", repeticiones)
+                    segundos = [primera] if numero == 1 else []
+                    while len(segundos) < n_muestras:
+                        segundos.append(_medir(funcion, valores, numero))
+                    fila = {
+                        "nombre": f"{prefijo}.{metodo}",
+                        "parametros": parametros,
+                        "segundos": segundos,
+                        "minimo": min(segundos),
+                        "mediana": statistics.median(segundos),
+                    }
+                    resultados.append(fila)
+                    etiqueta = ", ".join(f"{k}={v}" for k, v in parametros.items())
+                    print(f"{fila['nombre']:<55} {etiqueta:<35} {fila['mediana']:9.4f} s", flush=True)
+            finally:
+                if hasattr(caso, "teardown"):
+                    caso.teardown(*valores)
+    return resultados
+
+
+def _entorno():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    import streamlit
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "streamlit": streamlit.__version__,
+        "plataforma": platform.platform(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def comparar(actual, anterior, tolerancia=0.2):
+    """Casos cuya mediana empeoró más de ``tolerancia`` (fracción) respecto a ``anterior``."""
+    previos = {(f["nombre"], json.dumps(f["parametros"], sort_keys=True)): f for f in anterior["resultados"]}
+    regresiones = []
+    for fila in actual:
+        previo = previos.get((fila["nombre"], json.dumps(fila["parametros"], sort_keys=True)))
+        if previo and fila["mediana"] > (1 + tolerancia) * previo["mediana"]:
+            regresiones.append((fila, previo["mediana"]))
+    return regresiones
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__)
+    parser.add_argument("--filtro", default=".", help="expresión regular sobre módulo.Clase.método")
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--tamano-maximo", type=int, help="omite las cohortes de más de N pacientes")
+    parser.add_argument("--salida", type=Path, help="archivo JSON donde guardar los resultados")
+    parser.add_argument("--comparar", type=Path, help="JSON de una ejecución anterior")
+    parser.add_argument("--tolerancia", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    anterior = json.loads(args.comparar.read_text()) if args.comparar else None
+    resultados = ejecutar(args.filtro, args.repeticiones, args.tamano_maximo)
+    if args.salida:
+        args.salida.parent.mkdir(parents=True, exist_ok=True)
+        args.salida.write_text(json.dumps({
+            "version": VERSION_FORMATO,
+            "fecha": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "entorno": _entorno(),
+            "resultados": resultados,
+        }, indent=2, ensure_ascii=False))
+
+    if anterior is not None:
+        regresiones = comparar(resultados, anterior, args.tolerancia)
+        for fila, previo in regresiones:
+            print(f"REGRESIÓN {fila['nombre']} {fila['parametros']}: {previo:.4f} s -> {fila['mediana']:.4f} s")
+        if regresiones:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""Rendimiento de la CIF, la prueba de Gray y el bootstrap."""
+
+import os
+import shutil
+import tempfile
+
+import numpy as np
+
+from analisis.agregados import agregar_archivo
+from analisis.bootstrap import bandas_bootstrap, bootstrap_multinomial
+from analisis.cif import TablaEventos, aalen_johansen
+from analisis.cohorte import DIAS_POR_ANIO, HORIZONTES_ANIOS, guardar_cohorte
+from analisis.finegray import COVARIABLES, fine_gray, matriz_diseno
+from analisis.gray import barrido_gray, prueba_gray, prueba_gray_permutacion
+from analisis.normalidad import normalidad
+from benchmarks.comun import TAMANOS, arreglos, cohorte, covariables, tabla
+
+HORIZONTES_DIAS = np.array(HORIZONTES_ANIOS) * DIAS_POR_ANIO
+# Los horizontes de la tabla más la malla mensual que usa el tablero
+TAU = np.concatenate([HORIZONTES_DIAS, np.arange(1, 61) * DIAS_POR_ANIO / 12])
+
+
+class CIF:
+    params = [TAMANOS]
+    param_names = ["n"]
+
+    def setup(self, n):
+        self.datos = arreglos(n)
+
+    def time_aalen_johansen(self, n):
+        aalen_johansen(*self.datos)
+
+    def time_tabla_eventos(self, n):
+        TablaEventos.desde_cohorte(*self.datos)
+
+
+class Agregacion:
+    """Agregados del tablero leyendo la cohorte en Parquet por bloques de 100.000 filas."""
+
+    params = [TAMANOS]
+    param_names = ["n"]
+
+    def setup(self, n):
+        self.directorio = tempfile.mkdtemp()
+        self.ruta = os.path.join(self.directorio, "cohorte.parquet")
+        guardar_cohorte(cohorte(n), self.ruta)
+
+    def teardown(self, n):
+        shutil.rmtree(self.directorio, ignore_errors=True)
+
+    def time_agregar_archivo(self, n):
+        agregar_archivo(self.ruta, filas=100_000)
+
+
+class Gray:
+    params = [TAMANOS]
+    param_names = ["n"]
+
+    def setup(self, n):
+        self.tabla = tabla(n)
+
+    def time_prueba_gray(self, n):
+        prueba_gray(self.tabla, TAU)
+
+
+class BarridoGray:
+    """Prueba de Gray para 20 covariables y las dos causas en una pasada."""
+
+    params = [TAMANOS]
+    param_names = ["n"]
+
+    def setup(self, n):
+        self.tiempo, self.causa, _ = arreglos(n)
+        self.covariables = covariables(n)
+
+    def time_barrido_gray(self, n):
+        barrido_gray(self.tiempo, self.causa, self.covariables, TAU)
+
+
+class GrayPermutacion:
+    """1.000 permutaciones en 1, 3 y 5 años."""
+
+    params = [TAMANOS]
+    param_names = ["n"]
+    timeout = 600
+
+    def setup(self, n):
+        self.tabla = tabla(n)
+
+    def time_prueba_gray_permutacion(self, n):
+        prueba_gray_permutacion(self.tabla, HORIZONTES_DIAS, P=1000)
+
+
+class FineGray:
+    """Fine-Gray de la muerte con 10 covariables de la cohorte."""
+
+    params = [TAMANOS]
+    param_names = ["n"]
+
+    def setup(self, n):
+        datos = cohorte(n)
+        self.tiempo, self.causa = datos["Tiempo"].to_numpy(), datos["Causa"].to_numpy()
+        self.X = matriz_diseno(datos, COVARIABLES + ("Sexo", "StentCoronario", "Creatinina12m", "TiempoDialisis", "CIT"))
+
+    def time_fine_gray(self, n):
+        fine_gray(self.tiempo, self.causa, self.X)
+
+
+class Normalidad:
+    params = [TAMANOS]
+    param_names = ["n"]
+
+    def setup(self, n):
+        self.cohorte = cohorte(n)
+
+    def time_normalidad(self, n):
+        normalidad(self.cohorte)
+
+
+class Bootstrap:
+    params = [TAMANOS, [1000, 10_000]]
+    param_names = ["n", "B"]
+    repeat = 2
+    timeout = 600
+
+    def setup(self, n, B):
+        self.tabla = tabla(n)
+
+    def time_bootstrap_multinomial(self, n, B):
+        bootstrap_multinomial(self.tabla, HORIZONTES_DIAS, B=B)
+
+    def time_bandas_bootstrap(self, n, B):
+        # Bandas puntuales y simultáneas sobre todos los tiempos únicos
+        bandas_bootstrap(self.tabla, HORIZONTES_DIAS, B=B)
@@ -0,0 +1,51 @@
+"""Ejecución completa del tablero sin navegador (``AppTest``)."""
+
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+from analisis.cohorte import guardar_cohorte
+from benchmarks.comun import TAMANOS, cohorte
+
+APP = str(Path(__file__).resolve().parents[1] / "app.py")
+SECCIONES = {
+    "exploratorio": "Análisis Exploratorio de Datos",
+    "resultados": "Resultados de Métodos Aplicados",
+}
+
+
+class Tablero:
+    params = [TAMANOS, list(SECCIONES)]
+    param_names = ["n", "seccion"]
+    timeout = 600
+
+    def setup(self, n, seccion):
+        # El tablero lee la cohorte del archivo indicado en COHORTE_RUTA
+        self.directorio = tempfile.mkdtemp()
+        ruta = os.path.join(self.directorio, "cohorte.arrow")
+        guardar_cohorte(cohorte(n), ruta)
+        os.environ["COHORTE_RUTA"] = ruta
+        st.cache_data.clear()
+        st.cache_resource.clear()
+        self.app = AppTest.from_file(APP, default_timeout=self.timeout).run()
+        self.app.radio(key="seccion").set_value(SECCIONES[seccion]).run()
+        if self.app.exception:
+            raise RuntimeError(self.app.exception[0].value)
+
+    def teardown(self, n, seccion):
+        os.environ.pop("COHORTE_RUTA", None)
+        shutil.rmtree(self.directorio, ignore_errors=True)
+
+    def time_primera_ejecucion(self, n, seccion):
+        # Sin cachés: carga de la cohorte, estimadores y figuras
+        st.cache_data.clear()
+        st.cache_resource.clear()
+        self.app.run()
+
+    def time_reejecucion(self, n, seccion):
+        # Con cachés calientes, como tras mover cualquier widget
+        self.app.run()
@@ -0,0 +1,39 @@
+"""Cohortes sintéticas compartidas por los benchmarks."""
+
+from functools import lru_cache
+
+import numpy as np
+
+from analisis.cif import TablaEventos
+from analisis.cohorte import N_COHORTE, generar_cohorte
+from analisis.descriptivo import estratos
+
+# Tamaños de cohorte: el original, un registro regional y uno nacional
+TAMANOS = (N_COHORTE, 100_000, 1_000_000)
+
+
+@lru_cache(maxsize=1)
+def cohorte(n):
+    """Cohorte de ``n`` pacientes (solo se conserva la última en memoria)."""
+    return generar_cohorte(n)
+
+
+def arreglos(n):
+    """Tiempo, causa y tipo de donante como arreglos de NumPy."""
+    datos = cohorte(n)
+    return datos["Tiempo"].to_numpy(), datos["Causa"].to_numpy(), datos["DonanteVivo"].to_numpy()
+
+
+def tabla(n):
+    """:class:`TablaEventos` de la cohorte de ``n`` pacientes por tipo de donante."""
+    return TablaEventos.desde_cohorte(*arreglos(n))
+
+
+def covariables(n, cantidad=20):
+    """Covariables de la cohorte completadas con categóricas aleatorias (2 a 5 niveles)."""
+    salida = estratos(cohorte(n))
+    rng = np.random.default_rng(0)
+    for i in range(cantidad - len(salida)):
+        salida[f"aleatoria_{i}"] = rng.integers(0, 2 + i % 4, n).astype(np.int8)
+    return salida
+